@@ -0,0 +1,73 @@
+"""Measure the time it takes to import the app.
+
+Imports `glasses.app` in a fresh interpreter using `python -X importtime`,
+reports the import time and the slowest modules, and fails when a module
+which should be imported lazily is imported at startup:
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 10 --max-ms 400
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+# modules which are only needed after the first paint.
+LAZY_MODULES = ("kubernetes", "kubernetes_asyncio", "aiohttp", "lark")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def _import_times(module: str) -> list[ImportTime]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        # import time:       614 |      70936 |           kubernetes.config
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="glasses.app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--max-ms", type=float, default=0, help="fail above this import time."
+    )
+    args = parser.parse_args()
+
+    runs = [_import_times(args.module) for _ in range(args.runs)]
+    totals = [
+        next(time.cumulative_us for time in run if time.module == args.module) / 1000
+        for run in runs
+    ]
+    print(f"{'import ' + args.module:<40} {min(totals):>8.1f} ms (best)")
+    print(f"{'':<40} {statistics.median(totals):>8.1f} ms (median)")
+
+    print("\nslowest modules (self time of the last run):")
+    for time in sorted(runs[-1], key=lambda time: time.self_us, reverse=True)[:10]:
+        print(f"  {time.module:<38} {time.self_us / 1000:>8.1f} ms")
+
+    imported = {time.module.split(".")[0] for time in runs[-1]}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    if eager:
+        sys.exit(f"\nimported at startup, should be lazy: {', '.join(eager)}")
+    if args.max_ms and min(totals) > args.max_ms:
+        sys.exit(f"\nimport time {min(totals):.1f} ms exceeds {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark reading a pod log stream.
+
+A local aiohttp server stands in for the kubernetes api and streams a fixed
+amount of timestamped log lines. The stream is read line by line (the way
+K8LogReader used to do it) and with the chunked reading of K8LogReader.
+
+run:
+
+    python benchmarks/bench_log_stream.py --lines 200000
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable
+
+from aiohttp import web
+from kubernetes_asyncio import client
+
+from glasses.controllers.log_provider import K8LogReader
+
+NAMESPACE = "bench"
+POD = "bench-pod"
+
+
+def _log_lines(count: int) -> bytes:
+    lines = []
+    for idx in range(count):
+        message = {
+            "@timestamp": "2023-01-01T10:00:00.000Z",
+            "log.level": "info",
+            "message": f"log message {idx}",
+            "logger": "bench",
+        }
+        lines.append(f"2023-01-01T10:00:00.{idx:09}Z {json.dumps(message)}\n")
+    return "".join(lines).encode()
+
+
+def _create_app(payload: bytes) -> web.Application:
+    async def pod_log(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        # a resumed log stream has nothing new to tell.
+        if "sinceSeconds" not in request.query:
+            for start in range(0, len(payload), 2**16):
+                await response.write(payload[start : start + 2**16])
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/api/v1/namespaces/{namespace}/pods/{name}/log", pod_log)
+    return app
+
+
+async def read_per_line(v1: client.CoreV1Api, line_count: int) -> None:
+    """The previous implementation: a readline and decode for every line.
+
+    The previous implementation also logged every line using `textual.log`. That
+    is left out as it prints to stdout when running outside of the app.
+    """
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    resp = await v1.read_namespaced_pod_log(
+        POD, NAMESPACE, follow=True, timestamps=True, _preload_content=False
+    )
+    while not resp.content.at_eof():
+        line = await resp.content.readline()
+        queue.put_nowait(line.decode("utf-8"))
+    assert queue.qsize() >= line_count
+
+
+async def read_chunked(v1: client.CoreV1Api, line_count: int) -> None:
+    reader = K8LogReader(v1)
+    reader.namespace = NAMESPACE
+    reader.pod = POD
+    reader.start()
+    received = 0
+    while received < line_count:
+        received += len(await reader._stream.get())
+    await reader.stop()
+
+
+async def _run(line_count: int, repeat: int) -> None:
+    server = web.AppRunner(_create_app(_log_lines(line_count)))
+    await server.setup()
+    site = web.TCPSite(server, "127.0.0.1", 0)
+    await site.start()
+    port = server.addresses[0][1]
+
+    configuration = client.Configuration(host=f"http://127.0.0.1:{port}")
+    async with client.ApiClient(configuration) as api_client:
+        v1 = client.CoreV1Api(api_client)
+        benchmarks: dict[str, Callable[[client.CoreV1Api, int], Awaitable[None]]] = {
+            "per line": read_per_line,
+            "chunked": read_chunked,
+        }
+        for name, benchmark in benchmarks.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await benchmark(v1, line_count)
+                best = min(best, time.perf_counter() - start)
+            print(f"{name:<10} {line_count / best:>12,.0f} lines/sec")
+
+    await server.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.lines, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
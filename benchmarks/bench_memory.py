@@ -0,0 +1,109 @@
+"""Measure the memory used per log line.
+
+Parses synthetic log lines into log events, adds them to a LineCache and
+renders a screen full of lines. Reports the bytes retained per line, and the
+overhead on top of the raw utf-8 bytes of the lines:
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --lines 100000
+
+The total is compared with the layout before log events and log data were
+stored compactly, which kept the raw line and rich Text per event and the
+rendered lines per log data. That layout was measured with this script at
+commit 3f95743^ (20k lines, 289 raw bytes per line):
+
+    layout                 log events  line cache  total  overhead
+    rich Text per event          1309        1418   2727      2438
+    compact (3f95743)             708          96    805       515
+    compact + templates           724         385   1109       820
+
+The log templates mined since b656d4a take most of the line cache.
+"""
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from typing import Callable, TypeVar
+
+from rich.console import Console
+from rich.style import Style
+
+from glasses.controllers.log_provider import LogEvent, LogReader
+from glasses.log_generator import LogGenerator
+from glasses.log_parsers.parse_pool import CompactText, compact, to_text
+from glasses.widgets.log_viewer import LineCache
+
+SELECTED_STYLE = Style(bgcolor="blue")
+LINE_WIDTH = 200
+SCREEN_HEIGHT = 50
+
+# total bytes per line of the baseline layout. See above.
+BASELINE_BYTES_PER_LINE = 2727
+
+T = TypeVar("T")
+
+
+def _retained(func: Callable[[], T]) -> tuple[T, int]:
+    """Call func and return its result and the amount of bytes it retains."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained
+
+
+def _log_events(lines: list[str], parsed: list[CompactText]) -> list[LogEvent]:
+    # fresh copies of the lines and parsed text, so everything only referenced
+    # by the log events is counted.
+    return [
+        LogEvent(line.encode().decode(), to_text(text))
+        for line, text in zip(lines, parsed)
+    ]
+
+
+def _line_cache(log_events: list[LogEvent], console: Console) -> LineCache:
+    line_cache = LineCache(console)
+    asyncio.run(line_cache.add_log_events(log_events))
+    middle = line_cache.line_count // 2
+    for idx in range(middle, min(middle + SCREEN_HEIGHT, line_cache.line_count)):
+        line_cache.line(idx, "", SELECTED_STYLE, LINE_WIDTH)
+    return line_cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=20_000)
+    args = parser.parse_args()
+
+    console = Console(width=LINE_WIDTH)
+    line_count = args.lines
+    lines = LogGenerator(seed=0).lines(line_count)
+    raw_bytes = sum(len(line.encode()) for line in lines)
+
+    # parsing is slow when tracing memory. Parse up front.
+    reader = LogReader()
+    parsed = [compact(reader._parse(line)) for line in lines]
+
+    log_events, events_memory = _retained(lambda: _log_events(lines, parsed))
+    _, cache_memory = _retained(lambda: _line_cache(log_events, console))
+
+    raw_per_line = raw_bytes / line_count
+    events_per_line = events_memory / line_count
+    total_per_line = (events_memory + cache_memory) / line_count
+    print(f"{'raw utf-8':<20} {raw_per_line:>10.0f} bytes/line")
+    print(f"{'log events':<20} {events_per_line:>10.0f} bytes/line")
+    print(f"{'line cache':<20} {cache_memory / line_count:>10.0f} bytes/line")
+    print(f"{'total':<20} {total_per_line:>10.0f} bytes/line")
+    print(f"{'overhead':<20} {total_per_line - raw_per_line:>10.0f} bytes/line")
+    print(
+        f"{'baseline total':<20} {BASELINE_BYTES_PER_LINE:>10.0f} bytes/line"
+        f" ({BASELINE_BYTES_PER_LINE / total_per_line:.1f}x more)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Benchmark the parsing and rendering pipeline.
+
+Measures the parsers, adding to the LineCache, rendering lines, expanding a
+log entry and searching, using synthetic log lines. Results are stored per
+commit so they can be compared:
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<commit>.json
+
+or run the `benchmark` nox session.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from rich.console import Console
+from rich.style import Style
+
+from glasses.controllers.log_provider import LogEvent, LogReader
+from glasses.log_generator import LineKind, LogGenerator
+from glasses.log_parsers import plain_text_parser
+from glasses.log_parsers.json_parser import jsonparse
+from glasses.widgets.log_viewer import LineCache
+
+RESULTS_FOLDER = Path(__file__).parent / "results"
+BUFFER_SIZES = [1_000, 10_000, 50_000]
+SELECTED_STYLE = Style(bgcolor="blue")
+LINE_WIDTH = 200
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], object]
+    items: int  # amount of items processed per call. Results are per item.
+
+
+def _log_events(lines: list[str]) -> list[LogEvent]:
+    reader = LogReader()
+    return [LogEvent(line, reader._parse(line)) for line in lines]
+
+
+def _line_cache(log_events: list[LogEvent], console: Console) -> LineCache:
+    line_cache = LineCache(console)
+    asyncio.run(line_cache.add_log_events(log_events))
+    return line_cache
+
+
+def _benchmarks() -> list[Benchmark]:
+    console = Console(width=LINE_WIDTH)
+    generator = LogGenerator(seed=0)
+
+    json_lines = generator.lines(1000, LineKind.JSON)
+    plain_lines = generator.lines(1000, LineKind.PLAIN)
+    multiline_lines = generator.lines(1000, LineKind.MULTILINE)
+    long_lines = generator.lines(1000, LineKind.LONG)
+
+    benchmarks = [
+        Benchmark("jsonparse json", lambda: [jsonparse(ln) for ln in json_lines], 1000),
+        Benchmark(
+            "jsonparse multiline",
+            lambda: [jsonparse(ln) for ln in multiline_lines],
+            1000,
+        ),
+        Benchmark("jsonparse long", lambda: [jsonparse(ln) for ln in long_lines], 1000),
+        Benchmark(
+            "plain_text_parser.parse",
+            lambda: [plain_text_parser.parse(ln) for ln in plain_lines],
+            1000,
+        ),
+    ]
+
+    mixed_events = _log_events(generator.lines(max(BUFFER_SIZES)))
+    benchmarks.append(
+        Benchmark(
+            "LineCache.add_log_events mixed",
+            lambda: _line_cache(mixed_events[:1000], console),
+            1000,
+        )
+    )
+
+    for size in BUFFER_SIZES:
+        line_cache = _line_cache(mixed_events[:size], console)
+
+        def render_screen(line_cache: LineCache = line_cache) -> None:
+            # a screen full of lines in the middle of the buffer, cropped like LogOutput does.
+            middle = line_cache.line_count // 2
+            for idx in range(middle, middle + 50):
+                line_cache.line(idx, "", SELECTED_STYLE, LINE_WIDTH).crop(0, 120)
+
+        def render_screen_search(line_cache: LineCache = line_cache) -> None:
+            middle = line_cache.line_count // 2
+            for idx in range(middle, middle + 50):
+                # a new search text invalidates the rendered lines.
+                line_cache.line(idx, str(idx), SELECTED_STYLE, LINE_WIDTH).crop(0, 120)
+
+        benchmarks += [
+            Benchmark(f"LineCache.line cached [{size}]", render_screen, 50),
+            Benchmark(f"LineCache.line rerender [{size}]", render_screen_search, 50),
+            Benchmark(
+                f"LineCache.toggle_expand [{size}]",
+                lambda line_cache=line_cache, size=size: line_cache.toggle_expand(
+                    size // 2
+                ),
+                1,
+            ),
+            Benchmark(
+                f"LineCache.search [{size}]",
+                lambda line_cache=line_cache: line_cache.search("timeout"),
+                size,
+            ),
+        ]
+    return benchmarks
+
+
+def _run(benchmark: Benchmark, repeat: int) -> float:
+    """Return the best time in seconds per processed item."""
+    timer = timeit.Timer(benchmark.func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return best / benchmark.items
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> bool:
+    """Print the comparison. Return whether there is a regression."""
+    regression = False
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        ratio = value / baseline[name]
+        marker = ""
+        if ratio > threshold:
+            marker = "  <-- regression"
+            regression = True
+        print(f"{name:<40} {ratio:>6.2f}x{marker}")
+    return regression
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks containing this text."
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="a previous result file to compare with."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio considered a regression when comparing.",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for benchmark in _benchmarks():
+        if args.filter not in benchmark.name:
+            continue
+        results[benchmark.name] = _run(benchmark, args.repeat)
+        print(f"{benchmark.name:<40} {results[benchmark.name] * 1e6:>12.2f} µs/item")
+
+    commit = _commit()
+    RESULTS_FOLDER.mkdir(exist_ok=True)
+    result_file = RESULTS_FOLDER / f"{commit}.json"
+    result_file.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"results written to {result_file}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        if _compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -55,3 +55,15 @@ def test(session):
     session.run("poetry", "install", "--sync", external=True)
 
     session.run("pytest", "tests")
+
+
+@nox.session
+def benchmark(session):
+    """Run the pipeline benchmarks.
+
+    Results are written to benchmarks/results/<commit>.json. Compare with an
+    earlier run using: nox -s benchmark -- --compare benchmarks/results/<commit>.json
+    """
+    session.run("poetry", "install", "--sync", external=True)
+
+    session.run("python", "benchmarks/bench_pipeline.py", *session.posargs)
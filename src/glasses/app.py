@@ -19,7 +19,6 @@ from glasses.widgets.nested_list_view import NestedListView
 
 Provider = TypeVar("Provider", NameSpace, Cluster)
 
-# TODO: Logviewer: Add checkbox to enable/disable autoscroll.
 # TODO: When starting new logger, ask whether to stop the previous one first.
 # TODO: Remove first layer from app as it is not needed anymore. (modal screens are displayed in another, more direct way.)
 
@@ -51,7 +50,7 @@ class Viewer(App):
 
     def compose(self) -> ComposeResult:
         yield SideBar(id="sidebar")
-        yield LogViewer(dependencies.get_log_reader())
+        yield LogViewer(dependencies.get_log_reader(), dependencies.get_pod_buffers())
         yield Footer()
 
     def action_toggle_dark(self) -> None:
@@ -80,14 +79,35 @@ def _parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action=argparse.BooleanOptionalAction,
         default=False,
     )
+    parser.add_argument(
+        "--demo_rate",
+        help="in demo mode, generate this amount of log lines per second.",
+        type=float,
+        default=0,
+    )
+    parser.add_argument(
+        "--demo_burst_rate",
+        help="in demo mode, lines per second during a burst.",
+        type=float,
+        default=0,
+    )
+    parser.add_argument(
+        "--demo_burst_interval",
+        help="in demo mode, seconds between the start of two bursts.",
+        type=float,
+        default=0,
+    )
+    parser.add_argument(
+        "--demo_burst_duration",
+        help="in demo mode, seconds a burst lasts.",
+        type=float,
+        default=1,
+    )
 
     args = parser.parse_args(argv)
     return args
 
 
-app = Viewer()
-
-
 def run(argv: Sequence[str] | None = None) -> None:
     args = _parse_args(argv)
     demo_mode = args.demo_mode
@@ -97,6 +117,10 @@ def run(argv: Sequence[str] | None = None) -> None:
         os.environ[
             "namespace_provider"
         ] = NameSpaceProvider.DUMMY_NAMESPACE_PROVIDER.value
+        os.environ["demo_rate"] = str(args.demo_rate)
+        os.environ["demo_burst_rate"] = str(args.demo_burst_rate)
+        os.environ["demo_burst_interval"] = str(args.demo_burst_interval)
+        os.environ["demo_burst_duration"] = str(args.demo_burst_duration)
 
     glasses_folder = Path.home() / ".config" / "glasses"
     glasses_folder.mkdir(exist_ok=True, parents=True)
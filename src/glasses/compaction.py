@@ -0,0 +1,127 @@
+"""Collapse consecutive repeated log lines into one counted line.
+
+Services stuck in a retry loop log the same line over and over. Instead of
+adding every repeat to the log, the first line gets a counter and the time of
+the first and the last repeat. The raw repeats can still be recreated, to save
+the log.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from datetime import datetime
+from itertools import chain, zip_longest
+from typing import TYPE_CHECKING, Iterator
+
+from rich.text import Text
+
+from glasses.log_parsers.line_info import split_timestamps
+from glasses.settings import RepeatCompaction
+
+if TYPE_CHECKING:
+    from glasses.controllers.log_provider import LogEvent
+
+# format of the first and last time of a repeated line.
+TIME_FORMAT = "%H:%M:%S"
+# length of "hh:mm:ss-hh:mm:ss" and its leading space.
+_TIMES_WIDTH = 18
+
+# size of a reference in a list.
+POINTER_SIZE = 8
+
+
+class Repeat:
+    """The repeats of a log line.
+
+    When timestamps are ignored the repeats only store their timestamps, as
+    the text around them is the same as the text of the first line.
+    """
+
+    __slots__ = ("count", "first_epoch", "last_epoch", "_timestamps")
+
+    def __init__(self, first_epoch: float) -> None:
+        # amount of lines, including the first one.
+        self.count = 1
+        self.first_epoch = first_epoch
+        self.last_epoch = first_epoch
+        self._timestamps: list[tuple[str, ...]] | None = None
+
+    def add(self, epoch: float, timestamps: tuple[str, ...] | None) -> int:
+        """Add a repeat.
+
+        Args:
+            epoch: The time of the repeat.
+            timestamps: The timestamps in the repeated line. None when the line
+                is identical to the first line.
+
+        Returns:
+            The estimated amount of bytes used to store the repeat.
+        """
+        self.count += 1
+        if not math.isnan(epoch):
+            self.last_epoch = epoch
+        if timestamps is None:
+            return 0
+        if self._timestamps is None:
+            self._timestamps = []
+        self._timestamps.append(timestamps)
+        return (
+            sys.getsizeof(timestamps)
+            + sum(map(sys.getsizeof, timestamps))
+            + POINTER_SIZE
+        )
+
+    def raws(self, raw: str) -> Iterator[str]:
+        """Yield the raw repeats of the first raw line, without the first one."""
+        if self._timestamps is None:
+            for _ in range(self.count - 1):
+                yield raw
+            return
+        texts, _ = split_timestamps(raw)
+        for timestamps in self._timestamps:
+            parts = zip_longest(texts, timestamps, fillvalue="")
+            yield "".join(chain.from_iterable(parts))
+
+    def _has_times(self) -> bool:
+        return not math.isnan(self.first_epoch)
+
+    @property
+    def width(self) -> int:
+        """Return the width of the label, without rendering it."""
+        return 3 + len(str(self.count)) + (_TIMES_WIDTH if self._has_times() else 0)
+
+    def label(self) -> Text:
+        """Return the label shown after the line, like `  ×12 14:32:05-14:32:09`."""
+        label = f"  ×{self.count}"
+        if self._has_times():
+            first = datetime.fromtimestamp(self.first_epoch).strftime(TIME_FORMAT)
+            last = datetime.fromtimestamp(self.last_epoch).strftime(TIME_FORMAT)
+            label += f" {first}-{last}"
+        return Text(label, "bold cyan")
+
+
+class Compactor:
+    """Find log events repeating the previous log event."""
+
+    def __init__(self, compaction: RepeatCompaction) -> None:
+        self.ignore_timestamps = compaction == RepeatCompaction.IGNORE_TIMESTAMPS
+        self._previous: str | tuple[str, ...] | None = None
+
+    def repeat(self, log_event: LogEvent) -> tuple[bool, tuple[str, ...] | None]:
+        """Return whether the log event repeats the previous log event.
+
+        Returns:
+            Whether it is a repeat, and the timestamps of the repeated line when
+            timestamps are ignored.
+        """
+        raw = log_event.raw
+        if not self.ignore_timestamps:
+            is_repeat = raw == self._previous
+            self._previous = raw
+            return is_repeat, None
+
+        texts, timestamps = split_timestamps(raw)
+        key = tuple(texts)
+        is_repeat = key == self._previous
+        self._previous = key
+        return is_repeat, tuple(timestamps) or None
@@ -0,0 +1,102 @@
+"""Write every raw log line to disk.
+
+While the ui only shows a sample of the lines, the capture still has all of
+them. Saving the log copies the capture.
+
+A run of the app captures in its own folder. Only the folders of the last
+runs are kept.
+"""
+from __future__ import annotations
+
+import io
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from glasses.log_parsers.line_info import split_timestamp
+
+# bytes buffered before writing to disk.
+BUFFER_SIZE = 1024 * 1024
+
+# amount of runs of which the captures are kept. See Settings.
+CAPTURE_RUNS = 5
+
+_UNSAFE = str.maketrans({"/": "_", "\\": "_", " ": "_"})
+
+
+def remove_old_runs(directory: Path, keep: int) -> None:
+    """Remove the capture folders of all but the last runs.
+
+    Args:
+        directory: The folder containing a folder per run, named by the time
+            the run started.
+        keep: The amount of runs to keep.
+    """
+    if not directory.is_dir():
+        return
+    runs = sorted(path for path in directory.iterdir() if path.is_dir())
+    for run in runs[: max(len(runs) - keep, 0)]:
+        shutil.rmtree(run, ignore_errors=True)
+
+
+class RawCapture:
+    """Capture lines to a file per name.
+
+    Files are written by a thread, so the ui is not slowed down by disk
+    access while it is already overloaded.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._file: io.TextIOWrapper | None = None
+        # one thread, so everything is written in order.
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="capture")
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name.translate(_UNSAFE)}.log"
+
+    def open(self, name: str) -> None:
+        """Append the lines to the capture of a name, like the pod being read."""
+        self._writer.submit(self._open, name)
+
+    def write(self, batch: list[str], timestamps: bool = False) -> None:
+        """Write a batch of lines.
+
+        Args:
+            batch: The lines.
+            timestamps: Whether the lines start with a `timestamps=True`
+                prefix. It is not written.
+        """
+        if batch:
+            self._writer.submit(self._write, batch, timestamps)
+
+    def flush(self) -> Future:
+        """Write the buffered lines. The future is done when they are written."""
+        return self._writer.submit(self._flush)
+
+    def close(self) -> Future:
+        return self._writer.submit(self._close)
+
+    def _open(self, name: str) -> None:
+        self._close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = open(
+            self.path(name), "a", encoding="utf-8", newline="\n", buffering=BUFFER_SIZE
+        )
+
+    def _write(self, batch: list[str], timestamps: bool) -> None:
+        if self._file is None:
+            return
+        if timestamps:
+            batch = [split_timestamp(line)[1] for line in batch]
+        self._file.write("\n".join(batch))
+        self._file.write("\n")
+
+    def _flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
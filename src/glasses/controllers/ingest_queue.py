@@ -0,0 +1,124 @@
+import asyncio
+from collections import deque
+
+from glasses.settings import OverloadPolicy
+
+
+class QueueClosed(Exception):
+    """The queue is closed and all batches are consumed."""
+
+
+class IngestQueue:
+    """A queue of log line batches bounded by the amount of lines it holds.
+
+    When full, the overload policy decides what happens to new batches:
+
+    - BLOCK: `put` waits until the consumer made room. The reader stops
+      reading from the network, which pushes back to the sender.
+    - DROP_OLDEST: the oldest queued lines are dropped to make room.
+    - SAMPLE: only one out of `sample_step` new lines is kept. When that is
+      still too much, the oldest queued lines are dropped.
+    - ADAPTIVE: like DROP_OLDEST. The reader samples the lines before they
+      are queued, depending on the load of the ui.
+
+    A blocking queue can be exceeded by one batch.
+    """
+
+    def __init__(
+        self,
+        max_lines: int,
+        policy: OverloadPolicy = OverloadPolicy.BLOCK,
+        sample_step: int = 10,
+    ) -> None:
+        self.max_lines = max_lines
+        self.policy = policy
+        self.sample_step = sample_step
+
+        self._batches: deque[list[str]] = deque()
+        self._line_count = 0
+        self._has_items = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._closed = False
+
+        # amount of lines which never made it to the consumer.
+        self.dropped = 0
+        self.sampled = 0
+
+    def qsize(self) -> int:
+        """Return the amount of queued lines."""
+        return self._line_count
+
+    def full(self) -> bool:
+        return self._line_count >= self.max_lines
+
+    async def put(self, batch: list[str]) -> None:
+        if self.policy is OverloadPolicy.BLOCK:
+            while self.full():
+                self._has_room.clear()
+                await self._has_room.wait()
+        else:
+            if (
+                self.policy is OverloadPolicy.SAMPLE
+                and self._line_count + len(batch) > self.max_lines
+            ):
+                kept = batch[:: self.sample_step]
+                self.sampled += len(batch) - len(kept)
+                batch = kept
+            batch = self._make_room(batch)
+
+        if batch:
+            self._batches.append(batch)
+            self._line_count += len(batch)
+            self._has_items.set()
+
+    def _make_room(self, batch: list[str]) -> list[str]:
+        if len(batch) > self.max_lines:
+            self.dropped += len(batch) - self.max_lines
+            batch = batch[len(batch) - self.max_lines :]
+
+        overflow = self._line_count + len(batch) - self.max_lines
+        while overflow > 0:
+            oldest = self._batches[0]
+            if len(oldest) <= overflow:
+                self._batches.popleft()
+                removed = len(oldest)
+            else:
+                del oldest[:overflow]
+                removed = overflow
+            self._line_count -= removed
+            self.dropped += removed
+            overflow -= removed
+        return batch
+
+    def close(self) -> None:
+        """Signal no more batches will be put in this queue.
+
+        Waiting consumers are woken up. Once the queued batches are consumed
+        `get` raises QueueClosed.
+        """
+        self._closed = True
+        self._has_items.set()
+
+    def clear(self) -> None:
+        """Remove all queued batches. They are not counted as dropped."""
+        self._batches.clear()
+        self._line_count = 0
+        self._has_room.set()
+
+    async def get(self) -> list[str]:
+        while not self._batches:
+            if self._closed:
+                raise QueueClosed()
+            self._has_items.clear()
+            await self._has_items.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> list[str]:
+        if not self._batches:
+            raise asyncio.QueueEmpty()
+        batch = self._batches.popleft()
+        self._line_count -= len(batch)
+        if not self.full():
+            self._has_room.set()
+        return batch
@@ -1,25 +1,168 @@
+from __future__ import annotations
+
 import asyncio
+import codecs
+import io
+import itertools
+import logging
+import math
+import random
+import sys
+import time
+from array import array
 from collections import deque
-from enum import Enum, auto
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import AsyncIterator, Iterator
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    NamedTuple,
+)
+
+from rich.style import Style
+from rich.text import Span, Text
+
+from glasses.controllers.capture import RawCapture
+from glasses.controllers.ingest_queue import IngestQueue, QueueClosed
+from glasses.controllers.overload import AdaptiveSampler
+from glasses.log_generator import DEFAULT_MIX, LineKind, LogGenerator
+from glasses.log_parsers.line_info import Level, split_timestamp
+from glasses.log_parsers.parse_pool import (
+    PARSERS,
+    ParsedLine,
+    ParsePool,
+    parse_line,
+    parse_log_line,
+)
+from glasses.metrics import PipelineMetrics
+from glasses.reactive_model import Reactr, ReactrModel
+from glasses.settings import OverloadPolicy, RepeatCompaction
 
-from aiohttp import ClientResponse
-from kubernetes_asyncio import client, config
-from rich.text import Text
-from textual import log
+# kubernetes_asyncio and aiohttp take a long time to import. They are
+# imported when a pod log is read.
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
+    from kubernetes_asyncio import client
+
+# default maximum amount of log lines waiting to be parsed.
+MAX_QUEUED_LINES = 100_000
+
+# maximum amount of lines parsed at once. Lines are parsed on the ui thread
+# unless there is a parse pool, so the ui can not render meanwhile.
+MAX_BATCH_LINES = 100
+
+# seconds lines are parsed on the ui thread before the parsed lines are yielded
+# and the ui can render. Slow parsers yield batches of less lines.
+MAX_PARSE_SECONDS = 0.016
+
+_logger = logging.getLogger(__name__)
+
+
+# maximum amount of distinct styles used by parsed lines. Log events refer to
+# a style by its index, so styles are never removed. Parsers use a small set
+# of styles; new styles after this many are not shown.
+MAX_STYLES = 4096
+
+# styles used by parsed lines. Log events refer to a style by its index.
+_NO_STYLE = 0
+_styles: list[str | Style] = [""]
+_style_ids: dict[str | Style, int] = {"": _NO_STYLE}
+
+
+def _style_id(style: str | Style) -> int:
+    style_id = _style_ids.get(style)
+    if style_id is None:
+        if len(_styles) >= MAX_STYLES:
+            return _NO_STYLE
+        style_id = _style_ids[style] = len(_styles)
+        _styles.append(style)
+    return style_id
 
-from glasses.log_parsers import plain_text_parser
-from glasses.log_parsers.json_parser import JsonParseError, jsonparse
-from glasses.reactive_model import Reactr, ReactrModel
 
-# _logger = logging.getLogger(__name__)
+def _pack_styles(text: Text) -> bytes:
+    """Pack the style and the spans of a text.
+
+    The result is the array typecode followed by the array of the style index
+    and the (start, end, style index) of every span.
+    """
+    values = [_style_id(text.style)]
+    for span in text.spans:
+        values += (span.start, span.end, _style_id(span.style))
+    # 16 bit values where possible.
+    typecode = "H" if max(values) < 2**16 else "I"
+    return typecode.encode() + array(typecode, values).tobytes()
+
+
+def _unpack_styles(plain: str, packed: bytes) -> Text:
+    values = array(chr(packed[0]), packed[1:])
+    return Text(
+        plain,
+        style=_styles[values[0]],
+        spans=[
+            Span(values[idx], values[idx + 1], _styles[values[idx + 2]])
+            for idx in range(1, len(values), 3)
+        ],
+    )
 
 
 class LogEvent:
-    def __init__(self, raw: str, parsed: Text) -> None:
-        self.raw = raw
-        self.parsed = parsed
+    """A raw log line and its parsed text, stored compactly.
+
+    The parsed text is kept as its plain text and its packed styles. The raw
+    line is kept as utf-8 bytes, or as an offset into the plain text when the
+    plain text ends with the raw line. `raw` and `parsed` recreate the
+    original objects.
+
+    epoch is the time of the line in seconds, nan when unknown.
+    """
+
+    __slots__ = ("_raw", "plain", "_styles", "epoch", "level")
+
+    def __init__(
+        self,
+        raw: str,
+        parsed: Text,
+        epoch: float = math.nan,
+        level: Level = Level.UNKNOWN,
+    ) -> None:
+        self.plain = parsed.plain
+        self._styles = _pack_styles(parsed)
+        self.epoch = epoch
+        self.level = level
+
+        self._raw: bytes | int
+        if self.plain.endswith(raw):
+            self._raw = len(self.plain) - len(raw)
+        else:
+            self._raw = raw.encode()
+
+    @property
+    def raw(self) -> str:
+        if isinstance(self._raw, int):
+            return self.plain[self._raw :]
+        return self._raw.decode()
+
+    @property
+    def parsed(self) -> Text:
+        return _unpack_styles(self.plain, self._styles)
+
+    @property
+    def memory(self) -> int:
+        """Return the amount of bytes used by this log event."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self._raw)
+            + sys.getsizeof(self.plain)
+            + sys.getsizeof(self._styles)
+            + sys.getsizeof(self.epoch)
+        )
+
+
+def _log_event(line: str, parsed: ParsedLine) -> LogEvent:
+    return LogEvent(line[parsed.offset :], parsed.text, parsed.epoch, parsed.level)
 
 
 class LogReader(ReactrModel):
@@ -30,28 +173,162 @@ class LogReader(ReactrModel):
 
     is_reading = Reactr(False)
 
-    def __init__(self) -> None:
+    # amount of lines not displayed because the ui could not keep up.
+    dropped = Reactr[int](0)
+    sampled = Reactr[int](0)
+    # one out of sample_step lines is shown while the ui is overloaded.
+    sample_step = Reactr[int](1)
+
+    # whether the read lines start with a `timestamps=True` prefix.
+    timestamps = False
+
+    def __init__(
+        self,
+        max_queued_lines: int = MAX_QUEUED_LINES,
+        overload_policy: OverloadPolicy = OverloadPolicy.BLOCK,
+    ) -> None:
         super().__init__()
-        self._stream: asyncio.Queue[str] = asyncio.Queue()
-        self._parser = jsonparse
+        # batches of incoming log lines.
+        self._stream = IngestQueue(max_queued_lines, overload_policy)
+        # the name of the parser in PARSERS. See Settings.
+        self.logparser = "json"
         self._reader: asyncio.Task | None = None
+        self.metrics = PipelineMetrics()
 
-    async def read(self) -> AsyncIterator[LogEvent]:
+        self._sampler: AdaptiveSampler | None = None
+        if overload_policy is OverloadPolicy.ADAPTIVE:
+            self._sampler = AdaptiveSampler(max_queued_lines)
+        # when set, all read lines are written to it.
+        self.capture: RawCapture | None = None
+
+        # when set, lines are parsed by this pool instead of on the ui thread.
+        self.parse_pool: ParsePool | None = None
+
+        # whether the log output collapses repeated lines read by this reader.
+        self.repeat_compaction = RepeatCompaction.OFF
+
+        # where a timestamped log is read up to. Reading resumes from here.
+        self.position = ResumePosition()
+
+        # changes when the queue is cleared. Lines read before are not read
+        # further.
+        self.generation = 0
+
+    @property
+    def _parser(self) -> Callable[[str], Text]:
+        return PARSERS[self.logparser]
+
+    def _parse(self, data: str) -> Text:
+        return parse_line(data, self._parser)
+
+    async def read_lines(self) -> AsyncIterator[list[str]]:
+        """Yield batches of unparsed lines.
+
+        Ends when the reader has no more lines to read.
+        """
         while True:
-            data = await self._stream.get()
-            self._stream.task_done()
             try:
-                parsed = self._parser(data)
-            except JsonParseError:
-                parsed = plain_text_parser.parse(data)
-                parsed = Text.assemble(Text("[!E] ", "red"), parsed)
-            yield LogEvent(raw=data, parsed=parsed)
+                batch = await self._stream.get()
+            except QueueClosed:
+                return
+            self.metrics.queue_depth = self._stream.qsize()
+            generation = self.generation
+            for start in range(0, len(batch), MAX_BATCH_LINES):
+                if self.generation != generation:
+                    break
+                yield batch[start : start + MAX_BATCH_LINES]
+                # getting a batch does not wait while lines are queued. Let
+                # the ui render and the reader read between batches.
+                await asyncio.sleep(0)
+
+    async def read_batches(self) -> AsyncIterator[list[LogEvent]]:
+        if self.parse_pool is not None:
+            # the generation of the batches being parsed, in order.
+            generations: deque[int] = deque()
+
+            async def read_lines() -> AsyncIterator[list[str]]:
+                async for batch in self.read_lines():
+                    generations.append(self.generation)
+                    yield batch
+
+            async for batch, parsed, seconds in self.parse_pool.parse(
+                read_lines(), self.timestamps, self.logparser
+            ):
+                self.metrics.parsed(len(batch), seconds)
+                if generations.popleft() != self.generation:
+                    continue
+                yield [
+                    _log_event(line, parsed_line)
+                    for line, parsed_line in zip(batch, parsed)
+                ]
+            return
+
+        async for batch in self.read_lines():
+            generation = self.generation
+            lines = iter(batch)
+            parsed_all = False
+            while not parsed_all and self.generation == generation:
+                log_events = []
+                parsed_all = True
+                start = time.perf_counter()
+                for line in lines:
+                    parsed_line = parse_log_line(line, self.timestamps, self._parser)
+                    log_events.append(_log_event(line, parsed_line))
+                    if time.perf_counter() - start >= MAX_PARSE_SECONDS:
+                        parsed_all = False
+                        break
+                if log_events:
+                    self.metrics.parsed(len(log_events), time.perf_counter() - start)
+                    yield log_events
+                if not parsed_all:
+                    # let the ui render before parsing the rest of the batch.
+                    await asyncio.sleep(0)
+
+    async def read(self) -> AsyncIterator[LogEvent]:
+        async for log_events in self.read_batches():
+            generation = self.generation
+            for log_event in log_events:
+                if self.generation != generation:
+                    break
+                yield log_event
+
+    async def _put(self, batch: list[str], size: int | None = None) -> None:
+        """Queue a batch of lines.
+
+        Args:
+            batch: The lines to queue.
+            size: The amount of bytes received for this batch. Defaults to the
+                length of the lines.
+        """
+        if size is None:
+            size = sum(len(line) for line in batch)
+        self.metrics.received(len(batch), size)
+        if self.capture is not None:
+            self.capture.write(batch, self.timestamps)
+
+        sampled = self._stream.sampled
+        sampler = self._sampler
+        if sampler is not None:
+            sampler.update(
+                self._stream.qsize(), self.metrics.render_latency, time.monotonic()
+            )
+            batch = sampler.sample(batch)
+            sampled += sampler.sampled
+
+        await self._stream.put(batch)
+        self.metrics.queue_depth = self._stream.qsize()
+        with self.transaction():
+            self.dropped = self._stream.dropped
+            self.sampled = sampled
+            if sampler is not None:
+                self.sample_step = sampler.step
 
     async def _read(self) -> None:
         raise NotImplementedError()
 
     def start(self) -> asyncio.Task:
-
+        if self.capture is not None:
+            self.capture.open(self._capture_name())
         self._reader = asyncio.create_task(self._read())
         return self._reader
 
@@ -60,28 +337,151 @@ class LogReader(ReactrModel):
             self._reader.cancel()
             await self._reader
         self._reader = None
+        if self.capture is not None:
+            await asyncio.wrap_future(self.capture.close())
 
+    def _capture_name(self) -> str:
+        return f"{self.namespace}_{self.pod}"
+
+    def capture_path(self) -> Path | None:
+        """Return the capture of all lines read of the pod, if there is one."""
+        if self.capture is None:
+            return None
+        # wait until the queued lines are written.
+        self.capture.flush().result()
+        path = self.capture.path(self._capture_name())
+        return path if path.exists() else None
+
+    def clear_queue(self) -> None:
+        """Remove the lines waiting to be parsed, and the lines being read."""
+        self._stream.clear()
+        self.generation += 1
+        self.metrics.queue_depth = 0
+
+    def close_queue(self) -> None:
+        """Signal no more lines are queued. Reading ends after the queued lines."""
+        self._stream.close()
 
-class K8LogReader(LogReader):
-    class ReadingState(Enum):
-        WAITING_FOR_FIRST_ITEM = auto()
-        FOUND = auto()
-        NOT_FOUND = auto
 
-    def __init__(self, client: client.CoreV1Api | None = None) -> None:
+class ResumePosition:
+    """The position in a timestamped pod log which is read up to.
+
+    Used to resume reading the log after a reconnect without losing or
+    duplicating lines. Lines are ordered by timestamp. Identical timestamps are
+    possible, so the amount of lines already seen with the last timestamp is
+    counted too.
+    """
+
+    def __init__(self) -> None:
+        # last seen timestamp, normalized so it can be compared as a string.
+        self.timestamp: str | None = None
+
+        # amount of lines seen having the last timestamp.
+        self.count: int = 0
+        self._skip: int = 0
+
+    @property
+    def epoch(self) -> float | None:
+        if self.timestamp is None:
+            return None
+        return _timestamp_epoch(self.timestamp)
+
+    def reconnect(self) -> None:
+        """A new connection starts sending lines already seen."""
+        self._skip = self.count
+
+    def accept(self, timestamp: str) -> bool:
+        """Return whether a line with this timestamp is new."""
+        key = _timestamp_key(timestamp)
+        if self.timestamp is None or key > self.timestamp:
+            self.timestamp = key
+            self.count = 1
+            self._skip = 0
+            return True
+        if key == self.timestamp:
+            if self._skip > 0:
+                self._skip -= 1
+                return False
+            self.count += 1
+            return True
+        return False
+
+
+def _timestamp_key(timestamp: str) -> str:
+    # kubernetes uses RFC3339Nano timestamps which drop trailing zeros.
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    return f"{seconds}.{fraction:0<9}"
+
+
+def _timestamp_epoch(timestamp: str) -> float:
+    return (
+        datetime.strptime(timestamp[:19], "%Y-%m-%dT%H:%M:%S")
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+class LineSplitter:
+    """Split a stream of byte chunks into decoded lines.
+
+    A line which is not complete at the end of a chunk is kept until the
+    rest of it arrives in a next chunk.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._rest = ""
+
+    def feed(self, chunk: bytes) -> list[str]:
+        lines = (self._rest + self._decoder.decode(chunk)).split("\n")
+        self._rest = lines.pop()
+        return lines
+
+    def flush(self) -> list[str]:
+        """Return the last line when it is not newline terminated."""
+        rest = self._rest + self._decoder.decode(b"", final=True)
+        self._rest = ""
+        return [rest] if rest else []
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(maximum, base * 2**attempt))
+
+
+class K8LogReader(LogReader):
+    timestamps = True
+
+    # seconds added to the `since_seconds` argument when resuming to cover
+    # clock differences between this machine and the cluster.
+    RESUME_MARGIN = 10
+
+    def __init__(
+        self,
+        client: client.CoreV1Api | None = None,
+        max_queued_lines: int = MAX_QUEUED_LINES,
+        overload_policy: OverloadPolicy = OverloadPolicy.BLOCK,
+    ) -> None:
         """Initialize the reader
 
         Args:
             client: An instantiated client. make sure it is also configured.. Defaults to None.
+            max_queued_lines: Maximum amount of lines waiting to be parsed.
+            overload_policy: What to do with new lines when the queue is full.
         """
-        super().__init__()
+        super().__init__(max_queued_lines, overload_policy)
         if client is None:
             self._configured = False
         else:
             self._configured = True
         self._client = client
 
+        # reconnect backoff in seconds.
+        self.backoff_base: float = 0.5
+        self.backoff_max: float = 10.0
+
     async def _read(self) -> None:
+        from kubernetes_asyncio import client, config
 
         if not self._configured:
             await config.load_kube_config()
@@ -93,109 +493,211 @@ class K8LogReader(LogReader):
         try:
             await self.print_pod_log()
         except asyncio.CancelledError:
-            log("stopped reading the log.")
+            _logger.info("stopped reading the log.")
             self.is_reading = False
         except Exception:
-            log("an unknown problem occurred while reading the log.")
+            _logger.exception("an unknown problem occurred while reading the log.")
 
             self.is_reading = False
             raise
 
     async def print_pod_log(self) -> None:
+        from aiohttp import ClientError
 
-        last_lines: deque[bytes] = deque(maxlen=10)
+        position = self.position
+        new_lines = 0
 
-        def _add_to_queue(data: bytes) -> None:
-            try:
-                utf_data = data.decode("utf-8")
-                self._stream.put_nowait(utf_data)
-                last_lines.append(data)
-            except UnicodeDecodeError:
-                log.error(f"unable to utf-8 decode {data}")  # type: ignore
-                self._stream.put_nowait(f"[error] Unable to parse incoming logline: {data}")  # type: ignore
-
-        async def _read(tail_lines: int, follow: bool) -> None:
+        async def _read(**kwargs: Any) -> None:
+            nonlocal new_lines
             assert self._client is not None
             resp: ClientResponse = await self._client.read_namespaced_pod_log(
                 self.pod,
                 self.namespace,
-                tail_lines=tail_lines,
-                follow=follow,
+                follow=True,
+                timestamps=True,
                 _preload_content=False,
+                **kwargs,
             )
-
-            if not follow:
-                while not resp.content.at_eof():
-                    ln = await resp.content.readline()
-                    log("reading first batch")
-                    _add_to_queue(ln)
-                    # last_lines.append(ln)
-                log("finished reading first batch")
-            else:
-                reading_state: K8LogReader.ReadingState = (
-                    K8LogReader.ReadingState.WAITING_FOR_FIRST_ITEM
-                )
-                log("start watching log")
-                while not resp.content.at_eof():
-                    line = await resp.content.readline()
-                    log("found logline")
-                    if reading_state == K8LogReader.ReadingState.WAITING_FOR_FIRST_ITEM:
-                        if len(last_lines) == 0:
-                            reading_state = K8LogReader.ReadingState.FOUND
-                            _add_to_queue(line)
-                        elif line in last_lines:
-                            reading_state = K8LogReader.ReadingState.FOUND
-                        else:
-                            log.warning(
-                                "Missing overlap of lines between log call and previous log_call. Possibly log lines are lost."
-                            )
-                            self._stream.put_nowait(
-                                "WARNING. MIGHT HAVE LOST A LOGLINE"
-                            )
-                            _add_to_queue(line)
-                            reading_state = K8LogReader.ReadingState.NOT_FOUND
-                    elif reading_state == K8LogReader.ReadingState.FOUND:
-                        if line in last_lines:
-                            reading_state = K8LogReader.ReadingState.FOUND
-                        else:
-                            _add_to_queue(line)
-                            reading_state = K8LogReader.ReadingState.NOT_FOUND
-                    elif reading_state == K8LogReader.ReadingState.NOT_FOUND:
-                        _add_to_queue(line)
-
-                print("eof reached.")
-
-        # do the first read getting the log history.
-        await _read(self.tail, follow=False)
-        # start watching the log for changes.
+            position.reconnect()
+            # an incomplete last line is dropped when the connection ends. It is
+            # read again on the next connection.
+            splitter = LineSplitter()
+            _logger.info("start watching log")
+            while chunk := await resp.content.readany():
+                batch: list[str] = []
+                for line in splitter.feed(chunk):
+                    timestamp, _ = split_timestamp(line)
+                    if timestamp is None or position.accept(timestamp):
+                        # the timestamp is kept. It is removed when parsing.
+                        batch.append(line)
+                if batch:
+                    await self._put(batch, len(chunk))
+                    new_lines += len(batch)
+
+        def _resume_arguments() -> dict[str, Any]:
+            since = position.epoch if position.epoch is not None else started
+            since_seconds = math.ceil(time.time() - since) + self.RESUME_MARGIN
+            return {"since_seconds": since_seconds}
+
+        started = time.time()
+        attempt = 0
+        arguments: dict[str, Any] = (
+            {"tail_lines": self.tail}
+            if position.timestamp is None
+            else _resume_arguments()
+        )
         while True:
+            new_lines = 0
             try:
-                await _read(2, follow=True)
+                await _read(**arguments)
             except asyncio.TimeoutError:
-                log.info(f"timed out while logging pod {self.pod} on {self.namespace}")
+                _logger.info(
+                    "timed out while logging pod %s on %s", self.pod, self.namespace
+                )
+            except ClientError:
+                # the connection dropped, like a broken payload or a disconnect.
+                _logger.warning(
+                    "the log stream of pod %s on %s broke. reconnecting.",
+                    self.pod,
+                    self.namespace,
+                    exc_info=True,
+                )
+
+            if new_lines:
+                attempt = 0
+            else:
+                await asyncio.sleep(
+                    backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                )
+                attempt += 1
+            arguments = _resume_arguments()
+
+
+class FileLogReader(LogReader):
+    """Read log lines from a file or stdin until the end of it."""
+
+    CHUNK_SIZE = 2**16
+
+    def __init__(
+        self,
+        file: io.BufferedReader,
+        max_queued_lines: int = MAX_QUEUED_LINES,
+        overload_policy: OverloadPolicy = OverloadPolicy.BLOCK,
+    ) -> None:
+        super().__init__(max_queued_lines, overload_policy)
+        self._file = file
+
+    async def _read(self) -> None:
+        loop = asyncio.get_running_loop()
+        splitter = LineSplitter()
+        self.is_reading = True
+        try:
+            # read1 returns what is available, so lines piped into stdin are
+            # shown while they arrive.
+            while chunk := await loop.run_in_executor(
+                None, self._file.read1, self.CHUNK_SIZE
+            ):
+                batch = splitter.feed(chunk)
+                if batch:
+                    await self._put(batch, len(chunk))
+            batch = splitter.flush()
+            if batch:
+                await self._put(batch)
+        except asyncio.CancelledError:
+            _logger.info("stopped reading the file.")
+        finally:
+            self._stream.close()
+            self.is_reading = False
+
+
+class LoadProfile(NamedTuple):
+    """The synthetic load generated by the DummyLogReader."""
+
+    rate: float  # lines per second.
+    burst_rate: float = 0  # lines per second during a burst.
+    burst_interval: float = (
+        0  # seconds between the start of two bursts. 0 disables bursts.
+    )
+    burst_duration: float = 1
+    mix: dict[LineKind, float] = DEFAULT_MIX
+    message_words: tuple[int, int] = (3, 12)  # min and max words in a message.
+    long_line_length: int = 2000
+
+    def rate_at(self, elapsed: float) -> float:
+        """Return the rate at the provided amount of seconds after starting."""
+        if self.burst_interval and elapsed % self.burst_interval < self.burst_duration:
+            return self.burst_rate
+        return self.rate
 
 
 class DummyLogReader(LogReader):
-    def __init__(self) -> None:
-        super().__init__()
+    # seconds between two generated batches.
+    TICK = 0.01
+
+    # amount of distinct generated lines. They are repeated to keep the cost
+    # of generating them out of the measurements.
+    POOL_SIZE = 10_000
+
+    def __init__(
+        self,
+        max_queued_lines: int = MAX_QUEUED_LINES,
+        overload_policy: OverloadPolicy = OverloadPolicy.BLOCK,
+        load: LoadProfile | None = None,
+    ) -> None:
+        """Initialize the reader.
+
+        Args:
+            load: Generate synthetic log lines using this profile. When not
+                provided the example log data is replayed.
+        """
+        super().__init__(max_queued_lines, overload_policy)
         self.delay: float = 0.001
         self.range: int = 1
+        self.load = load
+        # the monotonic time in seconds. Generated lines follow its rate.
+        self.clock: Callable[[], float] = time.monotonic
 
     def log_data(self) -> Iterator:
-        # log_data = Path(__file__).parent / "log_data.txt"
-        log_data = Path(__file__).parent.parent.parent.parent / "log_output.txt"
+        log_data = Path(__file__).parent / "log_data.txt"
         with open(log_data) as fl:
-            data = fl.read().split("\n")
+            data = fl.read().splitlines()
         for i in range(self.range):
             yield from data
 
     async def _read(self) -> None:
         self.is_reading = True
         try:
-            for line in self.log_data():
-
-                await asyncio.sleep(self.delay)
-                await self._stream.put(line)
+            if self.load is None:
+                await self._replay()
+            else:
+                await self._generate(self.load)
         except asyncio.CancelledError:
             self.is_reading = False
-            log.info("stopped logger input")
+            _logger.info("stopped logger input")
+
+    async def _replay(self) -> None:
+        for line in self.log_data():
+            await asyncio.sleep(self.delay)
+            await self._put([line])
+
+    async def _generate(self, load: LoadProfile) -> None:
+        generator = LogGenerator(
+            load.mix,
+            seed=None,
+            message_words=load.message_words,
+            long_line_length=load.long_line_length,
+        )
+        lines = itertools.cycle(generator.lines(self.POOL_SIZE))
+
+        start = previous = self.clock()
+        due = 0.0
+        while True:
+            await asyncio.sleep(self.TICK)
+            now = self.clock()
+            due += load.rate_at(now - start) * (now - previous)
+            previous = now
+
+            count = int(due)
+            due -= count
+            if count:
+                await self._put(list(itertools.islice(lines, count)))
@@ -0,0 +1,78 @@
+"""Show a sample of the log lines while the ui can not keep up.
+
+The ui is overloaded when lines queue up faster than they are parsed, or when
+rendering a frame takes too long. Only one out of `step` lines is shown then.
+The step doubles every evaluation while the ui stays overloaded and halves
+again once it recovers. Warnings and errors are always shown.
+"""
+from __future__ import annotations
+
+from glasses.log_parsers.line_info import Level, line_level
+
+# seconds between two decisions to change the sample step.
+EVALUATE_INTERVAL = 0.5
+
+# fraction of the queue which is filled when the ui is overloaded, and when it
+# recovered.
+HIGH_QUEUE_FRACTION = 0.5
+LOW_QUEUE_FRACTION = 0.1
+
+# seconds rendering a frame takes when the ui is overloaded. The ui recovered
+# at half of it.
+MAX_RENDER_LATENCY = 0.05
+
+MAX_STEP = 1024
+
+
+class AdaptiveSampler:
+    def __init__(self, max_queued_lines: int) -> None:
+        self.high_queue_depth = int(max_queued_lines * HIGH_QUEUE_FRACTION)
+        self.low_queue_depth = int(max_queued_lines * LOW_QUEUE_FRACTION)
+
+        # one out of step lines is kept. 1 when not sampling.
+        self.step = 1
+        # amount of lines not kept.
+        self.sampled = 0
+
+        self._position = 0
+        self._evaluated_at = -EVALUATE_INTERVAL
+
+    def update(self, queue_depth: int, render_latency: float, now: float) -> bool:
+        """Change the sample step to the load of the ui.
+
+        Args:
+            queue_depth: The amount of lines waiting to be parsed.
+            render_latency: The recent amount of seconds rendering a frame took.
+            now: The monotonic time.
+
+        Returns:
+            Whether the step changed.
+        """
+        if now - self._evaluated_at < EVALUATE_INTERVAL:
+            return False
+        self._evaluated_at = now
+
+        step = self.step
+        if queue_depth > self.high_queue_depth or render_latency > MAX_RENDER_LATENCY:
+            self.step = min(self.step * 2, MAX_STEP)
+        elif (
+            queue_depth < self.low_queue_depth
+            and render_latency < MAX_RENDER_LATENCY / 2
+        ):
+            self.step = max(self.step // 2, 1)
+        return self.step != step
+
+    def sample(self, batch: list[str]) -> list[str]:
+        """Return the lines to show: every step-th line, warnings and errors."""
+        if self.step == 1:
+            return batch
+        kept = []
+        step = self.step
+        position = self._position
+        for line in batch:
+            if position % step == 0 or line_level(line) >= Level.WARNING:
+                kept.append(line)
+            position += 1
+        self._position = position % step
+        self.sampled += len(batch) - len(kept)
+        return kept
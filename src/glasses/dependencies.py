@@ -1,9 +1,23 @@
+from datetime import datetime
 from functools import cache
 
-from glasses.controllers.log_provider import DummyLogReader, K8LogReader, LogReader
+from glasses.controllers.capture import RawCapture, remove_old_runs
+from glasses.controllers.log_provider import (
+    DummyLogReader,
+    K8LogReader,
+    LoadProfile,
+    LogReader,
+)
 from glasses.k8client import DummyClient, K8Client
+from glasses.log_parsers.parse_pool import ParsePool
 from glasses.namespace_provider import Cluster
-from glasses.settings import LogCollectors, NameSpaceProvider, Settings
+from glasses.pod_buffers import PodBufferCache
+from glasses.settings import (
+    LogCollectors,
+    NameSpaceProvider,
+    OverloadPolicy,
+    Settings,
+)
 
 
 @cache
@@ -12,9 +26,15 @@ def get_namespace_provider(settings: Settings | None = None) -> Cluster:
         settings = Settings()
 
     if settings.namespace_provider == NameSpaceProvider.DUMMY_NAMESPACE_PROVIDER:
-        return Cluster("dummy provider", DummyClient())
+        return Cluster(
+            "dummy provider",
+            DummyClient(),
+            prefetch_concurrency=settings.prefetch_concurrency,
+        )
     if settings.namespace_provider == NameSpaceProvider.K8_NAMESPACE_PROVIDER:
-        return Cluster("k8", K8Client())
+        return Cluster(
+            "k8", K8Client(), prefetch_concurrency=settings.prefetch_concurrency
+        )
 
     raise NotImplementedError(
         f"Unknown namespace provider {settings.namespace_provider}"
@@ -26,9 +46,44 @@ def get_log_reader(settings: Settings | None = None) -> LogReader:
     if settings is None:
         settings = Settings()
 
+    reader = _create_log_reader(settings)
+    if settings.parse_workers > 0:
+        reader.parse_pool = ParsePool(settings.parse_workers)
+    reader.repeat_compaction = settings.repeat_compaction
+    reader.logparser = settings.logparser
+    if settings.overload_policy == OverloadPolicy.ADAPTIVE:
+        # a folder per run of the app.
+        session = datetime.now().strftime("%Y%m%d-%H%M%S")
+        remove_old_runs(settings.capture_dir, keep=settings.capture_runs - 1)
+        reader.capture = RawCapture(settings.capture_dir / session)
+    return reader
+
+
+@cache
+def get_pod_buffers(settings: Settings | None = None) -> PodBufferCache:
+    if settings is None:
+        settings = Settings()
+
+    return PodBufferCache(settings.pod_buffer_bytes)
+
+
+def _create_log_reader(settings: Settings) -> LogReader:
     if settings.logcollector == LogCollectors.DUMMY_LOG_COLLECTOR:
-        return DummyLogReader()
+        load = None
+        if settings.demo_rate:
+            load = LoadProfile(
+                rate=settings.demo_rate,
+                burst_rate=settings.demo_burst_rate,
+                burst_interval=settings.demo_burst_interval,
+                burst_duration=settings.demo_burst_duration,
+            )
+        return DummyLogReader(
+            settings.max_queued_lines, settings.overload_policy, load=load
+        )
     if settings.logcollector == LogCollectors.K8_LOG_COLLECTOR:
-        return K8LogReader()
+        return K8LogReader(
+            max_queued_lines=settings.max_queued_lines,
+            overload_policy=settings.overload_policy,
+        )
 
     raise NotImplementedError(f"unknown logreader {settings.logcollector}")
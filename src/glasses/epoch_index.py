@@ -0,0 +1,87 @@
+"""Find log entries by time."""
+import math
+import re
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+_TIME = re.compile(
+    r"^\s*(?:(\d{4})-(\d\d)-(\d\d)[T ])?(\d{1,2}):(\d\d)(?::(\d\d)(?:[.,](\d+))?)?\s*$"
+)
+
+
+class EpochIndex:
+    """The epoch of every log entry, searchable with a binary search.
+
+    Entries without a time get the time of the entry before them. When
+    entries arrive out of order, for example when the logs of multiple
+    replicas are merged, a sorted secondary index is built when searching.
+    """
+
+    def __init__(self) -> None:
+        self.epochs = array("d")
+        self.in_order = True
+
+        # entry indexes sorted by epoch, and their epochs. Only used when the
+        # entries are out of order.
+        self._order: list[int] = []
+        self._sorted_epochs = array("d")
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def append(self, epoch: float) -> None:
+        last = self.epochs[-1] if self.epochs else -math.inf
+        if math.isnan(epoch):
+            epoch = last
+        elif epoch < last:
+            self.in_order = False
+        self.epochs.append(epoch)
+
+    def find(self, epoch: float) -> int:
+        """Return the entry with the earliest time at or after the epoch.
+
+        When there is no such entry the last entry is returned. Returns -1
+        when there are no entries.
+        """
+        if not self.epochs:
+            return -1
+        if self.in_order:
+            return min(bisect_left(self.epochs, epoch), len(self.epochs) - 1)
+
+        if len(self._order) != len(self.epochs):
+            self._sort()
+        position = bisect_left(self._sorted_epochs, epoch)
+        return self._order[min(position, len(self._order) - 1)]
+
+    def _sort(self) -> None:
+        # entries are mostly in order, which makes sorting close to linear.
+        epochs = self.epochs
+        self._order = sorted(range(len(epochs)), key=epochs.__getitem__)
+        self._sorted_epochs = array("d", (epochs[idx] for idx in self._order))
+
+
+def parse_time(text: str, reference: float) -> float:
+    """Return the epoch of a local time like `14:32:05` or `2023-01-01 14:32`.
+
+    A time without a date is taken on the local date of the reference epoch.
+
+    Raises:
+        ValueError: The text is not a time.
+    """
+    match = _TIME.match(text)
+    if match is None:
+        raise ValueError(f"not a time: {text}")
+    year, month, day, hour, minute, second, fraction = match.groups()
+
+    if year is None:
+        moment = datetime.fromtimestamp(reference).replace(
+            hour=int(hour), minute=int(minute), second=int(second or 0), microsecond=0
+        )
+    else:
+        moment = datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second or 0)
+        )
+    if fraction:
+        moment += timedelta(seconds=float(f"0.{fraction}"))
+    return moment.timestamp()
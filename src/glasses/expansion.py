@@ -0,0 +1,78 @@
+"""The expanded view of a raw log line.
+
+A json line is pretty printed once. Only the lines that are shown are
+highlighted, so expanding a large document stays cheap.
+"""
+import json
+import sys
+from collections import OrderedDict
+from typing import NamedTuple
+
+from rich.highlighter import JSONHighlighter
+from rich.text import Text
+
+# maximum amount of bytes used by cached expansions.
+EXPANSION_CACHE_BYTES = 32 * 1024 * 1024
+
+_highlighter = JSONHighlighter()
+
+
+class Expansion(NamedTuple):
+    lines: list[str]
+    is_json: bool
+    max_width: int
+    memory: int  # estimated amount of bytes used by the lines.
+
+    def text(self, line_idx: int) -> Text:
+        """Return a line of the expansion, highlighted when it is json."""
+        line = Text(self.lines[line_idx])
+        if self.is_json:
+            _highlighter.highlight(line)
+        return line
+
+
+def expand(raw: str) -> Expansion:
+    """Pretty print a json line. Other lines are split on newlines."""
+    try:
+        lines = json.dumps(json.loads(raw), indent=2, ensure_ascii=False).split("\n")
+        is_json = True
+    except json.JSONDecodeError:
+        lines = raw.split("\n")
+        is_json = False
+    return Expansion(
+        lines,
+        is_json,
+        max_width=max(len(line) for line in lines),
+        memory=sys.getsizeof(lines) + sum(sys.getsizeof(line) for line in lines),
+    )
+
+
+class ExpansionCache:
+    """Expansions by log data index, within a memory budget.
+
+    The least recently used expansions are removed first.
+    """
+
+    def __init__(self, max_bytes: int = EXPANSION_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.memory = 0
+        self._expansions: OrderedDict[int, Expansion] = OrderedDict()
+
+    def get(self, log_data_idx: int, raw: str) -> Expansion:
+        expansion = self._expansions.get(log_data_idx)
+        if expansion is not None:
+            self._expansions.move_to_end(log_data_idx)
+            return expansion
+
+        expansion = expand(raw)
+        self._expansions[log_data_idx] = expansion
+        self.memory += expansion.memory
+        # the newest expansion is always kept, even when it exceeds the budget.
+        while self.memory > self.max_bytes and len(self._expansions) > 1:
+            _, removed = self._expansions.popitem(last=False)
+            self.memory -= removed.memory
+        return expansion
+
+    def clear(self) -> None:
+        self._expansions.clear()
+        self.memory = 0
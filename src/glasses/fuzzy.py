@@ -0,0 +1,92 @@
+"""Fuzzy matching of names, like fzf.
+
+A pattern matches a name when its characters appear in the name in the same
+order. Matches are scored higher when the characters are consecutive, or
+start at the beginning of a word.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+SCORE_MATCH = 16
+BONUS_CONSECUTIVE = 8
+BONUS_BOUNDARY = 8
+BONUS_FIRST = 4
+PENALTY_GAP = 1
+
+_BOUNDARIES = frozenset(" -_./:")
+
+
+def fuzzy_score(pattern: str, name: str) -> int | None:
+    """Return the score of a lowercase pattern in a lowercase name.
+
+    None when the pattern does not match.
+    """
+    if not pattern:
+        return 0
+    # find the end of the leftmost match.
+    position = -1
+    for char in pattern:
+        position = name.find(char, position + 1)
+        if position < 0:
+            return None
+    end = position
+
+    # walk back from the end to find the shortest match ending there.
+    positions = [end]
+    for char in reversed(pattern[:-1]):
+        positions.append(name.rfind(char, 0, positions[-1]))
+    positions.reverse()
+
+    score = 0
+    previous = -2
+    for position in positions:
+        score += SCORE_MATCH
+        if position == previous + 1:
+            score += BONUS_CONSECUTIVE
+        elif previous >= 0:
+            score -= PENALTY_GAP * (position - previous - 1)
+        if position == 0:
+            score += BONUS_BOUNDARY + BONUS_FIRST
+        elif name[position - 1] in _BOUNDARIES:
+            score += BONUS_BOUNDARY
+        previous = position
+    return score
+
+
+class FuzzyIndex:
+    """Rank names by how well they match a pattern.
+
+    The lowercase names are computed once. When a pattern extends the
+    previous pattern only the names which matched before are scored again, as
+    other names can not match the longer pattern either.
+    """
+
+    def __init__(self, names: list[str]) -> None:
+        self.names = names
+        self._lower = [name.lower() for name in names]
+
+        self._pattern = ""
+        # indexes of the names matching the pattern.
+        self._candidates: Sequence[int] = range(len(names))
+
+    def filter(self, pattern: str) -> list[str]:
+        """Return the matching names, best match first.
+
+        Names with an equal score keep their order.
+        """
+        pattern = pattern.lower()
+        if not pattern.startswith(self._pattern):
+            self._candidates = range(len(self.names))
+
+        lower = self._lower
+        scored = []
+        for idx in self._candidates:
+            score = fuzzy_score(pattern, lower[idx])
+            if score is not None:
+                scored.append((score, idx))
+
+        self._pattern = pattern
+        self._candidates = [idx for _, idx in scored]
+        scored.sort(key=lambda item: -item[0])
+        return [self.names[idx] for _, idx in scored]
@@ -3,13 +3,38 @@ from __future__ import annotations
 import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, NamedTuple
 
-from kubernetes import client, config  # type: ignore
+from glasses.namespace_provider import NameSpace, Pod, WatchExpired
 
-from glasses.namespace_provider import NameSpace, Pod
+# the kubernetes clients take a long time to import. They are imported when
+# the cluster is first accessed, so the app is shown before that.
+if TYPE_CHECKING:
+    from kubernetes import client  # type: ignore
+    from kubernetes_asyncio import client as async_client
+
+# time in seconds after which the server ends a watch. The watch is restarted
+# from the last known resource version.
+WATCH_TIMEOUT = 240
+
+
+class PodListing(NamedTuple):
+    pods: dict[str, Pod]
+
+    # version of the listing. Used to start watching for changes. None if unknown.
+    resource_version: str | None
+
+
+class PodEvent(NamedTuple):
+    type: str  # ADDED, MODIFIED, DELETED or BOOKMARK
+    pod: Pod | None  # None for a bookmark event.
+    resource_version: str
 
 
 class BaseClient(ABC):
+    # whether this client is able to watch for resource changes.
+    supports_watch: bool = False
+
     @abstractmethod
     async def get_namespaces(self) -> dict[str, NameSpace]:
         ...
@@ -18,12 +43,36 @@ class BaseClient(ABC):
     async def get_resources(self, namespace: str) -> dict[str, Pod]:
         ...
 
+    async def list_resources(self, namespace: str) -> PodListing:
+        return PodListing(await self.get_resources(namespace), resource_version=None)
+
+    async def watch_resources(
+        self, namespace: str, resource_version: str
+    ) -> AsyncIterator[PodEvent]:
+        """Yield pod changes which happened after the provided resource version.
+
+        Raises:
+            WatchExpired: The resource version is too old to continue from.
+        """
+        return
+        yield
+
 
 class K8Client(BaseClient):
+    supports_watch = True
+
     def __init__(self) -> None:
         super().__init__()
-        self._config = config.load_config()
-        self._client = client.CoreV1Api()
+        self._client: client.CoreV1Api | None = None
+        self._async_client: async_client.CoreV1Api | None = None
+
+    def _get_client(self) -> client.CoreV1Api:
+        if self._client is None:
+            from kubernetes import client, config
+
+            config.load_config()
+            self._client = client.CoreV1Api()
+        return self._client
 
     async def get_namespaces(self) -> dict[str, NameSpace]:
         """get namespaces.
@@ -38,6 +87,8 @@ class K8Client(BaseClient):
         # for context in loader.list_contexts():
         #     print(context["context"]["namespace"])
 
+        from kubernetes import config
+
         contexts = config.list_kube_config_contexts()
 
         result: dict[str, NameSpace] = {}
@@ -47,24 +98,72 @@ class K8Client(BaseClient):
             result[_namespace] = NameSpace(_namespace, client=self)
         return result
 
+    def _to_pod(self, pod: Any, namespace: str) -> Pod:
+        return Pod(
+            pod.metadata.name,
+            namespace=namespace,
+            client=self,
+            creation_timestamp=pod.metadata.creation_timestamp,
+        )
+
     async def get_resources(self, namespace: str) -> dict[str, Pod]:
+        listing = await self.list_resources(namespace)
+        return listing.pods
+
+    async def list_resources(self, namespace: str) -> PodListing:
         loop = asyncio.get_running_loop()
         v1_pod_list = await loop.run_in_executor(
-            None, self._client.list_namespaced_pod, namespace
+            None, self._get_client().list_namespaced_pod, namespace
         )
 
         result: dict[str, Pod] = {}
         for pod in v1_pod_list.items:
-            _pod_name = pod.metadata.name
-            _creation_timestamp = pod.metadata.creation_timestamp
-
-            result[_pod_name] = Pod(
-                _pod_name,
-                namespace=namespace,
-                client=self,
-                creation_timestamp=_creation_timestamp,
-            )
-        return result
+            result[pod.metadata.name] = self._to_pod(pod, namespace)
+        return PodListing(result, v1_pod_list.metadata.resource_version)
+
+    async def _get_async_client(self) -> async_client.CoreV1Api:
+        if self._async_client is None:
+            from kubernetes_asyncio import client as async_client
+            from kubernetes_asyncio import config as async_config
+
+            await async_config.load_kube_config()
+            self._async_client = async_client.CoreV1Api()
+        return self._async_client
+
+    async def watch_resources(
+        self, namespace: str, resource_version: str
+    ) -> AsyncIterator[PodEvent]:
+        from kubernetes_asyncio import watch
+        from kubernetes_asyncio.client.exceptions import ApiException
+
+        v1 = await self._get_async_client()
+        pod_watch = watch.Watch()
+        try:
+            async with pod_watch.stream(
+                v1.list_namespaced_pod,
+                namespace,
+                resource_version=resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=WATCH_TIMEOUT,
+            ) as stream:
+                async for event in stream:
+                    if event["type"] == "BOOKMARK":
+                        yield PodEvent(
+                            "BOOKMARK",
+                            None,
+                            event["raw_object"]["metadata"]["resourceVersion"],
+                        )
+                        continue
+                    pod = event["object"]
+                    yield PodEvent(
+                        event["type"],
+                        self._to_pod(pod, namespace),
+                        pod.metadata.resource_version,
+                    )
+        except ApiException as err:
+            if err.status == 410:
+                raise WatchExpired(namespace) from err
+            raise
 
 
 class DummyClient(BaseClient):
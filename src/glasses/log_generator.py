@@ -0,0 +1,105 @@
+"""Generate synthetic log lines.
+
+Used to benchmark the parsing and rendering pipeline and to put the ui under
+a realistic load in demo mode.
+"""
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+from glasses.log_parsers.json_parser import TEXT_FORMAT
+
+
+class LineKind(Enum):
+    JSON = "json"
+    PLAIN = "plain"
+    MULTILINE = "multiline"  # a json line with an exception traceback.
+    LONG = "long"  # a json line with a large extra field.
+
+
+DEFAULT_MIX: dict[LineKind, float] = {
+    LineKind.JSON: 0.6,
+    LineKind.PLAIN: 0.25,
+    LineKind.MULTILINE: 0.1,
+    LineKind.LONG: 0.05,
+}
+
+_LEVELS = ["info", "warning", "error", "debug"]
+_LEVEL_WEIGHTS = [0.75, 0.1, 0.05, 0.1]
+_LOGGERS = ["__main__", "app.api", "app.db.session", "app.worker.jobs"]
+_WORDS = (
+    "request handled user order payment retry connection timeout cache miss "
+    "queue message received processed failed started stopped"
+).split()
+
+_TRACEBACK = (
+    "Traceback (most recent call last):\n"
+    '  File "/app/worker/jobs.py", line {line}, in run\n'
+    "    result = handler(message)\n"
+    '  File "/app/worker/handlers.py", line 42, in handler\n'
+    '    return payload["key"]\n'
+    "KeyError: 'key'"
+)
+
+
+class LogGenerator:
+    def __init__(
+        self,
+        mix: dict[LineKind, float] | None = None,
+        seed: int | None = 0,
+        message_words: tuple[int, int] = (3, 12),
+        long_line_length: int = 2000,
+    ) -> None:
+        mix = mix or DEFAULT_MIX
+        self._kinds = list(mix)
+        self._weights = list(mix.values())
+        self._random = random.Random(seed)
+        self._time = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.message_words = message_words
+        self.long_line_length = long_line_length
+
+    def _timestamp(self) -> str:
+        self._time += timedelta(milliseconds=self._random.randint(0, 20))
+        return self._time.strftime(TEXT_FORMAT)
+
+    def _message(
+        self, min_words: int | None = None, max_words: int | None = None
+    ) -> str:
+        if min_words is None:
+            min_words = self.message_words[0]
+        if max_words is None:
+            max_words = self.message_words[1]
+        count = self._random.randint(min_words, max_words)
+        return " ".join(self._random.choices(_WORDS, k=count))
+
+    def _json(self, **extra: str) -> str:
+        return json.dumps(
+            {
+                "@timestamp": self._timestamp(),
+                "log.level": self._random.choices(_LEVELS, _LEVEL_WEIGHTS)[0],
+                "message": self._message(),
+                "logger": self._random.choice(_LOGGERS),
+                "ecs": {"version": "1.6.0"},
+                **extra,
+            }
+        )
+
+    def line(self, kind: LineKind | None = None) -> str:
+        if kind is None:
+            kind = self._random.choices(self._kinds, self._weights)[0]
+
+        if kind is LineKind.JSON:
+            return self._json()
+        if kind is LineKind.MULTILINE:
+            return self._json(
+                exception=_TRACEBACK.format(line=self._random.randint(1, 500))
+            )
+        if kind is LineKind.LONG:
+            return self._json(payload=self._message(400, 400)[: self.long_line_length])
+
+        level = self._random.choices(_LEVELS, _LEVEL_WEIGHTS)[0]
+        return f"{self._timestamp()} [ {level} ] {self._message()}"
+
+    def lines(self, count: int, kind: LineKind | None = None) -> list[str]:
+        return [self.line(kind) for _ in range(count)]
@@ -0,0 +1,104 @@
+"""Extract the level and the time of a log line.
+
+Both are looked up with regular expressions on the raw line, which is a lot
+cheaper than parsing the line.
+"""
+import calendar
+import math
+import re
+from enum import IntEnum
+
+
+class Level(IntEnum):
+    UNKNOWN = 0
+    DEBUG = 1
+    INFO = 2
+    WARNING = 3
+    ERROR = 4
+
+
+_LEVELS = {
+    "debug": Level.DEBUG,
+    "trace": Level.DEBUG,
+    "info": Level.INFO,
+    "warn": Level.WARNING,
+    "warning": Level.WARNING,
+    "err": Level.ERROR,
+    "error": Level.ERROR,
+    "critical": Level.ERROR,
+    "fatal": Level.ERROR,
+}
+
+_JSON_LEVEL = re.compile(r'"(?:log\.level|level)"\s*:\s*"(\w+)"')
+_LEVEL_WORD = re.compile(
+    r"\b(debug|trace|info|warn|warning|err|error|critical|fatal)\b", re.IGNORECASE
+)
+
+_TIMESTAMP = (
+    r"(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d):(\d\d)(?:[.,](\d+))?(Z|[+-]\d\d:?\d\d)?"
+)
+_JSON_TIMESTAMP = re.compile(rf'"@timestamp"\s*:\s*"{_TIMESTAMP}"')
+_LINE_TIMESTAMP = re.compile(_TIMESTAMP)
+
+
+def line_level(line: str) -> Level:
+    """Return the level of a json or plain text log line."""
+    match = _JSON_LEVEL.search(line) or _LEVEL_WORD.search(line)
+    if match is None:
+        return Level.UNKNOWN
+    return _LEVELS.get(match.group(1).lower(), Level.UNKNOWN)
+
+
+def _epoch(match: re.Match[str]) -> float:
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    epoch: float = calendar.timegm(
+        (int(year), int(month), int(day), int(hour), int(minute), int(second))
+    )
+    if fraction:
+        epoch += float(f"0.{fraction}")
+    if offset and offset != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        hours, minutes = int(offset[1:3]), int(offset[-2:])
+        epoch -= sign * (hours * 3600 + minutes * 60)
+    return epoch
+
+
+def timestamp_epoch(timestamp: str) -> float:
+    """Return the epoch of an ISO 8601 timestamp, or nan when it is not one.
+
+    Timestamps without a timezone are taken to be UTC.
+    """
+    match = _LINE_TIMESTAMP.match(timestamp)
+    return math.nan if match is None else _epoch(match)
+
+
+def split_timestamp(line: str) -> tuple[str | None, str]:
+    """Split a `timestamps=True` log line in its timestamp and the actual line."""
+    timestamp, sep, data = line.partition(" ")
+    if not sep or not timestamp.endswith("Z") or timestamp[4:5] != "-":
+        return None, line
+    return timestamp, data
+
+
+def split_timestamps(line: str) -> tuple[list[str], list[str]]:
+    """Split a line in the text around its timestamps and the timestamps.
+
+    The text has one item more than the timestamps. Joining them alternately
+    returns the line.
+    """
+    texts = []
+    timestamps = []
+    start = 0
+    for match in _LINE_TIMESTAMP.finditer(line):
+        texts.append(line[start : match.start()])
+        timestamps.append(match.group(0))
+        start = match.end()
+    texts.append(line[start:])
+    return texts, timestamps
+
+
+def line_epoch(line: str) -> float:
+    """Return the epoch of the `@timestamp` of a json line or of the timestamp
+    a plain text line starts with. nan when the line has no timestamp."""
+    match = _JSON_TIMESTAMP.search(line) or _LINE_TIMESTAMP.match(line)
+    return math.nan if match is None else _epoch(match)
@@ -0,0 +1,198 @@
+"""Parse log lines outside of the thread running the ui.
+
+Batches of raw lines are parsed by a pool of worker processes, or by threads
+when python runs without a GIL. Workers return the parsed lines in a compact,
+picklable form: the plain text and its style spans. Turning those back into
+a `Text` is cheap.
+"""
+import asyncio
+import math
+import multiprocessing
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+
+from rich.text import Span, Text
+
+from glasses.log_parsers import plain_text_parser
+from glasses.log_parsers.json_parser import JsonParseError, jsonparse
+from glasses.log_parsers.line_info import (
+    Level,
+    line_epoch,
+    line_level,
+    split_timestamp,
+    timestamp_epoch,
+)
+
+# parsers by their name in the logparser setting.
+PARSERS: dict[str, Callable[[str], Text]] = {"json": jsonparse}
+
+# plain text, base style, list of (start, end, style).
+CompactText = tuple[str, str, list[tuple[int, int, str]]]
+
+
+class ParsedLine(NamedTuple):
+    # where the line starts after its `timestamps=True` prefix.
+    offset: int
+    text: Text
+    epoch: float
+    level: Level
+
+
+def parse_line(data: str, parser: Callable[[str], Text] = jsonparse) -> Text:
+    """Parse a line as json. When that fails, parse it as plain text."""
+    try:
+        return parser(data)
+    except JsonParseError:
+        parsed = plain_text_parser.parse(data)
+        return Text.assemble(Text("[!E] ", "red"), parsed)
+
+
+def parse_log_line(
+    line: str, timestamps: bool = False, parser: Callable[[str], Text] = jsonparse
+) -> ParsedLine:
+    """Parse a line and find its epoch and level.
+
+    Args:
+        line: The log line.
+        timestamps: Whether the line starts with a `timestamps=True` prefix.
+            The prefix is preferred over a timestamp in the line itself.
+        parser: Parses the line without its prefix.
+    """
+    offset = 0
+    epoch = math.nan
+    if timestamps:
+        timestamp, data = split_timestamp(line)
+        if timestamp is not None:
+            offset = len(line) - len(data)
+            epoch = timestamp_epoch(timestamp)
+    data = line[offset:]
+    if math.isnan(epoch):
+        epoch = line_epoch(data)
+    return ParsedLine(offset, parse_line(data, parser), epoch, line_level(data))
+
+
+def compact(text: Text) -> CompactText:
+    return (
+        text.plain,
+        str(text.style),
+        [(span.start, span.end, str(span.style)) for span in text.spans],
+    )
+
+
+def to_text(compact_text: CompactText) -> Text:
+    plain, style, spans = compact_text
+    return Text(
+        plain, style=style, spans=[Span(start, end, st) for start, end, st in spans]
+    )
+
+
+# a ParsedLine with its text compacted.
+CompactLine = tuple[int, CompactText, float, Level]
+
+
+def parse_batch(
+    batch: list[str], timestamps: bool, parser_name: str = "json"
+) -> tuple[list[CompactLine], float]:
+    """Parse a batch of lines. Runs inside a worker.
+
+    Args:
+        batch: The lines.
+        timestamps: Whether the lines start with a `timestamps=True` prefix.
+        parser_name: The name of the parser in PARSERS. Parsers are passed by
+            name, as the worker may be another process.
+
+    Returns:
+        The parsed lines and the time in seconds it took to parse them.
+    """
+    start = time.perf_counter()
+    parser = PARSERS[parser_name]
+    result = []
+    for line in batch:
+        offset, text, epoch, level = parse_log_line(line, timestamps, parser)
+        result.append((offset, compact(text), epoch, level))
+    return result, time.perf_counter() - start
+
+
+def _gil_enabled() -> bool:
+    is_gil_enabled: Callable[[], bool] | None = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+class ParsePool:
+    def __init__(self, workers: int, use_threads: bool | None = None) -> None:
+        """Initialize the pool.
+
+        Args:
+            workers: The amount of workers.
+            use_threads: Parse using threads instead of processes. Defaults to
+                using threads only when python runs without a GIL.
+        """
+        self.workers = workers
+        if use_threads is None:
+            use_threads = not _gil_enabled()
+        self.use_threads = use_threads
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_threads:
+                self._executor = ThreadPoolExecutor(self.workers)
+            else:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def parse(
+        self,
+        batches: AsyncIterator[list[str]],
+        timestamps: bool = False,
+        parser_name: str = "json",
+    ) -> AsyncIterator[tuple[list[str], list[ParsedLine], float]]:
+        """Parse the batches in the workers.
+
+        The lines are parsed by the parser named parser_name in PARSERS.
+        Multiple batches are parsed at the same time. They are yielded in the
+        order they arrived, together with their parsed lines and the time it
+        took to parse them.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        slots = asyncio.Semaphore(self.workers * 2)
+        in_flight: asyncio.Queue[
+            tuple[list[str], asyncio.Future[tuple[list[CompactLine], float]]] | None
+        ] = asyncio.Queue()
+
+        async def submit() -> None:
+            try:
+                async for batch in batches:
+                    await slots.acquire()
+                    future = loop.run_in_executor(
+                        executor, parse_batch, batch, timestamps, parser_name
+                    )
+                    in_flight.put_nowait((batch, future))
+            finally:
+                in_flight.put_nowait(None)
+
+        submitter = asyncio.create_task(submit())
+        try:
+            while (item := await in_flight.get()) is not None:
+                batch, future = item
+                parsed, seconds = await future
+                slots.release()
+                yield batch, [
+                    ParsedLine(offset, to_text(text), epoch, level)
+                    for offset, text, epoch, level in parsed
+                ], seconds
+            # raise any exception of the submitter.
+            await submitter
+        finally:
+            submitter.cancel()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
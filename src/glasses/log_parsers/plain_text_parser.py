@@ -1,14 +1,19 @@
+from __future__ import annotations
+
 import logging
+from functools import cache
+from typing import TYPE_CHECKING
 
-from lark import Lark, LarkError, Token
 from rich.text import Text
 
+if TYPE_CHECKING:
+    from lark import Lark, LarkError, Token
+
 _logger = logging.getLogger(__name__)
 
 # for lark cheatsheet go here: https://github.com/lark-parser/lark/blob/master/docs/_static/lark_cheatsheet.pdf
 
-parser = Lark(
-    r"""
+GRAMMAR = r"""
     start:  _line+ // find the rule 1 or more times.
 
     _line: WARN | ERROR | SPACES | WORDS // the underscore tells lark to inline the rule (no nested tree)
@@ -20,23 +25,45 @@ parser = Lark(
 
     %import common.WS
 
-""",
-    start="start",
-)
+"""
+
+
+@cache
+def _parser() -> Lark:
+    """Return the parser, which is built on first use.
+
+    Importing lark and compiling the grammar is slow, so it is not done when
+    this module is imported. The earley parser is needed to prefer the longest
+    match (`warnings` is a word), which rules out lark's grammar cache as that
+    only supports lalr.
+    """
+    from lark import Lark
+
+    return Lark(GRAMMAR, start="start")
+
+
+@cache
+def _lark_types() -> tuple[type[LarkError], type[Token]]:
+    """Return the lark types used by parse, imported once like the parser."""
+    from lark import LarkError, Token
+
+    return LarkError, Token
 
 
 def parse(input: str) -> Text:
+    lark_error, token_type = _lark_types()
+
     input = input.rstrip("\n")
     try:
-        tokens = parser.parse(input)
-    except LarkError:
+        tokens = _parser().parse(input)
+    except lark_error:
         _logger.exception("failed to tokenize input %s", input)
         return Text(input)
 
     output: list[Text | str] = []
 
     for token in tokens.children:
-        assert isinstance(token, Token)
+        assert isinstance(token, token_type)
         if token.type == "WARN":
             output.append(Text(token.value, "yellow"))
         elif token.type == "ERROR":
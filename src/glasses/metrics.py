@@ -0,0 +1,129 @@
+"""Counters describing the log ingestion pipeline.
+
+cluster -> LogReader queue -> parser -> LineCache -> LogOutput rendering.
+
+Totals are counted as the data flows through. Rates are calculated when a
+snapshot is taken, over the time passed since the previous snapshot.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, NamedTuple
+
+# weight of the latest frame in the moving average of the render latency.
+RENDER_LATENCY_WEIGHT = 0.2
+
+
+class MetricsSnapshot(NamedTuple):
+    lines_per_second: float
+    bytes_per_second: float
+    parse_time_per_line: float  # seconds
+    queue_depth: int  # lines
+    average_batch_size: float  # lines per batch added to the LineCache.
+    render_time_per_frame: float  # seconds
+    buffer_memory: int  # bytes
+    lines_received: int
+    lines_parsed: int
+    frames_rendered: int
+
+    def summary(self) -> str:
+        """A compact, single line representation."""
+        return (
+            f"{_human(self.lines_per_second)} lines/s"
+            f"  {_human(self.bytes_per_second)}B/s"
+            f"  parse {self.parse_time_per_line * 1e6:.0f}µs/line"
+            f"  queue {self.queue_depth}"
+            f"  batch {self.average_batch_size:.0f}"
+            f"  render {self.render_time_per_frame * 1e3:.1f}ms"
+            f"  buffer {_human(self.buffer_memory)}B"
+        )
+
+
+def _human(value: float) -> str:
+    for unit in ("", "k", "M", "G"):
+        if abs(value) < 1000:
+            return f"{value:.1f}{unit}"
+        value /= 1000
+    return f"{value:.1f}T"
+
+
+class PipelineMetrics:
+    def __init__(self) -> None:
+        self.lines_received = 0
+        self.bytes_received = 0
+        self.lines_parsed = 0
+        self.parse_seconds = 0.0
+        self.queue_depth = 0
+        self.batches_added = 0
+        self.batch_lines_added = 0
+        self.frames_rendered = 0
+        self.render_seconds = 0.0
+        # moving average of the seconds rendering a frame takes.
+        self.render_latency = 0.0
+        self.buffer_memory = 0
+
+        self._previous: dict[str, Any] = self._totals()
+
+    def _totals(self) -> dict[str, Any]:
+        return {
+            "time": time.monotonic(),
+            "lines_received": self.lines_received,
+            "bytes_received": self.bytes_received,
+            "lines_parsed": self.lines_parsed,
+            "parse_seconds": self.parse_seconds,
+            "batches_added": self.batches_added,
+            "batch_lines_added": self.batch_lines_added,
+            "frames_rendered": self.frames_rendered,
+            "render_seconds": self.render_seconds,
+        }
+
+    def received(self, lines: int, size: int) -> None:
+        self.lines_received += lines
+        self.bytes_received += size
+
+    def parsed(self, lines: int, seconds: float) -> None:
+        self.lines_parsed += lines
+        self.parse_seconds += seconds
+
+    def batch_added(self, lines: int, buffer_memory: int) -> None:
+        self.batches_added += 1
+        self.batch_lines_added += lines
+        self.buffer_memory = buffer_memory
+
+    def rendered(self, seconds: float) -> None:
+        self.frames_rendered += 1
+        self.render_seconds += seconds
+        self.render_latency += (seconds - self.render_latency) * RENDER_LATENCY_WEIGHT
+
+    def snapshot(self, reset: bool = True) -> MetricsSnapshot:
+        """Return the current state. Rates are calculated since the previous snapshot.
+
+        Args:
+            reset: Whether the next snapshot calculates its rates since this one.
+                Occasional readers pass False, so the rates of the periodic
+                readout are not disturbed.
+        """
+        current = self._totals()
+        previous = self._previous
+        if reset:
+            self._previous = current
+
+        def delta(key: str) -> Any:
+            return current[key] - previous[key]
+
+        def ratio(numerator: str, denominator: str) -> float:
+            return delta(numerator) / delta(denominator) if delta(denominator) else 0
+
+        elapsed = delta("time") or 1e-9
+        return MetricsSnapshot(
+            lines_per_second=delta("lines_received") / elapsed,
+            bytes_per_second=delta("bytes_received") / elapsed,
+            parse_time_per_line=ratio("parse_seconds", "lines_parsed"),
+            queue_depth=self.queue_depth,
+            average_batch_size=ratio("batch_lines_added", "batches_added"),
+            render_time_per_frame=ratio("render_seconds", "frames_rendered"),
+            buffer_memory=self.buffer_memory,
+            lines_received=self.lines_received,
+            lines_parsed=self.lines_parsed,
+            frames_rendered=self.frames_rendered,
+        )
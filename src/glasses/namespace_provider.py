@@ -1,16 +1,43 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import math
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum, unique
-from typing import TYPE_CHECKING, Any, Generic, Iterator, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterator,
+    NamedTuple,
+    TypeVar,
+)
 
 from rich.text import Text
 
+from glasses.fuzzy import FuzzyIndex
+from glasses.reactive_model import Reactr, ReactrModel
+
 if TYPE_CHECKING:
-    from glasses.k8client import BaseClient
+    from glasses.k8client import BaseClient, PodEvent
+
+_logger = logging.getLogger(__name__)
 
 ItemType = TypeVar("ItemType", bound="BaseK8")
+T = TypeVar("T")
+
+# time in seconds a pod listing is trusted when it is not kept up to date by a watch.
+POD_CACHE_TTL = 300.0
+
+# amount of namespaces of which the pods are listed at the same time when
+# prefetching, and the seconds after which listing a namespace is given up.
+PREFETCH_CONCURRENCY = 4
+PREFETCH_TIMEOUT = 30.0
 
 
 @unique
@@ -18,17 +45,108 @@ class Commands(Enum):
     VIEW_LOG = "view log"
 
 
-class BaseK8(ABC, Generic[ItemType]):
+class WatchExpired(Exception):
+    """The resource version used to watch a resource is no longer available.
+
+    A full relist is required to continue watching.
+    """
+
+
+class ItemsDiff(NamedTuple):
+    """Names of the items which have changed after a refresh or watch event."""
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    updated: tuple[str, ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.updated)
+
+
+def diff_items(old: dict[str, Any], new: dict[str, Any]) -> ItemsDiff:
+    """Compare two item collections by name."""
+    return ItemsDiff(
+        added=tuple(name for name in new if name not in old),
+        removed=tuple(name for name in old if name not in new),
+        updated=tuple(name for name in new if name in old and new[name] != old[name]),
+    )
+
+
+class _Flight:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class BaseK8(ReactrModel, ABC, Generic[ItemType]):
+    # published every time the items of this resource change.
+    changes = Reactr[ItemsDiff](ItemsDiff(), compare=False)
+    # whether the items are being fetched from the cluster.
+    is_refreshing = Reactr(False)
+
     def __init__(self, name: str, client: BaseClient) -> None:
+        super().__init__()
         self.name = name
         self._items: dict[str, ItemType] = {}
         self._client = client
         self.commands: set[Commands] = set()
         self.filter_text: str = ""
+        self._filter_index = FuzzyIndex([])
+
+        # monotonic time at which the items were last known to be up to date.
+        # None when they never were.
+        self.synced_at: float | None = None
+        # running fetches by name, shared by concurrent callers.
+        self._in_flight: dict[str, _Flight] = {}
+
+    @property
+    def age(self) -> float:
+        """Seconds since the items were last known to be up to date."""
+        if self.synced_at is None:
+            return math.inf
+        return time.monotonic() - self.synced_at
+
+    async def refresh(self, max_age: float | None = None) -> dict[str, ItemType]:
+        """Refresh this resource.
+
+        Concurrent calls share a single refresh.
+
+        Args:
+            max_age: Return the cached items when they are at most this amount
+                of seconds old.
+        """
+        if max_age is not None and self.age <= max_age:
+            return self._items
+        return await self._single_flight("refresh", self._refresh)
 
     @abstractmethod
-    async def refresh(self) -> dict[str, ItemType]:
-        """Refresh this resource."""
+    async def _refresh(self) -> dict[str, ItemType]:
+        """Fetch the items of this resource and update them."""
+
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Run fetch, or wait for the fetch already running under this key.
+
+        A cancelled caller does not cancel the fetch of the other callers. The
+        fetch is cancelled when all its callers are.
+        """
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = self._in_flight[key] = _Flight(asyncio.ensure_future(fetch()))
+            flight.future.add_done_callback(lambda _: self._in_flight.pop(key))
+
+        flight.waiters += 1
+        try:
+            result: T = await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.future.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+        return result
 
     @property
     def items(self) -> dict[str, ItemType]:
@@ -39,14 +157,23 @@ class BaseK8(ABC, Generic[ItemType]):
         return self._items
 
     def filter_items(self) -> Iterator[ItemType]:
-        for item in self._items.values():
-            if self.filter_text in item.name:
-                yield item
+        """Yield the items fuzzy matching the filter text, best match first."""
+        if not self.filter_text:
+            yield from self._items.values()
+            return
+        names = list(self._items)
+        if names != self._filter_index.names:
+            self._filter_index = FuzzyIndex(names)
+        for name in self._filter_index.filter(self.filter_text):
+            yield self._items[name]
 
     @property
     def label(self) -> Text | str:
         return self.name
 
+    def close(self) -> None:
+        """Stop any background activity of this resource."""
+
 
 class Pod(BaseK8):
     DATETIME_OUTPUT = "%Y-%m-%d %H:%M:%S"
@@ -63,7 +190,19 @@ class Pod(BaseK8):
         super().__init__(name, client)
         self.commands = {Commands.VIEW_LOG}
 
-    async def refresh(self) -> dict[str, Any]:
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Pod):
+            return NotImplemented
+        return (self.name, self.namespace, self.creation_timestamp) == (
+            other.name,
+            other.namespace,
+            other.creation_timestamp,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.namespace, self.creation_timestamp))
+
+    async def _refresh(self) -> dict[str, Any]:
         return self.items
 
     @property
@@ -79,20 +218,186 @@ class Pod(BaseK8):
 
 
 class NameSpace(BaseK8[Pod]):
-    """A k8s namespace"""
+    """A k8s namespace
 
-    async def refresh(self) -> dict[str, Pod]:
-        self._items = await self._client.get_resources(self.name)
+    The pods are listed once and kept up to date by watching the namespace
+    (when the client supports it). Without a running watch the listing is
+    trusted for `cache_ttl` seconds after which a refresh lists all pods again.
+    """
+
+    def __init__(
+        self, name: str, client: BaseClient, cache_ttl: float = POD_CACHE_TTL
+    ) -> None:
+        super().__init__(name, client)
+        self.cache_ttl = cache_ttl
+        self._resource_version: str | None = None
+        self._watch_task: asyncio.Task | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the cached pods can be returned without asking the cluster."""
+        return self.age < self.cache_ttl
+
+    @property
+    def is_watching(self) -> bool:
+        """Whether a watch keeps the cached pods up to date."""
+        return self._watch_task is not None and not self._watch_task.done()
+
+    async def _refresh(self) -> dict[str, Pod]:
+        if self.is_watching:
+            await self.prefetch()
+        else:
+            # without a watch the cached pods may be outdated. Always list.
+            await self._single_flight("list", self._list)
+        # a listing is kept up to date from now on.
+        self._start_watch()
         return self._items
 
+    async def prefetch(self) -> None:
+        """List the pods when the cached pods are outdated, without watching."""
+        if not self.is_fresh:
+            await self._single_flight("list", self._list)
+
+    async def _list(self) -> None:
+        self.is_refreshing = True
+        try:
+            listing = await self._client.list_resources(self.name)
+        finally:
+            self.is_refreshing = False
+        diff = diff_items(self._items, listing.pods)
+
+        self._items = listing.pods
+        self._resource_version = listing.resource_version
+        self.synced_at = time.monotonic()
+
+        if not diff.is_empty:
+            self.changes = diff
+
+    def _start_watch(self) -> None:
+        if not self._client.supports_watch or self._resource_version is None:
+            return
+        if self.is_watching:
+            return
+        self._watch_task = asyncio.create_task(self._watch())
+
+    async def _watch(self) -> None:
+        try:
+            while self._resource_version is not None:
+                try:
+                    async for event in self._client.watch_resources(
+                        self.name, self._resource_version
+                    ):
+                        self._apply_event(event)
+                except WatchExpired:
+                    _logger.info("watch of namespace %s expired. relisting.", self.name)
+                    await self._list()
+                else:
+                    # the server ended the watch after its timeout. Nothing changed.
+                    self.synced_at = time.monotonic()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # the cache falls back to relisting once it has expired.
+            _logger.exception("watching namespace %s failed", self.name)
+
+    def _apply_event(self, event: PodEvent) -> None:
+        self._resource_version = event.resource_version
+        self.synced_at = time.monotonic()
+
+        pod = event.pod
+        if pod is None:
+            # a bookmark. Only the resource version is updated.
+            return
+        if event.type == "DELETED":
+            if self._items.pop(pod.name, None) is not None:
+                self.changes = ItemsDiff(removed=(pod.name,))
+            return
+
+        existing = self._items.get(pod.name)
+        self._items[pod.name] = pod
+        if existing is None:
+            self.changes = ItemsDiff(added=(pod.name,))
+        elif existing != pod:
+            self.changes = ItemsDiff(updated=(pod.name,))
+
+    def close(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+        self.synced_at = None
+
 
 class Cluster(BaseK8[NameSpace]):
-    """A k8s cluster"""
+    """A k8s cluster
 
-    def __init__(self, name: str, client: BaseClient) -> None:
+    After refreshing, the pods of all namespaces are listed in the background,
+    so entering a namespace shows its pods right away.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client: BaseClient,
+        prefetch_concurrency: int = PREFETCH_CONCURRENCY,
+        prefetch_timeout: float = PREFETCH_TIMEOUT,
+    ) -> None:
         super().__init__(name, client=client)
+        self.prefetch_concurrency = prefetch_concurrency
+        self.prefetch_timeout = prefetch_timeout
+        self._prefetch_task: asyncio.Task | None = None
+
+    async def _refresh(self) -> dict[str, NameSpace]:
+        self.is_refreshing = True
+        try:
+            data = await self._client.get_namespaces()
+        finally:
+            self.is_refreshing = False
+        self.synced_at = time.monotonic()
+
+        # keep the existing namespaces (and their cached pods) alive.
+        for name, namespace in self._items.items():
+            if name in data:
+                data[name] = namespace
+            else:
+                namespace.close()
 
-    async def refresh(self) -> dict[str, NameSpace]:
-        data = await self._client.get_namespaces()
+        diff = diff_items(self._items, data)
         self._items = data
+        if not diff.is_empty:
+            self.changes = diff
+        self._start_prefetch()
         return self._items
+
+    def _start_prefetch(self) -> None:
+        if self.prefetch_concurrency <= 0:
+            return
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            return
+        self._prefetch_task = asyncio.create_task(self.prefetch())
+
+    async def prefetch(self) -> None:
+        """List the pods of all namespaces.
+
+        A failing or slow namespace does not hold up the others.
+        """
+        semaphore = asyncio.Semaphore(self.prefetch_concurrency)
+
+        async def _prefetch(namespace: NameSpace) -> None:
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(namespace.prefetch(), self.prefetch_timeout)
+                except asyncio.TimeoutError:
+                    _logger.warning(
+                        "prefetching namespace %s timed out", namespace.name
+                    )
+                except Exception:
+                    _logger.exception("prefetching namespace %s failed", namespace.name)
+
+        await asyncio.gather(
+            *(_prefetch(namespace) for namespace in self._items.values())
+        )
+
+    def close(self) -> None:
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
@@ -0,0 +1,65 @@
+"""The log buffers of recently viewed pods.
+
+Switching back to a pod shows its buffer right away, without fetching and
+parsing its log again.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+from textual.geometry import Offset
+
+from glasses.controllers.log_provider import ResumePosition
+
+if TYPE_CHECKING:
+    from glasses.widgets.log_viewer import LineCache
+
+# maximum amount of bytes used by the log data of cached buffers. See Settings.
+POD_BUFFER_BYTES = 256 * 1024 * 1024
+
+# namespace and pod name.
+PodKey = tuple[str, str]
+
+
+class PodBuffer(NamedTuple):
+    line_cache: LineCache
+    current_row: int
+    scroll_offset: Offset
+    # where the log is read up to, so reading resumes after the buffered lines.
+    position: ResumePosition
+
+
+class PodBufferCache:
+    """Buffers by pod, within a memory budget.
+
+    The least recently viewed buffers are removed first.
+    """
+
+    def __init__(self, max_bytes: int = POD_BUFFER_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._buffers: OrderedDict[PodKey, PodBuffer] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __contains__(self, key: PodKey) -> bool:
+        return key in self._buffers
+
+    @property
+    def memory(self) -> int:
+        return sum(buffer.line_cache.memory for buffer in self._buffers.values())
+
+    def put(self, key: PodKey, buffer: PodBuffer) -> None:
+        # only the log data counts for the budget. The rendered lines and
+        # expansions are recreated when the buffer is shown again.
+        buffer.line_cache.clear_caches()
+        self._buffers[key] = buffer
+        self._buffers.move_to_end(key)
+        # the newest buffer is always kept, even when it exceeds the budget.
+        while self.memory > self.max_bytes and len(self._buffers) > 1:
+            self._buffers.popitem(last=False)
+
+    def pop(self, key: PodKey) -> PodBuffer | None:
+        """Remove and return the buffer of a pod. The shown buffer is not cached."""
+        return self._buffers.pop(key, None)
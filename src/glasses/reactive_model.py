@@ -1,47 +1,146 @@
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
-from typing import Any, Callable, Generic, TypeVar
+from contextlib import contextmanager
+from typing import Any, Callable, Generic, Iterator, TypeVar
 from weakref import WeakMethod
 
 ReactrType = TypeVar("ReactrType")
 
+# seconds coalesced notifications are collected before being dispatched. About
+# one frame.
+COALESCE_DELAY = 1 / 60
+
 
 class Reactr(Generic[ReactrType]):
-    def __init__(self, default: ReactrType) -> None:
+    def __init__(self, default: ReactrType, compare: bool = True) -> None:
+        """A property publishing its new value to the subscribers of the model.
+
+        Args:
+            default: The value until one is set.
+            compare: Only publish values which differ from the current value.
+                Disable for events, where every value should be published.
+        """
         self._default = default
+        self._compare = compare
 
     def __set_name__(self, owner: Any, name: str) -> None:
         self.name = name
 
     def __get__(self, obj: ReactrModel, type: type[ReactrModel]) -> ReactrType:
-        return obj.__dict__.get(self.name) or self._default
+        value: ReactrType = obj.__dict__.get(self.name, self._default)
+        return value
 
     def __set__(self, obj: ReactrModel, value: ReactrType) -> None:
+        if self._compare and self.__get__(obj, type(obj)) == value:
+            return
         obj.__dict__[self.name] = value
         obj.publish(self.name, value)
 
 
+class _Subscription:
+    __slots__ = ("method", "coalesce")
+
+    def __init__(self, method: WeakMethod, coalesce: bool) -> None:
+        self.method = method
+        self.coalesce = coalesce
+
+
 class ReactrModel:
     def __init__(self) -> None:
-        self._subscriptions: dict[str, list[WeakMethod]] = defaultdict(list)
-        self._weakrefs: dict[WeakMethod, str] = {}
+        self._subscriptions: dict[str, list[_Subscription]] = defaultdict(list)
+
+        # values set during a transaction, published when it ends.
+        self._transaction_depth = 0
+        self._transaction_values: dict[str, Any] = {}
 
-    def _get_weakref(self, func: Callable[[Any], None]) -> WeakMethod:
-        return WeakMethod(func, self.unsubscribe)
+        # latest values of coalesced subscriptions, dispatched together.
+        self._coalesced: dict[_Subscription, Any] = {}
+        self._dispatch_handle: asyncio.TimerHandle | None = None
 
     def publish(self, property: str, value: Any) -> None:
-        for subscription in self._subscriptions[property]:
-            subscription()(value)  # type: ignore
+        if self._transaction_depth:
+            self._transaction_values[property] = value
+            return
+
+        subscriptions = self._subscriptions[property]
+        alive = []
+        for subscription in subscriptions:
+            callback = subscription.method()
+            if callback is None:
+                continue
+            alive.append(subscription)
+            if subscription.coalesce:
+                self._coalesce(subscription, value)
+            else:
+                callback(value)
+        if len(alive) != len(subscriptions):
+            # the subscriber is garbage collected.
+            subscriptions[:] = alive
+
+    def _coalesce(self, subscription: _Subscription, value: Any) -> None:
+        self._coalesced[subscription] = value
+        if self._dispatch_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no event loop to dispatch from later.
+            self._dispatch()
+        else:
+            self._dispatch_handle = loop.call_later(COALESCE_DELAY, self._dispatch)
+
+    def _dispatch(self) -> None:
+        self._dispatch_handle = None
+        coalesced, self._coalesced = self._coalesced, {}
+        for subscription, value in coalesced.items():
+            callback = subscription.method()
+            if callback is not None:
+                callback(value)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Set multiple properties, notifying subscribers when done.
+
+        Subscribers are notified once per property set during the transaction,
+        with its last value.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        finally:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                values, self._transaction_values = self._transaction_values, {}
+                for property, value in values.items():
+                    self.publish(property, value)
+
+    def subscribe(
+        self, property: str, callback: Callable[[Any], None], coalesce: bool = False
+    ) -> None:
+        """Call the callback with every new value of the property.
+
+        The subscription ends when the object of the callback method is garbage
+        collected.
 
-    def subscribe(self, property: str, callback: Callable[[Any], None]) -> None:
-        weakref = self._get_weakref(callback)
-        self._subscriptions[property].append(weakref)
-        if weakref in self._weakrefs:
+        Args:
+            property: The name of the property.
+            callback: A bound method.
+            coalesce: Call the callback once per frame with the last value,
+                instead of with every value. Without a running event loop the
+                callback is called right away.
+        """
+        method = WeakMethod(callback)
+        subscriptions = self._subscriptions[property]
+        if any(subscription.method == method for subscription in subscriptions):
             raise Exception("Alread an identical weakref available.")
-        self._weakrefs[weakref] = property
+        subscriptions.append(_Subscription(method, coalesce))
 
-    def unsubscribe(self, weakref: WeakMethod) -> None:
-        prop = self._weakrefs[weakref]
-        subscriptions = self._subscriptions[prop]
-        subscriptions.remove(weakref)
+    def unsubscribe(self, property: str, callback: Callable[[Any], None]) -> None:
+        method = WeakMethod(callback)
+        self._subscriptions[property] = [
+            subscription
+            for subscription in self._subscriptions[property]
+            if subscription.method != method
+        ]
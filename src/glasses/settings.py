@@ -1,4 +1,5 @@
 from enum import Enum
+from pathlib import Path
 from typing import Literal
 
 from pydantic import BaseSettings
@@ -16,7 +17,55 @@ class NameSpaceProvider(Enum):
     K8_NAMESPACE_PROVIDER = "k8_namespace_provider"
 
 
+class OverloadPolicy(Enum):
+    """What to do with incoming log lines when the ingestion queue is full."""
+
+    BLOCK = "block"  # stop reading from the cluster until there is room.
+    DROP_OLDEST = "drop_oldest"
+    SAMPLE = "sample"
+    # show a sample of the lines while the ui can not keep up, including all
+    # warnings and errors. All lines are captured on disk.
+    ADAPTIVE = "adaptive"
+
+
+class RepeatCompaction(Enum):
+    """Whether consecutive identical log lines are shown as one counted line."""
+
+    OFF = "off"
+    EXACT = "exact"
+    IGNORE_TIMESTAMPS = "ignore_timestamps"  # lines may differ in their timestamps.
+
+
 class Settings(BaseSettings):
     logparser: logparsers = "json"
     logcollector: LogCollectors = LogCollectors.K8_LOG_COLLECTOR
     namespace_provider: NameSpaceProvider = NameSpaceProvider.K8_NAMESPACE_PROVIDER
+
+    # maximum amount of log lines waiting to be parsed and displayed.
+    max_queued_lines: int = 100_000
+    overload_policy: OverloadPolicy = OverloadPolicy.BLOCK
+
+    # where the adaptive overload policy captures all lines.
+    capture_dir: Path = Path.home() / ".config" / "glasses" / "captures"
+    # amount of runs of the app of which the captures are kept.
+    capture_runs: int = 5
+
+    # collapse consecutive repeated log lines into one line with a counter.
+    repeat_compaction: RepeatCompaction = RepeatCompaction.OFF
+
+    # amount of workers parsing log lines. When 0 lines are parsed on the ui thread.
+    parse_workers: int = 0
+
+    # amount of namespaces of which the pods are listed at the same time in the
+    # background. When 0 the pods are only listed when a namespace is opened.
+    prefetch_concurrency: int = 4
+
+    # maximum amount of bytes used by the log buffers of previously viewed pods.
+    pod_buffer_bytes: int = 256 * 1024 * 1024
+
+    # synthetic load of the dummy log collector in lines per second. When 0
+    # the example log data is replayed.
+    demo_rate: float = 0
+    demo_burst_rate: float = 0
+    demo_burst_interval: float = 0
+    demo_burst_duration: float = 1
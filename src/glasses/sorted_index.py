@@ -0,0 +1,44 @@
+"""Sorted log data indexes for navigating between search matches or levels."""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator
+
+
+class SortedIndex:
+    """Log data indexes in increasing order.
+
+    Log data is only appended, so appending its index keeps the index sorted.
+    """
+
+    def __init__(self) -> None:
+        self._items = array("q")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._items)
+
+    def append(self, log_data_idx: int) -> None:
+        self._items.append(log_data_idx)
+
+    def next(self, log_data_idx: int) -> int | None:
+        """Return the first index after the given one."""
+        position = bisect_right(self._items, log_data_idx)
+        if position == len(self._items):
+            return None
+        return self._items[position]
+
+    def previous(self, log_data_idx: int) -> int | None:
+        """Return the last index before the given one."""
+        position = bisect_left(self._items, log_data_idx)
+        if position == 0:
+            return None
+        return self._items[position - 1]
+
+    def position(self, log_data_idx: int) -> int | None:
+        """Return the 1-based position of the index, or None when absent."""
+        position = bisect_left(self._items, log_data_idx)
+        if position < len(self._items) and self._items[position] == log_data_idx:
+            return position + 1
+        return None
@@ -0,0 +1,157 @@
+"""Stream parsed and coloured log lines to stdout without starting the ui.
+
+Examples:
+
+    glasses-stream --namespace my-namespace --pod my-pod --search error
+    kubectl logs -f my-pod | glasses-stream
+    glasses-stream --file app.log --raw | grep -c timeout
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+from typing import Sequence, TextIO
+
+from rich.color import ColorSystem
+from rich.console import Console
+from rich.text import Text
+
+from glasses.controllers.log_provider import FileLogReader, K8LogReader, LogReader
+from glasses.log_parsers.line_info import split_timestamp
+from glasses.log_parsers.parse_pool import ParsePool
+
+SEARCH_STYLE = "black on yellow"
+COLOR_SYSTEM = ColorSystem.EIGHT_BIT
+
+
+def _parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Stream log lines through the glasses parsers to stdout."
+    )
+    parser.add_argument("--namespace", help="namespace of the pod to stream.")
+    parser.add_argument("--pod", help="name of the pod to stream.")
+    parser.add_argument(
+        "--tail", type=int, default=500, help="amount of history lines of a pod."
+    )
+    parser.add_argument(
+        "--file", help="read this file instead of a pod. Use - for stdin."
+    )
+    parser.add_argument(
+        "--search",
+        default="",
+        help="only output lines containing this text. It is highlighted.",
+    )
+    parser.add_argument(
+        "--raw",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="output the unparsed lines. The search filter is applied to the raw lines.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="amount of processes parsing the lines. 0 parses in the main process.",
+    )
+
+    args = parser.parse_args(argv)
+    if args.pod is None and args.file is None:
+        args.file = "-"
+    if args.pod is not None and args.namespace is None:
+        parser.error("--pod requires --namespace")
+    return args
+
+
+def _create_reader(args: argparse.Namespace) -> LogReader:
+    if args.pod is not None:
+        reader = K8LogReader()
+        reader.namespace = args.namespace
+        reader.pod = args.pod
+        reader.tail = args.tail
+        return reader
+    if args.file == "-":
+        return FileLogReader(sys.stdin.buffer)  # type: ignore
+    return FileLogReader(open(args.file, "rb"))
+
+
+def to_ansi(text: Text, console: Console) -> str:
+    """Render the text as a single line including ansi styling.
+
+    A lot faster than `console.print` as there is no wrapping, measuring or
+    console state involved.
+    """
+    return "".join(
+        segment.style.render(segment.text, color_system=COLOR_SYSTEM)
+        if segment.style
+        else segment.text
+        for segment in text.render(console, end="")
+    )
+
+
+async def stream(reader: LogReader, out: TextIO, search: str, raw: bool) -> None:
+    """Write the lines of the reader to the output until the reader is done.
+
+    Every batch of lines is written at once.
+    """
+    reader_task = reader.start()
+    # a failing reader does not queue lines anymore. Stop waiting for them.
+    reader_task.add_done_callback(lambda _: reader.close_queue())
+    try:
+        if raw:
+            async for lines in reader.read_lines():
+                if reader.timestamps:
+                    lines = [split_timestamp(line)[1] for line in lines]
+                if search:
+                    lines = [line for line in lines if search in line]
+                if lines:
+                    out.write("\n".join(lines) + "\n")
+                    out.flush()
+        else:
+            console = Console(file=io.StringIO())
+            async for log_events in reader.read_batches():
+                output: list[str] = []
+                for log_event in log_events:
+                    text = log_event.parsed
+                    if search:
+                        if search not in text.plain:
+                            continue
+                        text = text.copy()
+                        text.highlight_words([search], SEARCH_STYLE)
+                    output.append(to_ansi(text, console))
+                if output:
+                    out.write("\n".join(output) + "\n")
+                    out.flush()
+    finally:
+        if not reader_task.done():
+            await reader.stop()
+    # raise any reader error.
+    if not reader_task.cancelled():
+        reader_task.result()
+
+
+def run(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
+    reader = _create_reader(args)
+    if args.workers > 0:
+        reader.parse_pool = ParsePool(args.workers)
+    try:
+        asyncio.run(stream(reader, sys.stdout, args.search, args.raw))
+    except BrokenPipeError:
+        # the receiving end of the pipe is closed (like `head` does).
+        # Point stdout to devnull so the final flush at exit does not fail too.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except Exception as error:
+        print(f"glasses-stream: {error!r}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if reader.parse_pool is not None:
+            reader.parse_pool.shutdown()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,140 @@
+"""Group log lines by template, to see which kinds of lines dominate a log.
+
+Templates are mined while lines arrive, like Drain
+(https://jiemingzhu.github.io/pub/pjhe_icws2017.pdf). Words containing a
+digit are masked, then a line is compared to the templates having the same
+amount of words and the same first words. When enough words are equal, the
+line belongs to the template and the words which differ become a wildcard.
+Otherwise the line starts a new template.
+"""
+from __future__ import annotations
+
+import operator
+from itertools import islice
+from typing import NamedTuple
+
+WILDCARD = "<*>"
+
+# amount of leading words without a digit lines must share to be compared.
+PREFIX_WORDS = 2
+
+# maximum amount of templates compared to a line. When a line does not match
+# any of them it belongs to the most similar one, as comparing is the
+# expensive part.
+MAX_GROUP_TEMPLATES = 8
+
+# fraction of words a line must share with a template to belong to it.
+SIMILARITY = 0.5
+
+# maximum amount of templates. Lines not matching any template after that
+# belong to the OTHER template.
+MAX_TEMPLATES = 1000
+
+# amount of line indexes kept per template as examples.
+MAX_EXAMPLES = 3
+
+OTHER = 0
+
+_DIGITS = frozenset("0123456789")
+
+
+class TemplateRow(NamedTuple):
+    id: int
+    text: str
+    lines: int
+
+
+class Template:
+    __slots__ = ("id", "words", "count", "examples")
+
+    def __init__(self, id: int, words: list[str]) -> None:
+        self.id = id
+        self.words = words
+        self.count = 0
+        # indexes of the first lines of this template.
+        self.examples: list[int] = []
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.words)
+
+    def add(self, line_idx: int) -> None:
+        self.count += 1
+        if len(self.examples) < MAX_EXAMPLES:
+            self.examples.append(line_idx)
+
+    def similarity(self, words: list[str]) -> float:
+        if not words:
+            return 1.0
+        equal: int = sum(map(operator.eq, self.words, words))
+        return equal / len(words)
+
+    def merge(self, words: list[str]) -> None:
+        """Replace the words which differ from the line by a wildcard."""
+        self.words = [
+            word if word == other else WILDCARD
+            for word, other in zip(self.words, words)
+        ]
+
+
+class TemplateMiner:
+    def __init__(self, max_templates: int = MAX_TEMPLATES) -> None:
+        self.max_templates = max_templates
+        self.templates: list[Template] = [Template(OTHER, ["<other>"])]
+        # templates by amount of words and their first words.
+        self._groups: dict[tuple[str, ...], list[Template]] = {}
+
+        # changes every time a line is added.
+        self.version = 0
+
+    def add(self, line: str, line_idx: int) -> int:
+        """Add a line and return the id of its template.
+
+        Args:
+            line: The text of the line.
+            line_idx: The index of the line, kept as an example.
+        """
+        words = [
+            word if _DIGITS.isdisjoint(word) else WILDCARD for word in line.split()
+        ]
+        prefix = islice((word for word in words if word != WILDCARD), PREFIX_WORDS)
+        group_key = (str(len(words)), *prefix)
+        group = self._groups.get(group_key, ())
+
+        best: Template | None = None
+        best_similarity = -1.0
+        for template in group:
+            similarity = template.similarity(words)
+            if similarity > best_similarity:
+                best, best_similarity = template, similarity
+
+        if best is not None and (
+            best_similarity >= SIMILARITY or len(group) >= MAX_GROUP_TEMPLATES
+        ):
+            if best_similarity < 1:
+                best.merge(words)
+        elif len(self.templates) < self.max_templates:
+            best = Template(len(self.templates), words)
+            self.templates.append(best)
+            self._groups.setdefault(group_key, []).append(best)
+        else:
+            best = self.templates[OTHER]
+
+        best.add(line_idx)
+        self.version += 1
+        return best.id
+
+    def count(self, template_id: int) -> None:
+        """Count another line of a template, like a compacted repeat."""
+        self.templates[template_id].count += 1
+        self.version += 1
+
+    def rows(self) -> list[TemplateRow]:
+        """Return the templates having lines, the most common first."""
+        rows = [
+            TemplateRow(template.id, template.text, template.count)
+            for template in self.templates
+            if template.count
+        ]
+        rows.sort(key=lambda row: -row.lines)
+        return rows
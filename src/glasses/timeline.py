@@ -0,0 +1,139 @@
+"""Histograms of the log volume, warnings and errors over time.
+
+The time range is divided into a fixed amount of buckets. When a line falls
+outside of the range, the bucket width is doubled and neighbouring buckets are
+merged, so adding a line never requires looking at earlier lines.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import NamedTuple
+
+from glasses.log_parsers.line_info import Level
+
+BUCKETS = 256
+
+# seconds covered by a bucket before the range is grown.
+INITIAL_BUCKET_WIDTH = 0.01
+
+NO_ENTRY = -1
+
+
+class TimelineRow(NamedTuple):
+    lines: int
+    warnings: int
+    errors: int
+    first_entry: int  # index of the first log data in the row. NO_ENTRY when empty.
+
+
+class Timeline:
+    def __init__(self, buckets: int = BUCKETS) -> None:
+        self.buckets = buckets
+        self.start = math.nan
+        self.width = INITIAL_BUCKET_WIDTH
+
+        self.counts = array("Q", bytes(8 * buckets))
+        self.warnings = array("Q", bytes(8 * buckets))
+        self.errors = array("Q", bytes(8 * buckets))
+        self.first_entry = array("q", [NO_ENTRY] * buckets)
+
+        # changes every time a line is added.
+        self.version = 0
+        self._last_epoch = math.nan
+
+    @property
+    def end(self) -> float:
+        return self.start + self.width * self.buckets
+
+    def add(self, entry: int, epoch: float, level: Level) -> None:
+        """Add a log line.
+
+        Args:
+            entry: The index of the log data.
+            epoch: The time of the line. When nan, the time of the previous
+                line is used. Lines before the first line with a time are
+                not added.
+            level: The level of the line.
+        """
+        if math.isnan(epoch):
+            epoch = self._last_epoch
+            if math.isnan(epoch):
+                return
+        self._last_epoch = epoch
+
+        if math.isnan(self.start):
+            self.start = epoch
+        while not self.start <= epoch < self.end:
+            self._grow(grow_left=epoch < self.start)
+
+        bucket = min(int((epoch - self.start) / self.width), self.buckets - 1)
+        self.counts[bucket] += 1
+        if level == Level.WARNING:
+            self.warnings[bucket] += 1
+        elif level == Level.ERROR:
+            self.errors[bucket] += 1
+        first = self.first_entry[bucket]
+        if first == NO_ENTRY or entry < first:
+            self.first_entry[bucket] = entry
+        self.version += 1
+
+    def _grow(self, grow_left: bool) -> None:
+        """Double the bucket width, merging each pair of buckets.
+
+        The start of the range stays the same. When growing to the left the
+        end stays the same instead.
+        """
+        shift = self.buckets if grow_left else 0
+        if grow_left:
+            self.start -= self.width * self.buckets
+        self.width *= 2
+
+        counts = array("Q", bytes(8 * self.buckets))
+        warnings = array("Q", bytes(8 * self.buckets))
+        errors = array("Q", bytes(8 * self.buckets))
+        first_entry = array("q", [NO_ENTRY] * self.buckets)
+        for bucket in range(self.buckets):
+            if not self.counts[bucket]:
+                continue
+            new_bucket = (bucket + shift) // 2
+            counts[new_bucket] += self.counts[bucket]
+            warnings[new_bucket] += self.warnings[bucket]
+            errors[new_bucket] += self.errors[bucket]
+            first = first_entry[new_bucket]
+            if first == NO_ENTRY or self.first_entry[bucket] < first:
+                first_entry[new_bucket] = self.first_entry[bucket]
+
+        self.counts = counts
+        self.warnings = warnings
+        self.errors = errors
+        self.first_entry = first_entry
+
+    def rows(self, height: int) -> list[TimelineRow]:
+        """Divide the buckets containing lines over the given amount of rows."""
+        used = [bucket for bucket, count in enumerate(self.counts) if count]
+        if not used or height <= 0:
+            return []
+        low, high = used[0], used[-1] + 1
+        span = high - low
+        height = min(height, span)
+
+        rows = []
+        for row in range(height):
+            buckets = range(
+                low + row * span // height, low + (row + 1) * span // height
+            )
+            entries = [
+                self.first_entry[bucket]
+                for bucket in buckets
+                if self.first_entry[bucket] != NO_ENTRY
+            ]
+            rows.append(
+                TimelineRow(
+                    lines=sum(self.counts[bucket] for bucket in buckets),
+                    warnings=sum(self.warnings[bucket] for bucket in buckets),
+                    errors=sum(self.errors[bucket] for bucket in buckets),
+                    first_entry=min(entries, default=NO_ENTRY),
+                )
+            )
+        return rows
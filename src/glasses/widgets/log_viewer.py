@@ -1,18 +1,25 @@
 import asyncio
+import logging
+import math
+import shutil
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from enum import Enum, auto
-from json import JSONDecodeError
 from pathlib import Path
-from typing import Iterator, NamedTuple
+from typing import Iterator, NamedTuple, Sequence
 
 from rich.console import Console
-from rich.json import JSON
+from rich.segment import Segment
 from rich.style import Style
 from rich.text import Lines, Text
 from textual import events
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal
-from textual.geometry import Size
+from textual.geometry import Offset, Region, Size
 from textual.message import Message
 from textual.reactive import Reactive, reactive
 from textual.scroll_view import ScrollView
@@ -20,14 +27,29 @@ from textual.strip import Strip
 from textual.widget import Widget
 from textual.widgets import Button, Input, Label, Static
 
-from glasses.controllers.log_provider import LogEvent, LogReader
+from glasses.compaction import Compactor, Repeat
+from glasses.controllers.log_provider import LogEvent, LogReader, ResumePosition
+from glasses.epoch_index import EpochIndex, parse_time
+from glasses.expansion import Expansion, ExpansionCache
+from glasses.log_parsers.line_info import Level
 from glasses.namespace_provider import Pod
+from glasses.pod_buffers import PodBuffer, PodBufferCache, PodKey
+from glasses.settings import RepeatCompaction
+from glasses.sorted_index import SortedIndex
+from glasses.templates import TemplateMiner
+from glasses.timeline import NO_ENTRY, Timeline, TimelineRow
 from glasses.widgets.dialog import DialogResult, StopLoggingScreen, show_dialog
+from glasses.widgets.template_panel import TemplatePanel
+
+_logger = logging.getLogger(__name__)
 
 LogDataLineIndex = int
 LogDataIndex = int
 OccurrenceCount = int
 
+# size of a reference in a list.
+POINTER_SIZE = 8
+
 
 class State(Enum):
     IDLE = auto()
@@ -51,8 +73,19 @@ class LoggingState(Static):
     state = reactive(State.IDLE)
 
     def __init__(self, reader: LogReader) -> None:
-        reader.subscribe("is_reading", self.is_reading_changed)
         super().__init__(classes="not_logging")
+        self._reader = reader
+        reader.subscribe("is_reading", self.is_reading_changed)
+        # lines are dropped in bursts. Refresh once per frame.
+        reader.subscribe("dropped", self._dropped_changed, coalesce=True)
+        reader.subscribe("sampled", self._sampled_changed, coalesce=True)
+        reader.subscribe("sample_step", self._sampled_changed, coalesce=True)
+
+    def _dropped_changed(self, _: int) -> None:
+        self.refresh()
+
+    def _sampled_changed(self, _: int) -> None:
+        self.refresh()
 
     def is_reading_changed(self, state: State) -> None:
         if state:
@@ -66,8 +99,39 @@ class LoggingState(Static):
 
     def render(self) -> str:
         if self.state == State.IDLE:
-            return "not logging"
-        return "logging"
+            state = "not logging"
+        else:
+            state = "logging"
+        if self._reader.dropped or self._reader.sampled:
+            state += (
+                f" (ui overloaded. dropped: {self._reader.dropped},"
+                f" sampled out: {self._reader.sampled})"
+            )
+        if self._reader.sample_step > 1:
+            state += f" sampled 1:{self._reader.sample_step}"
+        return state
+
+
+class MetricsReadout(Static):
+    """A live readout of the ingestion pipeline metrics."""
+
+    DEFAULT_CSS = """
+    MetricsReadout {
+        width: 100%;
+        color: $text-muted;
+    }
+    """
+
+    def __init__(self, reader: LogReader) -> None:
+        super().__init__()
+        self._reader = reader
+
+    def on_mount(self) -> None:
+        self.set_interval(1, self._update_metrics)
+
+    def _update_metrics(self) -> None:
+        if self._reader.is_reading:
+            self.update(self._reader.metrics.snapshot().summary())
 
 
 class LogControl(Widget):
@@ -96,6 +160,12 @@ class LogControl(Widget):
     #search {
         width: 20;
     }
+    #goto_time {
+        width: 12;
+    }
+    #navigate_to_previous_search_result, #navigate_to_next_search_result {
+        min-width: 6;
+    }
     #namespace {
         width: 12;
     }
@@ -139,13 +209,11 @@ class LogControl(Widget):
     def _update_pod(self, _: str) -> None:
         self.query_one("#pod_name", expect_type=Input).value = self._reader.pod
 
-    def update_search_result_count(
-        self, result: dict[LogDataIndex, OccurrenceCount]
-    ) -> None:
-        total_count = sum(
-            (search_result_count for search_result_count in result.values())
+    def update_search_result_count(self, position: int | None, total: int) -> None:
+        """Show the position of the selected log entry in the search matches."""
+        self.query_one("#search_results", expect_type=Label).update(
+            f"{position or '-'}/{total}"
         )
-        self.query_one("#search_results", expect_type=Label).update(str(total_count))
 
     def compose(self) -> ComposeResult:
         yield Horizontal(
@@ -159,7 +227,8 @@ class LogControl(Widget):
             Input(str(self._reader.tail), id="tail"),
             Label("search"),
             Input(self._reader.highlight_text, id="search"),
-            Label("0", id="search_results"),
+            Label("-/0", id="search_results"),
+            Button("prev", id="navigate_to_previous_search_result"),
             Button("next", id="navigate_to_next_search_result"),
         )
         yield Horizontal(
@@ -167,8 +236,11 @@ class LogControl(Widget):
             Button("stop", id="stoplog"),
             Button("clear log", id="clearlog"),
             Button("save log", id="savelog"),
+            Label("go to time"),
+            Input(placeholder="14:32:05", id="goto_time"),
         )
         yield self._logging_state
+        yield MetricsReadout(self._reader)
 
     async def on_input_changed(self, event: Input.Changed) -> None:
 
@@ -190,136 +262,179 @@ class StateCache(NamedTuple):
     selected: bool
     expanded: bool
     search_text: str
+    repeats: int
 
 
-class LogData:
-    def __init__(
-        self,
-        log_event: LogEvent,
-        console: Console,
-    ) -> None:
-        self._console = console
-
-        self.log_event = log_event
-
-        # start index of lines collection where this piece of logdata starts.
-        self.line_index: int = -1
+def set_virtual_size_without_layout(scroll_view: ScrollView, size: Size) -> None:
+    """Set the virtual size of a scroll view without laying it out.
 
-        # raw lines without ui styling like selected, search highlight.
-        self._raw_lines: Lines
-
-        # styled lines including ui styling like selected, search highlight.
-        self._lines: list[Strip] = []
-        self._max_width: int = -1
-
-        self.selected: bool = False
-        self.expanded: bool = False
+    Textual has no public way to do this. These are the private steps textual
+    takes when the virtual size changes, without the layout.
+    """
+    scroll_view._reactive_virtual_size = size
+    scroll_view._scroll_update(size)
 
-        self._state: StateCache = StateCache(
-            line_length=-1, selected=False, search_text="", expanded=self.expanded
-        )
-        self.line_count = 0
-        self._render_plain()
 
-    def toggle_expand(self) -> None:
-        self.expanded = not self.expanded
-        self._render_plain()
+class AddedLogData(NamedTuple):
+    # the virtual size after adding.
+    size: Size
+    # existing log data which got repeats. Their first line changed.
+    repeated: list[LogDataIndex]
 
-    def search(self, search_string: str) -> int:
-        """Return the number of occurrences in the logentry."""
-        return self.log_event.parsed.plain.count(search_string)
 
-    def _render_plain(self) -> None:
-        self._max_width = 0
-        new_line = self.log_event.parsed.copy()
-        if self.expanded:
+class RenderedLines(NamedTuple):
+    state: StateCache
+    # the lines of the parsed text without ui styling.
+    text_lines: Lines
+    # rendered lines. None until the line is shown.
+    strips: list[Strip | None]
 
-            new_line.append("\n\n")
-            raw = self.log_event.raw
 
-            styled_raw: Text | str
-            try:
-                styled_raw = JSON(raw).text
-            except JSONDecodeError:
-                styled_raw = raw
+class LogData:
+    """A log event and its ui state.
 
-            new_line.append(styled_raw)
-            new_line.append("\n")
+    The rendered lines are not kept here but in the render cache of the
+    LineCache, as only the lines on screen need them.
+    """
 
-        self._raw_lines = new_line.split(allow_blank=True)
-        self._max_width = max((len(line) for line in self._raw_lines))
-        self.line_count = len(self._raw_lines)
+    __slots__ = (
+        "log_event",
+        "line_count",
+        "max_width",
+        "selected",
+        "expanded",
+        "repeat",
+    )
 
-    def _render(
-        self,
-        search_text: str,
-        line_length: int,
-        selected_style: Style,
-    ) -> Iterator[Strip]:
-        # need to provide these render options. otherwise horizontal
-        # scrolling becomes erratic (random characters everywhere).
-        render_options = self._console.options
-        render_options = render_options.update(width=line_length, overflow="ignore")
-
-        for raw_line in self._raw_lines:
-            styled_line = raw_line.copy()
+    def __init__(self, log_event: LogEvent, repeat: Repeat | None = None) -> None:
+        self.log_event = log_event
+        self.selected: bool = False
+        self.expanded: bool = False
+        # the repeats of the log event when repeated lines are compacted.
+        self.repeat = repeat
+        self._measure()
+
+    def _measure(self) -> None:
+        lines = self.log_event.plain.split("\n")
+        self.line_count = len(lines)
+        self.max_width = max(len(line) for line in lines)
+        if self.repeat is not None:
+            self.max_width = max(self.max_width, len(lines[0]) + self.repeat.width)
+
+    def add_repeat(
+        self, log_event: LogEvent, timestamps: tuple[str, ...] | None
+    ) -> int:
+        """Count a repeat of the log event.
 
-            if search_text:
-                styled_line.highlight_words([search_text], "black on yellow")
+        Returns:
+            The amount of bytes the repeat uses.
+        """
+        memory = 0
+        if self.repeat is None:
+            self.repeat = Repeat(self.log_event.epoch)
+            memory += sys.getsizeof(self.repeat)
+        memory += self.repeat.add(log_event.epoch, timestamps)
+        self.measure_repeat()
+        return memory
+
+    def measure_repeat(self) -> None:
+        """Fit the max width to the label of the repeats."""
+        if self.repeat is None:
+            return
+        first_line_width = self.log_event.plain.find("\n")
+        if first_line_width < 0:
+            first_line_width = len(self.log_event.plain)
+        self.max_width = max(self.max_width, first_line_width + self.repeat.width)
+
+    def raws(self) -> Iterator[str]:
+        """Yield the raw line and its repeats."""
+        raw = self.log_event.raw
+        yield raw
+        if self.repeat is not None:
+            yield from self.repeat.raws(raw)
+
+    def expand(self, expansion: Expansion) -> None:
+        """Show the expansion below the parsed text, surrounded by blank lines."""
+        self.expanded = True
+        self._measure()
+        self.line_count += len(expansion.lines) + 2
+        self.max_width = max(self.max_width, expansion.max_width)
+
+    def collapse(self) -> None:
+        self.expanded = False
+        self._measure()
 
-            styled_line.align("left", line_length)
+    def search(self, search_string: str) -> int:
+        """Return the number of occurrences in the logentry."""
+        return self.log_event.plain.count(search_string)
 
-            if self.selected:
-                styled_line.stylize(selected_style.background_style)
 
-            yield Strip(self._console.render(styled_line, render_options), line_length)
+class LineCache:
+    # maximum amount of log data of which the rendered lines are kept.
+    RENDER_CACHE_SIZE = 1000
 
-    def update(
+    def __init__(
         self,
-        selected_style: Style,
-        search_text: str,
-        line_length: int,
+        console: Console,
+        compactor: Compactor | None = None,
+        mine_templates: bool = True,
     ) -> None:
-        """Update the output of the logdata"""
-        new_state = StateCache(
-            line_length=line_length,
-            selected=self.selected,
-            search_text=search_text,
-            expanded=self.expanded,
-        )
-
-        if len(self._lines) > 0 and self._state == new_state:
-            return
-
-        self._lines = list(self._render(search_text, line_length, selected_style))
-        self._state = new_state
+        """Initialize the line cache.
 
-
-class LineCache:
-    def __init__(self, console: Console) -> None:
+        Args:
+            console: Renders the lines.
+            compactor: Collapses repeated log events into the previous log data.
+            mine_templates: Group the log data by template.
+        """
 
         self._log_data: list[LogData] = []
+        self._compactor = compactor
 
-        # A list which keeps track of a single UI-line and the  corresponsing log line
+        # The UI-line where each log data starts. The list index corresponds
+        # to the log data index.
         #
-        # The list index corresponds to the UI lines. The value
-        # corresponds to the Logdata and LogData-index
-
         # idx   value
-        # 0     LogData_1, 0, 0  -> logline 0 corresponds with line_index 0 of LogData_1. LogData_1 is index 0 of log-lines_list
-        # 1     LogData_2, 0, 1  -> logline 1 corresponds with line_index 0 of LogData_2. LogData_2 is index 1 of log_lines_list
-        # 2     LogData_2, 1, 1  -> logline 2 corresponds with line_index 1 of LogData_2. LogData_2 is index 1 of log_lines_list
+        # 0     0  -> LogData_1 (one line) starts at UI-line 0
+        # 1     1  -> LogData_2 (two lines) starts at UI-line 1
+        # 2     3  -> LogData_3 starts at UI-line 3
         #
-        # Using the above example it is easy to get the logdata
-        # based on the provided log_line_index.
-        self._log_lines_idx__log_data_idx: list[tuple[LogData, int, LogDataIndex]] = []
+        # The log data of a UI-line is found with a binary search.
+        self._line_starts = array("Q")
+        self._line_count: int = 0
+
+        # rendered lines by log data index. Least recently used first.
+        self._rendered: OrderedDict[LogDataIndex, RenderedLines] = OrderedDict()
+        self._expansions = ExpansionCache()
 
         self._max_width: int = 0
         self._console = console
 
+        # epoch and level per log data index.
+        self.epoch_index = EpochIndex()
+        self.levels = array("B")
+        self.timeline = Timeline()
+
+        # log data containing the search text and the amount of occurrences.
+        self._search_text = ""
+        self.matches = SortedIndex()
+        self.match_count: OccurrenceCount = 0
+
+        # log data per level, to navigate between warnings and errors.
+        self.level_indexes = {Level.WARNING: SortedIndex(), Level.ERROR: SortedIndex()}
+
+        # the template id per log data index.
+        self.templates = TemplateMiner() if mine_templates else None
+        self.template_ids = array("I")
+
+        # estimated amount of bytes used by the log data.
+        self.memory: int = 0
+
     def log_data_index_from_line_index(self, line_idx: int) -> int:
-        _, _, log_data_index = self._log_lines_idx__log_data_idx[line_idx]
-        return log_data_index
+        return bisect_right(self._line_starts, line_idx) - 1
+
+    def line_index(self, log_data_idx: int) -> int:
+        """Return the UI-line where the log data starts."""
+        return self._line_starts[log_data_idx]
 
     @property
     def log_data(self) -> list[LogData]:
@@ -329,7 +444,7 @@ class LineCache:
     def line_count(self) -> int:
         """Return the amount of lines/Strips"""
 
-        return len(self._log_lines_idx__log_data_idx)
+        return self._line_count
 
     @property
     def log_data_count(self) -> int:
@@ -342,56 +457,262 @@ class LineCache:
         selected_style: Style,
         line_length: int,
     ) -> Strip:
-        log_data, log_data_line_idx, _ = self._log_lines_idx__log_data_idx[line_idx]
-        log_data.update(
-            selected_style=selected_style,
-            search_text=search_text,
+        log_data_idx = self.log_data_index_from_line_index(line_idx)
+        rendered = self._rendered_lines(
+            log_data_idx, search_text=search_text, line_length=line_length
+        )
+        offset = line_idx - self._line_starts[log_data_idx]
+        strip = rendered.strips[offset]
+        if strip is None:
+            strip = rendered.strips[offset] = self._render(
+                self._text_line(log_data_idx, rendered.text_lines, offset),
+                selected=self._log_data[log_data_idx].selected,
+                search_text=search_text,
+                line_length=line_length,
+                selected_style=selected_style,
+            )
+        return strip
+
+    def _rendered_lines(
+        self, log_data_idx: int, search_text: str, line_length: int
+    ) -> RenderedLines:
+        """Return the rendered lines of a log data, clearing them when outdated."""
+        log_data = self._log_data[log_data_idx]
+        state = StateCache(
             line_length=line_length,
+            selected=log_data.selected,
+            search_text=search_text,
+            expanded=log_data.expanded,
+            repeats=log_data.repeat.count if log_data.repeat is not None else 1,
         )
 
-        return log_data._lines[log_data_line_idx]
+        rendered = self._rendered.get(log_data_idx)
+        if rendered is not None and rendered.state == state:
+            self._rendered.move_to_end(log_data_idx)
+            return rendered
+
+        if rendered is not None and rendered.state.expanded == log_data.expanded:
+            text_lines = rendered.text_lines
+        else:
+            text_lines = log_data.log_event.parsed.split(allow_blank=True)
+        rendered = RenderedLines(state, text_lines, [None] * log_data.line_count)
+        self._rendered[log_data_idx] = rendered
+        self._rendered.move_to_end(log_data_idx)
+        if len(self._rendered) > self.RENDER_CACHE_SIZE:
+            self._rendered.popitem(last=False)
+        return rendered
+
+    def _text_line(self, log_data_idx: int, text_lines: Lines, offset: int) -> Text:
+        """Return a line of a log data without ui styling.
+
+        Expanded log data shows a blank line, the expansion and a blank line
+        below the parsed text.
+        """
+        log_data = self._log_data[log_data_idx]
+        if offset < len(text_lines):
+            text_line = text_lines[offset].copy()
+            if offset == 0 and log_data.repeat is not None:
+                text_line.append_text(log_data.repeat.label())
+            return text_line
+        expansion = self._expansions.get(log_data_idx, log_data.log_event.raw)
+        expansion_offset = offset - len(text_lines) - 1
+        if 0 <= expansion_offset < len(expansion.lines):
+            return expansion.text(expansion_offset)
+        return Text()
+
+    def _render(
+        self,
+        text_line: Text,
+        selected: bool,
+        search_text: str,
+        line_length: int,
+        selected_style: Style,
+    ) -> Strip:
+        # need to provide these render options. otherwise horizontal
+        # scrolling becomes erratic (random characters everywhere).
+        render_options = self._console.options
+        render_options = render_options.update(width=line_length, overflow="ignore")
+
+        if search_text:
+            text_line.highlight_words([search_text], "black on yellow")
+
+        text_line.align("left", line_length)
+
+        if selected:
+            text_line.stylize(selected_style.background_style)
+
+        return Strip(self._console.render(text_line, render_options), line_length)
+
+    def search(self, search_text: str) -> SortedIndex:
+        """Return the log data indexes containing the search text.
+
+        Log data added later is searched when it is added.
+        """
+        self._search_text = search_text
+        self.matches = SortedIndex()
+        self.match_count = 0
+        if search_text == "":
+            return self.matches
+
+        for idx, log_item in enumerate(self._log_data):
+            self._add_match(idx, log_item)
+        return self.matches
+
+    def _add_match(self, log_data_idx: int, log_data: LogData) -> None:
+        count = log_data.search(self._search_text)
+        if count:
+            self.matches.append(log_data_idx)
+            self.match_count += count
 
     def toggle_expand(self, log_data_idx: int) -> None:
         log_data = self._log_data[log_data_idx]
-        log_data.toggle_expand()
-        self._reconstruct_index()
-
-    def _reconstruct_index(self) -> None:
-        self._max_width = 0
-        self._log_lines_idx__log_data_idx = []
-        for idx, log_data in enumerate(self.log_data):
-            log_data.line_index = len(self._log_lines_idx__log_data_idx)
-            self._log_lines_idx__log_data_idx.extend(
-                self._lines_construct_from_log_data(log_data, idx)
+        if log_data.expanded:
+            self._collapse(log_data)
+        else:
+            self._expand(log_data_idx, log_data)
+        self._update_line_starts(log_data_idx)
+
+    def expand(self, log_data_indexes: Sequence[int]) -> None:
+        """Expand multiple log data at once. Expanded log data is skipped."""
+        expanded = [
+            log_data_idx
+            for log_data_idx in log_data_indexes
+            if not self._log_data[log_data_idx].expanded
+        ]
+        for log_data_idx in expanded:
+            self._expand(log_data_idx, self._log_data[log_data_idx])
+        if expanded:
+            self._update_line_starts(min(expanded))
+
+    def _expand(self, log_data_idx: int, log_data: LogData) -> None:
+        log_data.expand(self._expansions.get(log_data_idx, log_data.log_event.raw))
+        self._max_width = max(self._max_width, log_data.max_width)
+
+    def _collapse(self, log_data: LogData) -> None:
+        was_widest = log_data.max_width == self._max_width
+        log_data.collapse()
+        if was_widest:
+            self._max_width = max(
+                (log_data.max_width for log_data in self._log_data), default=0
             )
-            self._max_width = max(self._max_width, log_data._max_width)
 
-    async def add_log_events(self, log_events: list[LogEvent]) -> Size:
+    def _update_line_starts(self, log_data_idx: int) -> None:
+        """Update the UI-line starts from the given log data onwards."""
+        line_starts = self._line_starts
+        line = line_starts[log_data_idx]
+        for idx in range(log_data_idx, len(self._log_data)):
+            line_starts[idx] = line
+            line += self._log_data[idx].line_count
+        self._line_count = line
+
+    def clear_caches(self) -> None:
+        """Remove the rendered lines and expansions. They are recreated when shown."""
+        self._rendered.clear()
+        self._expansions.clear()
+
+    def raw_lines(self) -> Iterator[str]:
+        """Yield the raw log lines, including compacted repeats."""
+        for log_data in self._log_data:
+            yield from log_data.raws()
+
+    def _add_repeat(
+        self, log_event: LogEvent, timestamps: tuple[str, ...] | None
+    ) -> LogDataIndex:
+        """Count a repeat of the last log data and return its index."""
+        log_data_idx = len(self._log_data) - 1
+        log_data = self._log_data[log_data_idx]
+        self.memory += log_data.add_repeat(log_event, timestamps)
+        self._max_width = max(self._max_width, log_data.max_width)
+        self.timeline.add(log_data_idx, log_event.epoch, log_event.level)
+        if self.templates is not None:
+            self.templates.count(self.template_ids[log_data_idx])
+        return log_data_idx
+
+    async def add_log_events(self, log_events: list[LogEvent]) -> AddedLogData:
+        compactor = self._compactor
+        repeated: list[LogDataIndex] = []
         for log_event in log_events:
-            log_data = LogData(log_event, self._console)
-            log_data.line_index = len(self._log_lines_idx__log_data_idx)
-            self._log_lines_idx__log_data_idx.extend(
-                self._lines_construct_from_log_data(log_data, len(self._log_data))
-            )
+            if compactor is not None:
+                is_repeat, timestamps = compactor.repeat(log_event)
+                if is_repeat and self._log_data:
+                    log_data_idx = self._add_repeat(log_event, timestamps)
+                    if repeated[-1:] != [log_data_idx]:
+                        repeated.append(log_data_idx)
+                    continue
+            self._append(LogData(log_event))
+        return AddedLogData(Size(self._max_width, self._line_count), repeated)
+
+    def add_copies(self, source: "LineCache", log_data_indexes: Sequence[int]) -> None:
+        """Add log data of another line cache.
+
+        The copies share the log events and the repeats of the source.
+        """
+        for log_data_idx in log_data_indexes:
+            log_data = source.log_data[log_data_idx]
+            self._append(LogData(log_data.log_event, log_data.repeat))
 
-            self._log_data.append(log_data)
-            self._max_width = max(self._max_width, log_data._max_width)
-        return Size(self._max_width, len(self._log_lines_idx__log_data_idx))
+    def share_repeat(self, log_data_idx: LogDataIndex, source: LogData) -> None:
+        """Share the repeats of the source of a copy.
 
-    def _lines_construct_from_log_data(
-        self, log_data: LogData, log_data_index: int
-    ) -> list[tuple[LogData, int, LogDataIndex]]:
-        new_list: list[tuple[LogData, int, LogDataIndex]] = []
-        for idx in range(log_data.line_count):
-            new_list.append((log_data, idx, log_data_index))
-        return new_list
+        A log data gets its repeats when it is first repeated, which can be
+        after it was copied.
+        """
+        log_data = self._log_data[log_data_idx]
+        log_data.repeat = source.repeat
+        log_data.measure_repeat()
+        self._max_width = max(self._max_width, log_data.max_width)
+
+    def _append(self, log_data: LogData) -> None:
+        log_event = log_data.log_event
+        log_data_idx = len(self._log_data)
+        self.memory += (
+            log_event.memory
+            + sys.getsizeof(log_data)
+            + self._line_starts.itemsize
+            + self.epoch_index.epochs.itemsize
+            + self.levels.itemsize
+            + POINTER_SIZE
+        )
+        self._line_starts.append(self._line_count)
+        self._line_count += log_data.line_count
+        self.epoch_index.append(log_event.epoch)
+        self.levels.append(log_event.level)
+        level_index = self.level_indexes.get(log_event.level)
+        if level_index is not None:
+            level_index.append(log_data_idx)
+        if self._search_text:
+            self._add_match(log_data_idx, log_data)
+        self.timeline.add(log_data_idx, log_event.epoch, log_event.level)
+        if self.templates is not None:
+            first_line = log_event.plain.partition("\n")[0]
+            self.template_ids.append(self.templates.add(first_line, log_data_idx))
+            self.memory += self.template_ids.itemsize
+
+        self._log_data.append(log_data)
+        self._max_width = max(self._max_width, log_data.max_width)
+
+    def template_indexes(self, template_id: int) -> list[LogDataIndex]:
+        """Return the log data indexes of a template."""
+        return [
+            log_data_idx
+            for log_data_idx, line_template_id in enumerate(self.template_ids)
+            if line_template_id == template_id
+        ]
 
 
 class LogOutput(ScrollView, can_focus=True):
     BINDINGS = [
         ("x", "expand", "Expand"),
+        Binding("X", "expand_matching", "Expand matching", show=False),
         Binding("down", "cursor_down", "Cursor Down", show=False),
         Binding("up", "cursor_up", "Cursor Up", show=False),
+        ("n", "next_match", "Next match"),
+        Binding("N", "previous_match", "Previous match", show=False),
+        ("e", "next_error", "Next error"),
+        Binding("E", "previous_error", "Previous error", show=False),
+        Binding("w", "next_warning", "Next warning", show=False),
+        Binding("W", "previous_warning", "Previous warning", show=False),
+        ("f", "toggle_follow", "Follow"),
     ]
 
     COMPONENT_CLASSES = {"logoutput--highlight"}
@@ -402,13 +723,24 @@ class LogOutput(ScrollView, can_focus=True):
     }
     """
     current_row: Reactive[int] = Reactive(-1)
+    # keep the last lines in view while lines are added.
+    follow: Reactive[bool] = Reactive(False)
     _line_cache: LineCache
 
-    class SearchResultCountChanged(Message):
-        """Search result count message changed."""
+    class MatchPositionChanged(Message):
+        """The search matches or the selected match changed."""
+
+        def __init__(self, position: int | None, total: int) -> None:
+            self.position = position
+            self.total = total
+            super().__init__()
+
+    class FollowChanged(Message):
+        """Following changed, or lines were added below the view."""
 
-        def __init__(self, count: dict[int, int]) -> None:
-            self.count = count
+        def __init__(self, follow: bool, new_lines: int) -> None:
+            self.follow = follow
+            self.new_lines = new_lines
             super().__init__()
 
     def __init__(self, reader: LogReader) -> None:
@@ -417,12 +749,31 @@ class LogOutput(ScrollView, can_focus=True):
         self._highlight_text: str = ""
         self._render_width: int = -1
         self._search_text_task: asyncio.Task | None = None
+        self._expand_task: asyncio.Task | None = None
+
+        # when showing the log data of one template: all log data, the shown
+        # template and the indexes of its log data in all log data.
+        self._unfiltered: LineCache | None = None
+        self.template_filter: int | None = None
+        self._filter_indexes: list[int] = []
+
+        # amount of lines added below the view since the user stopped following.
+        self._new_lines = 0
+        # where following scrolled to. Above it the user scrolled away.
+        self._follow_y = 0
 
     def on_mount(self) -> None:
-        self._line_cache = LineCache(self.app.console)
+        self._line_cache = self._new_line_cache()
         asyncio.create_task(self._watch_log())
         super().on_mount()
 
+    def _new_line_cache(self) -> LineCache:
+        compaction = self._reader.repeat_compaction
+        compactor = (
+            None if compaction == RepeatCompaction.OFF else Compactor(compaction)
+        )
+        return LineCache(self.app.console, compactor)
+
     @staticmethod
     def new_scroll(
         view_y_top: int, view_y_bottom: int, log_data_y_top: int, log_data_y_bottom: int
@@ -446,6 +797,10 @@ class LogOutput(ScrollView, can_focus=True):
             scroll_to = view_y_top + delta_y
             return scroll_to
 
+    @property
+    def timeline(self) -> Timeline:
+        return self._line_cache.timeline
+
     @property
     def render_width(self) -> int:
         return max(self.size.width, self._line_cache._max_width)
@@ -454,14 +809,15 @@ class LogOutput(ScrollView, can_focus=True):
         """When the cursor is at a boundary of the LogOutput and moves out
         of view, this method handles scrolling to ensure it remains visible."""
         log_data = self._line_cache.log_data[self.current_row]
+        line_index = self._line_cache.line_index(self.current_row)
 
         view_y_top = self.scroll_offset.y
         view_y_bottom = (
             self.scroll_offset.y + self.size.height - 1
         )  # -1 for the horizontal scrollbar
 
-        log_data_y_top = log_data.line_index
-        log_data_y_bottom = log_data.line_index + log_data.line_count
+        log_data_y_top = line_index
+        log_data_y_bottom = line_index + log_data.line_count
 
         scroll_value = LogOutput.new_scroll(
             view_y_top, view_y_bottom, log_data_y_top, log_data_y_bottom
@@ -478,6 +834,41 @@ class LogOutput(ScrollView, can_focus=True):
         self._line_cache.log_data[new_row].selected = True
 
         self._scroll_cursor_into_view()
+        self._post_match_position()
+
+    def _post_match_position(self) -> None:
+        matches = self._line_cache.matches
+        self.post_message(
+            self.MatchPositionChanged(matches.position(self.current_row), len(matches))
+        )
+
+    def _select(self, log_data_idx: int | None) -> None:
+        if log_data_idx is not None:
+            self.current_row = log_data_idx
+
+    def action_next_match(self) -> None:
+        self._select(self._line_cache.matches.next(self.current_row))
+
+    def action_previous_match(self) -> None:
+        self._select(self._line_cache.matches.previous(self.current_row))
+
+    def action_next_error(self) -> None:
+        self._select(self._line_cache.level_indexes[Level.ERROR].next(self.current_row))
+
+    def action_previous_error(self) -> None:
+        self._select(
+            self._line_cache.level_indexes[Level.ERROR].previous(self.current_row)
+        )
+
+    def action_next_warning(self) -> None:
+        self._select(
+            self._line_cache.level_indexes[Level.WARNING].next(self.current_row)
+        )
+
+    def action_previous_warning(self) -> None:
+        self._select(
+            self._line_cache.level_indexes[Level.WARNING].previous(self.current_row)
+        )
 
     def action_cursor_down(self) -> None:
         if self.current_row == self._line_cache.log_data_count - 1:
@@ -521,15 +912,221 @@ class LogOutput(ScrollView, can_focus=True):
             )
         ).crop(scroll_x, scroll_x + width)
 
+    def render_lines(self, crop: Region) -> list[Strip]:
+        start = time.perf_counter()
+        lines = super().render_lines(crop)
+        self._reader.metrics.rendered(time.perf_counter() - start)
+        return lines
+
     async def add_log_event(self, log_events: list[LogEvent]) -> None:
-        size = await self._line_cache.add_log_events(log_events)
+        match_count = len(self._line_cache.matches)
+        line_count = self._line_cache.line_count
+        if self.follow and self.scroll_offset.y < self._follow_y:
+            # the user scrolled away from the last lines.
+            self.follow = False
+        line_cache = self.line_cache
+        start = line_cache.log_data_count
+        size, repeated = await line_cache.add_log_events(log_events)
+        self._reader.metrics.batch_added(len(log_events), line_cache.memory)
+        # shown log data of which the first line changed.
+        changed = repeated
+
+        if self._unfiltered is not None:
+            changed = []
+            for log_data_idx in repeated:
+                position = bisect_left(self._filter_indexes, log_data_idx)
+                if self._filter_indexes[position : position + 1] == [log_data_idx]:
+                    self._line_cache.share_repeat(
+                        position, line_cache.log_data[log_data_idx]
+                    )
+                    changed.append(position)
+            # show the new log data of the shown template.
+            new_indexes = [
+                log_data_idx
+                for log_data_idx in range(start, line_cache.log_data_count)
+                if line_cache.template_ids[log_data_idx] == self.template_filter
+            ]
+            self._line_cache.add_copies(line_cache, new_indexes)
+            self._filter_indexes += new_indexes
+            size = Size(self._line_cache._max_width, self._line_cache.line_count)
+
+        self._grow(size)
+        self._show_added_lines(line_count, changed)
+        if len(self._line_cache.matches) != match_count:
+            self._post_match_position()
+
+    def _grow(self, size: Size) -> None:
+        """Update the virtual size after adding lines.
+
+        Setting the virtual size lays out and repaints the whole widget. That
+        is only needed when a scrollbar appears. Otherwise only the scrollbars
+        are updated.
+        """
+        if size == self.virtual_size:
+            return
+        if self._scrollbar_state(size) != self._scrollbar_state(self.virtual_size):
+            self.virtual_size = size
+            return
+        set_virtual_size_without_layout(self, size)
+
+    def _scrollbar_state(self, virtual_size: Size) -> tuple[bool, ...]:
+        """Return how a virtual size compares to the sizes deciding which
+        scrollbars are shown."""
+        width, height = self.container_size
+        styles = self.styles
+        return (
+            virtual_size.width > width,
+            virtual_size.width > width - styles.scrollbar_size_vertical,
+            virtual_size.height > height,
+            virtual_size.height > height - styles.scrollbar_size_horizontal,
+        )
+
+    def _show_added_lines(self, first_line: int, changed: list[LogDataIndex]) -> None:
+        """Repaint the added lines and the changed lines which are in view.
+
+        When following, the view scrolls to the last line. Otherwise the
+        amount of added lines below the view is counted.
+
+        Args:
+            first_line: The first added line.
+            changed: The log data of which the first line changed, like the
+                counter of a repeat.
+        """
+        if self.follow and self.scroll_offset.y < self.max_scroll_y:
+            # rendered lines are cached, so only the new lines are rendered.
+            self._scroll_to_end()
+            return
+
+        view_height = self.scrollable_content_region.height
+        first_y, last_y, below = LogOutput.added_lines(
+            first_line, self._line_cache.line_count, self.scroll_offset.y, view_height
+        )
+        if first_y < last_y:
+            self.refresh(Region(0, first_y, self.size.width, last_y - first_y))
+        for log_data_idx in changed:
+            y = self._line_cache.line_index(log_data_idx) - self.scroll_offset.y
+            if 0 <= y < view_height:
+                self.refresh(Region(0, y, self.size.width, 1))
+        if below and not self.follow:
+            self._new_lines += below
+            self.post_message(self.FollowChanged(self.follow, self._new_lines))
 
-        self.virtual_size = size
+    @staticmethod
+    def added_lines(
+        first_line: int, line_count: int, view_y_top: int, view_height: int
+    ) -> tuple[int, int, int]:
+        """Return where added lines are in the view.
+
+        Args:
+            first_line: The first added line.
+            line_count: The amount of lines after adding.
+            view_y_top: The first line in view.
+            view_height: The amount of lines in view.
+
+        Returns:
+            The first and the end y coordinate of the added lines in view, and
+            the amount of added lines below the view.
+        """
+        first_y = max(first_line - view_y_top, 0)
+        last_y = max(min(line_count - view_y_top, view_height), first_y)
+        below = max(line_count - max(first_line, view_y_top + view_height), 0)
+        return first_y, last_y, below
+
+    def _reset_new_lines(self) -> None:
+        """Start counting the new lines of another line cache."""
+        self._follow_y = 0
+        self._new_lines = 0
+        self.post_message(self.FollowChanged(self.follow, 0))
+
+    def _scroll_to_end(self) -> None:
+        self.scroll_to(None, self.max_scroll_y, animate=False)
+        self._follow_y = self.scroll_offset.y
+
+    def watch_follow(self, follow: bool) -> None:
+        if follow:
+            self._new_lines = 0
+            self._scroll_to_end()
+        self.post_message(self.FollowChanged(follow, self._new_lines))
+
+    def action_toggle_follow(self) -> None:
+        self.follow = not self.follow
 
     def clear_log(self) -> None:
-        self._line_cache = LineCache(self._console)
+        self._clear_filter()
+        self._line_cache = self._new_line_cache()
         self.virtual_size = Size(0, 0)
         self.current_row = -1
+        self._reset_new_lines()
+        self._line_cache.search(self._highlight_text)
+        self._post_match_position()
+        self.refresh()
+
+    @property
+    def line_cache(self) -> LineCache:
+        """Return all log data, also when showing one template."""
+        if self._unfiltered is not None:
+            return self._unfiltered
+        return self._line_cache
+
+    def _clear_filter(self) -> None:
+        self._unfiltered = None
+        self.template_filter = None
+        self._filter_indexes = []
+
+    def filter_template(self, template_id: int | None) -> None:
+        """Only show the log data of a template. Shows all log data when None.
+
+        The selected log data stays selected when it is shown.
+        """
+        if template_id == self.template_filter:
+            return
+        line_cache = self.line_cache
+        # the selected log data in all log data.
+        row = self.current_row
+        if row >= 0 and self._unfiltered is not None:
+            row = self._filter_indexes[row]
+
+        if template_id is None:
+            shown = line_cache
+            indexes: list[int] = []
+        else:
+            indexes = line_cache.template_indexes(template_id)
+            shown = LineCache(self.app.console, mine_templates=False)
+            shown.add_copies(line_cache, indexes)
+            position = bisect_left(indexes, row)
+            row = (
+                position
+                if row >= 0 and indexes[position : position + 1] == [row]
+                else -1
+            )
+
+        scroll_y = shown.line_index(row) if row >= 0 else 0
+        self.show(shown, row, Offset(0, scroll_y))
+        if template_id is not None:
+            self._unfiltered = line_cache
+            self.template_filter = template_id
+            self._filter_indexes = indexes
+
+    def show(
+        self, line_cache: LineCache, current_row: int, scroll_offset: Offset
+    ) -> None:
+        """Show another line cache, like the buffer of a previously viewed pod."""
+        if self._expand_task is not None:
+            self._expand_task.cancel()
+        self._clear_filter()
+        # unselect first, so the selection of the shown cache is untouched.
+        self.current_row = -1
+        self._line_cache = line_cache
+        self.virtual_size = Size(line_cache._max_width, line_cache.line_count)
+        self.current_row = current_row
+        self.scroll_to(scroll_offset.x, scroll_offset.y, animate=False)
+        self._reset_new_lines()
+        if self.follow:
+            self._scroll_to_end()
+        if line_cache._search_text != self._highlight_text:
+            self.search_log_items(self._highlight_text)
+        else:
+            self._post_match_position()
         self.refresh()
 
     async def _watch_log(self) -> None:
@@ -541,6 +1138,9 @@ class LogOutput(ScrollView, can_focus=True):
 
         is_sending: bool = False
         sending: asyncio.Event = asyncio.Event()
+        # the reader generation of the log items. The items of an older
+        # generation belong to a pod which is not shown anymore.
+        generation = self._reader.generation
 
         async def send_with_delay() -> None:
             nonlocal log_items
@@ -549,7 +1149,8 @@ class LogOutput(ScrollView, can_focus=True):
                 if not len(log_items) >= max_item_length:
                     await asyncio.sleep(delay)
                 is_sending = True
-                await self.add_log_event(log_items)
+                if generation == self._reader.generation:
+                    await self.add_log_event(log_items)
 
                 is_sending = False
                 log_items = []
@@ -563,9 +1164,26 @@ class LogOutput(ScrollView, can_focus=True):
                     await sending.wait()
                 else:
                     send_task.cancel()
+            if generation != self._reader.generation:
+                generation = self._reader.generation
+                log_items = []
             log_items.append(log_event)
             send_task = asyncio.create_task(send_with_delay())
 
+    def goto_time(self, text: str) -> None:
+        """Select the first log entry at or after a time like `14:32:05`.
+
+        Raises:
+            ValueError: The text is not a time.
+        """
+        epoch_index = self._line_cache.epoch_index
+        if not epoch_index:
+            return
+        reference = max(epoch_index.epochs[-1], 0.0)
+        row = epoch_index.find(parse_time(text, reference))
+        self.current_row = row
+        self.focus()
+
     def action_expand(self) -> None:
         if self.current_row < 0:
             return
@@ -576,33 +1194,41 @@ class LogOutput(ScrollView, can_focus=True):
             self._line_cache._max_width, self._line_cache.line_count
         )
 
+    def action_expand_matching(self) -> None:
+        """Expand all log data matching the search text.
+
+        Expanding happens in chunks, so the UI stays responsive with many
+        matches.
+        """
+        chunk_size = 100
+
+        async def _expand_task() -> None:
+            line_cache = self._line_cache
+            matches = list(line_cache.matches)
+            for start in range(0, len(matches), chunk_size):
+                line_cache.expand(matches[start : start + chunk_size])
+                self.virtual_size = Size(line_cache._max_width, line_cache.line_count)
+                self.refresh()
+                await asyncio.sleep(0)
+
+        if self._expand_task is not None:
+            self._expand_task.cancel()
+        self._expand_task = asyncio.create_task(_expand_task())
+
     def highlight(self, search_text: str) -> None:
         self._highlight_text = search_text
         self.search_log_items(search_text)
         self.refresh()
 
     def search_log_items(self, search_text: str) -> None:
-        async def _search_task() -> dict[LogDataIndex, OccurrenceCount]:
-            if search_text == "":
-                return {}
-
-            # mappable with the key as the log_item index, the amount of
-            # occurrences of the search_text.
-            search_items: dict[LogDataIndex, OccurrenceCount] = {}
-
-            for idx, log_item in enumerate(self._line_cache.log_data):
-                count = log_item.search(search_text)
-                if count:
-                    search_items[idx] = count
-            return search_items
+        async def _search_task() -> SortedIndex:
+            return self._line_cache.search(search_text)
 
         def count_finished(result: asyncio.Future) -> None:
-            try:
-                count = result.result()
-            except asyncio.CancelledError:
+            if result.cancelled():
                 self.log("Task cancelled. doing nothing")
-                count = {}
-            self.post_message(self.SearchResultCountChanged(count))
+                return
+            self._post_match_position()
 
         if self._search_text_task is not None:
             self._search_text_task.cancel()
@@ -611,18 +1237,131 @@ class LogOutput(ScrollView, can_focus=True):
         self._search_text_task.add_done_callback(count_finished)
 
 
+class Minimap(Widget):
+    """A timeline of the log volume, warnings and errors in the LogOutput.
+
+    Every row is a period of time. Clicking a row selects its first log line.
+    """
+
+    DEFAULT_CSS = """
+    Minimap {
+        width: 4;
+        height: 100%;
+        background: $panel;
+    }
+    """
+    BARS = " ▏▎▍▌▋▊▉█"
+    STYLES = {
+        "errors": Style(color="red"),
+        "warnings": Style(color="yellow"),
+        "lines": Style(color="green"),
+    }
+
+    def __init__(self, log_output: LogOutput) -> None:
+        super().__init__()
+        self._log_output = log_output
+        self._rows: list[TimelineRow] = []
+        self._rendered: tuple[Timeline | None, int, int] = (None, -1, -1)
+
+    def on_mount(self) -> None:
+        self.set_interval(0.5, self._update_rows)
+
+    def _update_rows(self) -> None:
+        timeline = self._log_output.timeline
+        state = (timeline, timeline.version, self.size.height)
+        if state == self._rendered:
+            return
+        self._rendered = state
+        self._rows = timeline.rows(self.size.height)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        if y >= len(self._rows):
+            return Strip.blank(width)
+        row = self._rows[y]
+        max_lines = max(row.lines for row in self._rows)
+
+        # bar length in eighths of a cell.
+        eighths = math.ceil(row.lines / max_lines * width * 8)
+        full, rest = divmod(eighths, 8)
+        bar = ("█" * full + self.BARS[rest])[:width].ljust(width)
+
+        if row.errors:
+            style = self.STYLES["errors"]
+        elif row.warnings:
+            style = self.STYLES["warnings"]
+        else:
+            style = self.STYLES["lines"]
+        return Strip([Segment(bar, style)], width)
+
+    def on_click(self, event: events.Click) -> None:
+        if event.y >= len(self._rows):
+            return
+        entry = self._rows[event.y].first_entry
+        if entry != NO_ENTRY:
+            self._log_output.current_row = entry
+            self._log_output.focus()
+
+
+class FollowState(Static):
+    """Whether the log output follows the last lines, or how many lines were
+    added below the view. Clicking it starts following."""
+
+    DEFAULT_CSS = """
+    FollowState {
+        width: 100%;
+        height: 1;
+        color: $text-muted;
+    }
+    FollowState.-new-lines {
+        background: $accent;
+        color: $text;
+    }
+    """
+
+    def __init__(self, log_output: LogOutput) -> None:
+        super().__init__()
+        self._log_output = log_output
+
+    def update_state(self, follow: bool, new_lines: int) -> None:
+        self.set_class(not follow and new_lines > 0, "-new-lines")
+        if follow:
+            self.update("following (f to stop)")
+        elif new_lines:
+            self.update(f"{new_lines} new lines (f to follow)")
+        else:
+            self.update("not following (f to follow)")
+
+    def on_click(self) -> None:
+        self._log_output.follow = True
+        self._log_output.focus()
+
+
 class LogViewer(Static, can_focus=True):
+    DEFAULT_CSS = """
+    LogViewer #log_area {
+        height: 1fr;
+    }
+    """
     BINDINGS = [
         ("ctrl+l", "start_logging", "Start logging"),
         ("ctrl+s", "stop_logging", "Stop logging"),
+        Binding("ctrl+t", "toggle_templates", "Templates"),
+        Binding("f12", "dump_metrics", "Dump metrics", show=False),
     ]
 
-    def __init__(self, reader: LogReader) -> None:
+    def __init__(
+        self, reader: LogReader, pod_buffers: PodBufferCache | None = None
+    ) -> None:
         super().__init__()
         self.reader = reader
+        self._pod_buffers = pod_buffers or PodBufferCache()
         self._log_control = LogControl(reader)
         self._log_output = LogOutput(self.reader)
-        self._search_result: dict[LogDataIndex, OccurrenceCount]
+        self._minimap = Minimap(self._log_output)
+        self._template_panel = TemplatePanel(self._log_output)
+        self._follow_state = FollowState(self._log_output)
 
     @property
     def log_output(self) -> LogOutput:
@@ -630,7 +1369,10 @@ class LogViewer(Static, can_focus=True):
 
     def compose(self) -> ComposeResult:
         yield self._log_control
-        yield self._log_output
+        yield Horizontal(
+            self._log_output, self._minimap, self._template_panel, id="log_area"
+        )
+        yield self._follow_state
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "startlog":
@@ -641,21 +1383,24 @@ class LogViewer(Static, can_focus=True):
             self.action_clear_log()
         elif event.button.id == "savelog":
             self.action_save_log()
-        if event.button.id == "navigate_to_next_search_result":
-            current_selected_item = self._log_output.current_row
-
-            for item in self._search_result.keys():
-                if item > current_selected_item:
-                    break
-            else:
-                return
-            self._log_output.current_row = item
+        elif event.button.id == "navigate_to_next_search_result":
+            self._log_output.action_next_match()
+        elif event.button.id == "navigate_to_previous_search_result":
+            self._log_output.action_previous_match()
 
     async def on_input_changed(self, event: Input.Changed) -> None:
         event.stop()
         if event.input.id == "search":
             self._log_output.highlight(event.value)
 
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id == "goto_time":
+            event.stop()
+            try:
+                self._log_output.goto_time(event.value)
+            except ValueError as err:
+                self.app.notify(str(err), severity="error")
+
     async def _check_reading(self) -> bool:
         if self.reader.is_reading:
             _continue = await show_dialog(self.app, StopLoggingScreen())
@@ -667,12 +1412,53 @@ class LogViewer(Static, can_focus=True):
         return True
 
     async def start(self, pod: Pod) -> None:
-        if await self._check_reading():
-            self.reader.pod = pod.name
-            self.reader.namespace = pod.namespace
+        """Start reading the log of a pod.
 
+        The buffer of the previous pod is cached. When the pod was viewed
+        recently its buffer is shown instead, without reading the log again.
+        Reading resumes after the buffered lines when logging is started.
+        """
+        if not await self._check_reading():
+            return
+        key = (pod.namespace, pod.name)
+        previous_key = (self.reader.namespace, self.reader.pod)
+        restored = key != previous_key and self._switch_buffer(previous_key, key)
+        self.reader.pod = pod.name
+        self.reader.namespace = pod.namespace
+
+        if not restored:
             self.reader.start()
-            self._log_output.focus()
+        self._log_output.focus()
+
+    def _switch_buffer(self, previous_key: PodKey, key: PodKey) -> bool:
+        """Cache the shown buffer and show the buffer of another pod.
+
+        Returns:
+            Whether the pod had a cached buffer.
+        """
+        log_output = self._log_output
+        # lines of the previous pod waiting to be parsed.
+        self.reader.clear_queue()
+        log_output.filter_template(None)
+        if log_output.line_cache.log_data_count:
+            self._pod_buffers.put(
+                previous_key,
+                PodBuffer(
+                    log_output.line_cache,
+                    log_output.current_row,
+                    log_output.scroll_offset,
+                    self.reader.position,
+                ),
+            )
+
+        buffer = self._pod_buffers.pop(key)
+        if buffer is None:
+            self.reader.position = ResumePosition()
+            log_output.clear_log()
+            return False
+        self.reader.position = buffer.position
+        log_output.show(buffer.line_cache, buffer.current_row, buffer.scroll_offset)
+        return True
 
     async def action_start_logging(self) -> None:
         if await self._check_reading():
@@ -685,19 +1471,38 @@ class LogViewer(Static, can_focus=True):
         self._log_output.clear_log()
 
     def action_save_log(self) -> None:
-        with open(Path.home() / "log_output.txt", "w") as file:
-            lines = (
-                log_data.log_event.raw
-                for log_data in self._log_output._line_cache.log_data
-            )
+        path = Path.home() / "log_output.txt"
+        capture_path = self.reader.capture_path()
+        if capture_path is not None:
+            # the shown log may be a sample. The capture has all lines.
+            shutil.copyfile(capture_path, path)
+            return
+        with open(path, "w") as file:
+            file.writelines("\n".join(self._log_output.line_cache.raw_lines()))
+
+    def action_toggle_templates(self) -> None:
+        panel = self._template_panel
+        panel.display = not panel.display
+        if panel.display:
+            panel.focus_list()
+        else:
+            self._log_output.filter_template(None)
+            self._log_output.focus()
 
-            file.writelines("\n".join(lines))
+    def action_dump_metrics(self) -> None:
+        """Write the pipeline metrics to the glasses log."""
+        snapshot = self.reader.metrics.snapshot(reset=False)
+        _logger.info("pipeline metrics: %s", snapshot._asdict())
 
     async def on_unmount(self) -> None:
         await self.reader.stop()
+        if self.reader.parse_pool is not None:
+            self.reader.parse_pool.shutdown()
+
+    def on_log_output_follow_changed(self, event: LogOutput.FollowChanged) -> None:
+        self._follow_state.update_state(event.follow, event.new_lines)
 
-    def on_log_output_search_result_count_changed(
-        self, event: LogOutput.SearchResultCountChanged
+    def on_log_output_match_position_changed(
+        self, event: LogOutput.MatchPositionChanged
     ) -> None:
-        self._search_result = event.count
-        self._log_control.update_search_result_count(event.count)
+        self._log_control.update_search_result_count(event.position, event.total)
@@ -1,11 +1,13 @@
-import asyncio
-
 from textual.app import ComposeResult
 from textual.message import Message
 from textual.widget import Widget
-from textual.widgets import Input, Label, ListItem, ListView
+from textual.widgets import Input, Label
+
+from glasses.namespace_provider import BaseK8, Cluster, Commands, ItemsDiff
+from glasses.widgets.virtual_list import Row, VirtualList
 
-from glasses.namespace_provider import BaseK8, Cluster, Commands
+# seconds the items of a resource are reused when navigating back and forth.
+NAVIGATION_MAX_AGE = 10.0
 
 
 class NestedListView(Widget):
@@ -17,26 +19,28 @@ class NestedListView(Widget):
     def compose(self) -> ComposeResult:
         yield self._updateable_list_view
 
-    async def on_mount(self) -> None:
-        await self.update_view(refresh=True)
+    def on_mount(self) -> None:
+        # the cluster is accessed after the first paint, as that can be slow.
+        self.call_after_refresh(self.update_view, True)
 
-    async def update_view(self, refresh: bool = True) -> None:
-        await self._updateable_list_view.update(self.history[-1], refresh)
+    async def update_view(
+        self, refresh: bool = True, max_age: float | None = None
+    ) -> None:
+        await self._updateable_list_view.update(self.history[-1], refresh, max_age)
 
     async def _navigate_back(self) -> None:
         if len(self.history) == 1:
             return
         self.history.pop()
-        await self.update_view()
+        await self.update_view(max_age=NAVIGATION_MAX_AGE)
 
     async def _new_view(self, item_id: str) -> None:
         new_view = self.history[-1].items[item_id]
         self.history.append(new_view)
-        await self.update_view()
+        await self.update_view(max_age=NAVIGATION_MAX_AGE)
 
-    async def on_list_view_selected(self, event: ListView.Selected) -> None:
-        id = event.item.id
-        assert isinstance(id, str)
+    async def on_virtual_list_selected(self, event: VirtualList.Selected) -> None:
+        id = event.key
         if id == "update_view":
             await self.update_view(refresh=True)
         elif id == "navigate_back":
@@ -68,21 +72,21 @@ class UpdateableListView(Widget):
     DEFAULT_CSS = """
     UpdateableListView {
         layout: vertical;
-    }
-
-    .item {
-        background: $background-darken-3 0%;
+        height: 100%;
     }
     """
 
     def __init__(self, item: BaseK8, id: str) -> None:
         super().__init__(id=id)
-        self._listview = ListView(classes="focusable")
+        self._listview = VirtualList(classes="focusable")
         self._filter = Input(placeholder="filter text")
         self._title = Label("no title")
 
         self._item: BaseK8 = item
-        self._delay_update_task: asyncio.Task | None = None
+        self._item.subscribe("changes", self._on_items_changed)
+        self._item.subscribe("is_refreshing", self._on_refreshing)
+        # the item currently displayed in the list.
+        self._shown_item: BaseK8 | None = None
 
     async def on_show(self) -> None:
         self._listview.focus()
@@ -92,47 +96,73 @@ class UpdateableListView(Widget):
         yield self._filter
         yield self._listview
 
-    async def update(self, view_item_data: BaseK8, refresh: bool = True) -> None:
-        self._item = view_item_data
+    async def update(
+        self,
+        view_item_data: BaseK8,
+        refresh: bool = True,
+        max_age: float | None = None,
+    ) -> None:
+        if view_item_data is not self._item:
+            self._item.unsubscribe("changes", self._on_items_changed)
+            self._item.unsubscribe("is_refreshing", self._on_refreshing)
+            self._item = view_item_data
+            self._item.subscribe("changes", self._on_items_changed)
+            self._item.subscribe("is_refreshing", self._on_refreshing)
+
+        # the cached items are shown right away.
+        if self._shown_item is not self._item:
+            await self._update()
         if refresh:
-            await self._item.refresh()
+            # changes are applied by _on_items_changed.
+            await self._item.refresh(max_age)
 
-        await self._update()
+    def _item_rows(self) -> list[Row]:
+        return [Row(item.name, item.label) for item in self._item.filter_items()]
+
+    def _command_rows(self) -> list[Row]:
+        return [Row(cmd.name, f" [{cmd.value}]") for cmd in self._item.commands]
 
     async def _update(self) -> None:
-        self._title.update(self._item.name)
+        # the cursor and scroll position are kept when filtering the same item.
+        keep_position = self._shown_item is self._item
+        self._shown_item = self._item
+        self._on_refreshing(self._item.is_refreshing)
         self._filter.value = self._item.filter_text
 
-        await self._listview.clear()
-
-        self._listview.append(ListItem(Label(" <Back"), id="navigate_back"))
-        self._listview.append(ListItem(Label(" [Refresh]"), id="update_view"))
-
-        for item in self._item.filter_items():
-            self._listview.append(
-                ListItem(Label(item.label), id=item.name, classes="item")
-            )
-        for cmd in self._item.commands:
-            self._listview.append(
-                ListItem(Label(f" \[{cmd.value}]"), id=cmd.name)  # noqa
+        self._listview.set_rows(
+            [Row("navigate_back", " <Back"), Row("update_view", " [Refresh]")]
+            + self._item_rows()
+            + self._command_rows(),
+            keep_position=keep_position,
+        )
+
+    def _on_refreshing(self, is_refreshing: bool) -> None:
+        name = self._item.name
+        self._title.update(f"{name} (refreshing...)" if is_refreshing else name)
+
+    def _on_items_changed(self, diff: ItemsDiff) -> None:
+        """Apply the changed items to the list instead of rebuilding it."""
+        listview = self._listview
+        visible = {item.name: item for item in self._item.filter_items()}
+
+        if diff.removed:
+            listview.remove_rows(diff.removed)
+
+        for name in diff.updated:
+            if name in visible:
+                listview.update_row(Row(name, visible[name].label))
+
+        shown = {row.key for row in listview.rows}
+        added = [
+            Row(name, visible[name].label)
+            for name in diff.added
+            if name in visible and name not in shown
+        ]
+        if added:
+            first_command = next(
+                (cmd.name for cmd in self._item.commands if cmd.name in shown), None
             )
-
-    def update_with_delay(self) -> None:
-        """Update the ui after a delay
-
-        Prevent updating the UI too much when enter keys into the filter.
-        """
-        if self._delay_update_task:
-            self._delay_update_task.cancel()
-
-        async def delayed_update() -> None:
-            try:
-                await asyncio.sleep(0.4)
-                await self._update()
-            except asyncio.CancelledError:
-                pass
-
-        self._delay_update_task = asyncio.create_task(delayed_update())
+            listview.insert_rows(added, before=first_command)
 
     async def on_input_changed(self, event: Input.Changed) -> None:
         if self._item.filter_text == event.value:
@@ -140,11 +170,9 @@ class UpdateableListView(Widget):
 
         self._item.filter_text = event.value
 
-        self.update_with_delay()
-
-    async def on_unmount(self) -> None:
-        if self._delay_update_task:
-            self._delay_update_task.cancel()
+        # filtering and updating the virtual list take less than a frame, so
+        # the list is updated on every key.
+        await self._update()
 
     def on_mount(self) -> None:
         self._listview.focus()
@@ -0,0 +1,75 @@
+"""A summary of the kinds of lines in the log.
+
+Lists the templates of the shown log, the most common first. Selecting a
+template only shows its lines in the log output.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.widget import Widget
+from textual.widgets import Label
+
+from glasses.templates import TemplateMiner
+from glasses.widgets.virtual_list import Row, VirtualList
+
+if TYPE_CHECKING:
+    from glasses.widgets.log_viewer import LogOutput
+
+# key of the row showing all lines.
+ALL_LINES = "all"
+
+
+class TemplatePanel(Widget):
+    DEFAULT_CSS = """
+    TemplatePanel {
+        width: 40%;
+        height: 100%;
+        display: none;
+        layout: vertical;
+    }
+    TemplatePanel Label {
+        width: 100%;
+        background: $panel;
+    }
+    """
+
+    def __init__(self, log_output: LogOutput) -> None:
+        super().__init__()
+        self._log_output = log_output
+        self._list = VirtualList()
+        self._rendered: tuple[TemplateMiner | None, int] = (None, -1)
+
+    def compose(self) -> ComposeResult:
+        yield Label("templates")
+        yield self._list
+
+    def on_mount(self) -> None:
+        self.set_interval(0.5, self._update_rows)
+
+    def focus_list(self) -> None:
+        self._update_rows()
+        self._list.focus()
+
+    def _update_rows(self) -> None:
+        if not self.display:
+            return
+        templates = self._log_output.line_cache.templates
+        if templates is None:
+            return
+        state = (templates, templates.version)
+        if state == self._rendered:
+            return
+        self._rendered = state
+        rows = [Row(ALL_LINES, "all lines")]
+        for row in templates.rows():
+            label = Text.assemble((f"{row.lines:>8} ", "bold"), row.text)
+            rows.append(Row(str(row.id), label))
+        self._list.set_rows(rows)
+
+    def on_virtual_list_selected(self, event: VirtualList.Selected) -> None:
+        event.stop()
+        template_id = None if event.key == ALL_LINES else int(event.key)
+        self._log_output.filter_template(template_id)
@@ -0,0 +1,202 @@
+"""A list which only renders the rows on screen.
+
+Rows are identified by a key. Updating the list compares rows by key and only
+repaints the visible rows which changed, so the focus, the cursor and the
+scroll position are kept.
+"""
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+
+from rich.cells import cell_len
+from rich.text import Text
+from textual import events
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.reactive import Reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+class Row(NamedTuple):
+    key: str
+    label: Text | str
+
+
+def _cell_len(label: Text | str) -> int:
+    return label.cell_len if isinstance(label, Text) else cell_len(label)
+
+
+class VirtualList(ScrollView, can_focus=True):
+    BINDINGS = [
+        Binding("enter", "select", "Select", show=False),
+        Binding("up", "cursor_up", "Cursor Up", show=False),
+        Binding("down", "cursor_down", "Cursor Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+    ]
+
+    COMPONENT_CLASSES = {"virtual-list--cursor"}
+
+    DEFAULT_CSS = """
+    VirtualList {
+        height: 1fr;
+    }
+    VirtualList > .virtual-list--cursor {
+        background: $secondary 50%;
+    }
+    VirtualList:focus > .virtual-list--cursor {
+        background: $secondary;
+    }
+    """
+
+    cursor: Reactive[int] = Reactive(0)
+
+    class Selected(Message):
+        """A row is selected with enter or a click."""
+
+        def __init__(self, key: str) -> None:
+            self.key = key
+            super().__init__()
+
+    def __init__(self, classes: str | None = None) -> None:
+        super().__init__(classes=classes)
+        self._rows: list[Row] = []
+        # position of each row by key.
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def rows(self) -> list[Row]:
+        return self._rows
+
+    @property
+    def highlighted(self) -> Row | None:
+        if 0 <= self.cursor < len(self._rows):
+            return self._rows[self.cursor]
+        return None
+
+    def set_rows(self, rows: Iterable[Row], keep_position: bool = True) -> None:
+        """Replace the rows.
+
+        Args:
+            rows: The new rows.
+            keep_position: Keep the cursor on the same row and keep the scroll
+                position. Otherwise the list starts at the top again.
+        """
+        old_rows = self._rows
+        highlighted = self.highlighted
+        self._rows = list(rows)
+        self._positions = {row.key: idx for idx, row in enumerate(self._rows)}
+
+        if keep_position and highlighted is not None:
+            cursor = self._positions.get(highlighted.key, self.cursor)
+        else:
+            cursor = 0
+        self._update_virtual_size()
+        if not keep_position:
+            self.scroll_to(0, 0, animate=False)
+        self._refresh_changed(old_rows)
+        self.cursor = self._clamp(cursor)
+
+    def insert_rows(self, rows: Iterable[Row], before: str | None = None) -> None:
+        """Insert rows before the row with the given key, or at the end."""
+        position = len(self._rows) if before is None else self._positions[before]
+        new_rows = self._rows[:position] + list(rows) + self._rows[position:]
+        self.set_rows(new_rows)
+
+    def remove_rows(self, keys: Iterable[str]) -> None:
+        removed = set(keys)
+        self.set_rows(row for row in self._rows if row.key not in removed)
+
+    def update_row(self, row: Row) -> None:
+        """Change the label of a row."""
+        position = self._positions.get(row.key)
+        if position is None:
+            return
+        self._rows[position] = row
+        self._update_virtual_size()
+        self._refresh_row(position)
+
+    def _update_virtual_size(self) -> None:
+        width = max((_cell_len(row.label) for row in self._rows), default=0)
+        self.virtual_size = Size(width, len(self._rows))
+
+    def _refresh_changed(self, old_rows: list[Row]) -> None:
+        """Repaint the visible rows which differ from the old rows."""
+        top = self.scroll_offset.y
+        for position in range(top, top + self.size.height):
+            old = old_rows[position] if position < len(old_rows) else None
+            new = self._rows[position] if position < len(self._rows) else None
+            if old != new:
+                self._refresh_row(position)
+
+    def _refresh_row(self, position: int) -> None:
+        y = position - self.scroll_offset.y
+        if 0 <= y < self.size.height:
+            self.refresh(Region(0, y, self.size.width, 1))
+
+    def _clamp(self, cursor: int) -> int:
+        return max(0, min(cursor, len(self._rows) - 1))
+
+    def render_line(self, y: int) -> Strip:
+        position = self.scroll_offset.y + y
+        width = self.size.width
+        if position >= len(self._rows):
+            return Strip.blank(width, self.rich_style)
+
+        label = self._rows[position].label
+        text = label.copy() if isinstance(label, Text) else Text(label)
+        text.stylize(self.rich_style, 0)
+        if position == self.cursor:
+            text.stylize(self.get_component_rich_style("virtual-list--cursor"))
+        text = text[self.scroll_offset.x :]
+        text.truncate(width, pad=True)
+        return Strip(text.render(self.app.console), width)
+
+    def watch_cursor(self, old_cursor: int, new_cursor: int) -> None:
+        self._refresh_row(old_cursor)
+        self._refresh_row(new_cursor)
+        self._scroll_cursor_into_view()
+
+    def _scroll_cursor_into_view(self) -> None:
+        top = self.scroll_offset.y
+        height = self.size.height
+        if self.cursor < top:
+            self.scroll_to(None, self.cursor, animate=False)
+        elif height and self.cursor >= top + height:
+            self.scroll_to(None, self.cursor - height + 1, animate=False)
+
+    def action_select(self) -> None:
+        row = self.highlighted
+        if row is not None:
+            self.post_message(self.Selected(row.key))
+
+    def action_cursor_up(self) -> None:
+        self.cursor = self._clamp(self.cursor - 1)
+
+    def action_cursor_down(self) -> None:
+        self.cursor = self._clamp(self.cursor + 1)
+
+    def action_page_up(self) -> None:
+        self.cursor = self._clamp(self.cursor - self.size.height)
+
+    def action_page_down(self) -> None:
+        self.cursor = self._clamp(self.cursor + self.size.height)
+
+    def action_first(self) -> None:
+        self.cursor = 0
+
+    def action_last(self) -> None:
+        self.cursor = self._clamp(len(self._rows) - 1)
+
+    def on_click(self, event: events.Click) -> None:
+        position = self.scroll_offset.y + event.y
+        if position < len(self._rows):
+            self.cursor = position
+            self.action_select()
@@ -0,0 +1,65 @@
+import math
+
+from rich.text import Text
+
+from glasses.compaction import Compactor, Repeat
+from glasses.controllers.log_provider import LogEvent
+from glasses.settings import RepeatCompaction
+
+
+def _event(raw: str) -> LogEvent:
+    return LogEvent(raw, Text(raw))
+
+
+def test_compactor__exact__only_identical_lines_repeat():
+    compactor = Compactor(RepeatCompaction.EXACT)
+    raws = ["retry", "retry", "2023-01-01T10:00:00 retry", "retry", "retry"]
+
+    repeats = [compactor.repeat(_event(raw)) for raw in raws]
+
+    assert repeats == [
+        (False, None),
+        (True, None),
+        (False, None),
+        (False, None),
+        (True, None),
+    ]
+
+
+def test_compactor__ignore_timestamps__lines_differing_in_timestamps_repeat():
+    compactor = Compactor(RepeatCompaction.IGNORE_TIMESTAMPS)
+    raws = [
+        '{"@timestamp": "2023-01-01T10:00:00.1Z", "message": "retry"}',
+        '{"@timestamp": "2023-01-01T10:00:01.2Z", "message": "retry"}',
+        '{"@timestamp": "2023-01-01T10:00:02.3Z", "message": "done"}',
+    ]
+
+    repeats = [compactor.repeat(_event(raw)) for raw in raws]
+
+    assert repeats == [
+        (False, ("2023-01-01T10:00:00.1Z",)),
+        (True, ("2023-01-01T10:00:01.2Z",)),
+        (False, ("2023-01-01T10:00:02.3Z",)),
+    ]
+
+
+def test_repeat__raws__recreates_repeated_lines():
+    first = "2023-01-01 10:00:00 retry at 2023-01-01 10:00:00"
+    repeat = Repeat(math.nan)
+    repeat.add(math.nan, ("2023-01-01 10:00:01", "2023-01-01 10:00:02"))
+    repeat.add(math.nan, ("2023-01-01 10:00:03", "2023-01-01 10:00:04"))
+
+    assert list(repeat.raws(first)) == [
+        "2023-01-01 10:00:01 retry at 2023-01-01 10:00:02",
+        "2023-01-01 10:00:03 retry at 2023-01-01 10:00:04",
+    ]
+    assert repeat.count == 3
+
+
+def test_repeat__identical_lines__label_has_count_and_times():
+    repeat = Repeat(0.0)
+    repeat.add(3600.0, None)
+
+    assert list(repeat.raws("retry")) == ["retry"]
+    assert repeat.label().cell_len == repeat.width
+    assert repeat.label().plain.startswith("  ×2 ")
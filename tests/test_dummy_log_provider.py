@@ -2,7 +2,12 @@ import pytest
 import pytest_asyncio
 from textual.widgets import Label
 
-from glasses.controllers.log_provider import DummyLogReader, LogEvent
+from glasses.controllers.log_provider import (
+    DummyLogReader,
+    LoadProfile,
+    LogEvent,
+    LogReader,
+)
 
 
 @pytest_asyncio.fixture
@@ -37,3 +42,68 @@ async def test_dummy_log_data__returns_valid_data(dummylogger):
         Label(item.parsed)
         if item_nr == max_items:
             break
+
+
+def test_load_profile__rate_at__bursts():
+    load = LoadProfile(rate=100, burst_rate=50_000, burst_interval=10, burst_duration=2)
+
+    assert load.rate_at(1) == 50_000
+    assert load.rate_at(5) == 100
+    assert load.rate_at(11.5) == 50_000
+
+
+@pytest.mark.asyncio
+async def test_load_generation__read__emits_batches_at_rate():
+    load = LoadProfile(rate=10, burst_rate=100, burst_interval=4, burst_duration=1)
+    log_provider = DummyLogReader(load=load)
+    log_provider.POOL_SIZE = 100
+    log_provider.TICK = 0
+    times = iter(range(10))
+
+    def clock() -> float:
+        now = next(times)
+        if now == 5:
+            # stop after generating the lines of 5 seconds.
+            task.cancel()
+        return now
+
+    log_provider.clock = clock
+    task = log_provider.start()
+    await task
+
+    batches = []
+    while log_provider._stream.qsize():
+        batches.append(log_provider._stream.get_nowait())
+
+    # one batch per second. A burst starts every 4 seconds.
+    assert [len(batch) for batch in batches] == [10, 10, 10, 100, 10]
+
+
+@pytest.mark.asyncio
+async def test_clear_queue__while_reading_batch__rest_of_batch_not_read():
+    reader = LogReader()
+    await reader._put(["first", "second"])
+    log_events = reader.read()
+    first = await log_events.__anext__()
+
+    reader.clear_queue()
+    await reader._put(["third"])
+    third = await log_events.__anext__()
+
+    assert (first.raw, third.raw) == ("first", "third")
+
+
+@pytest.mark.asyncio
+async def test_slow_parser__read_batches__yields_within_parse_time(monkeypatch):
+    monkeypatch.setattr("glasses.controllers.log_provider.MAX_PARSE_SECONDS", 0)
+    reader = LogReader()
+    await reader._put(["first", "second", "third"])
+    reader._stream.close()
+
+    batches = [batch async for batch in reader.read_batches()]
+
+    assert [[log_event.raw for log_event in batch] for batch in batches] == [
+        ["first"],
+        ["second"],
+        ["third"],
+    ]
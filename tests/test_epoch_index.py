@@ -0,0 +1,71 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from glasses.epoch_index import EpochIndex, parse_time
+
+
+def _index(*epochs: float) -> EpochIndex:
+    index = EpochIndex()
+    for epoch in epochs:
+        index.append(epoch)
+    return index
+
+
+def test_entries_in_order__find__first_entry_at_or_after_epoch():
+    index = _index(10.0, 20.0, 20.0, 30.0)
+
+    assert index.find(5.0) == 0
+    assert index.find(20.0) == 1
+    assert index.find(25.0) == 3
+
+
+def test_epoch_after_last_entry__find__last_entry():
+    index = _index(10.0, 20.0)
+
+    assert index.find(100.0) == 1
+
+
+def test_entries_without_time__find__time_of_previous_entry_used():
+    index = _index(math.nan, 10.0, math.nan, 20.0)
+
+    assert list(index.epochs) == [-math.inf, 10.0, 10.0, 20.0]
+    assert index.find(10.0) == 1
+
+
+def test_entries_out_of_order__find__earliest_entry_at_or_after_epoch():
+    index = _index(10.0, 30.0, 20.0, 40.0, 25.0)
+
+    assert not index.in_order
+    assert index.find(21.0) == 4
+    assert index.find(20.0) == 2
+
+    index.append(22.0)
+    assert index.find(21.0) == 5
+
+
+def test_no_entries__find__minus_one():
+    assert EpochIndex().find(10.0) == -1
+
+
+def test_time_only__parse_time__on_date_of_reference():
+    reference = datetime(2023, 1, 1, 18, 0).timestamp()
+
+    assert (
+        parse_time("14:32:05", reference) == datetime(2023, 1, 1, 14, 32, 5).timestamp()
+    )
+    assert parse_time("14:32", reference) == datetime(2023, 1, 1, 14, 32).timestamp()
+
+
+def test_date_and_time__parse_time__epoch():
+    assert (
+        parse_time("2023-02-03 14:32:05.5", 0.0)
+        == datetime(2023, 2, 3, 14, 32, 5, 500000).timestamp()
+    )
+
+
+@pytest.mark.parametrize("text", ["", "noon", "25:00", "14:32:05 pm"])
+def test_invalid_time__parse_time__value_error(text):
+    with pytest.raises(ValueError):
+        parse_time(text, 0.0)
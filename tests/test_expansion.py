@@ -0,0 +1,44 @@
+from glasses.expansion import ExpansionCache, expand
+
+
+def test_json__expand__pretty_printed():
+    expansion = expand('{"a": 1, "b": "ü"}')
+
+    assert expansion.is_json
+    assert expansion.lines == ["{", '  "a": 1,', '  "b": "ü"', "}"]
+    assert expansion.max_width == 10
+
+
+def test_json__text__highlighted():
+    expansion = expand('{"a": 1}')
+
+    assert expansion.text(1).spans
+
+
+def test_plain_text__expand__split_on_newlines():
+    expansion = expand("not json\nsecond line")
+
+    assert not expansion.is_json
+    assert expansion.lines == ["not json", "second line"]
+    assert not expansion.text(0).spans
+
+
+def test_cache__get_twice__expanded_once():
+    cache = ExpansionCache()
+
+    first = cache.get(0, '{"a": 1}')
+
+    assert cache.get(0, '{"a": 1}') is first
+
+
+def test_cache__over_budget__least_recently_used_removed():
+    cache = ExpansionCache(max_bytes=expand('{"a": 1}').memory * 2)
+    first = cache.get(0, '{"a": 1}')
+    cache.get(1, '{"a": 1}')
+    cache.get(0, '{"a": 1}')
+
+    cache.get(2, '{"a": 1}')
+
+    assert cache.get(0, '{"a": 1}') is first
+    assert cache.memory <= cache.max_bytes
+    assert list(cache._expansions) == [2, 0]
@@ -0,0 +1,47 @@
+from glasses.fuzzy import FuzzyIndex, fuzzy_score
+
+
+def test_fuzzy_score__not_a_subsequence__no_match():
+    assert fuzzy_score("pdo", "pod_1") is None
+
+
+def test_fuzzy_score__consecutive_characters__scored_higher():
+    assert fuzzy_score("pay", "payment") > fuzzy_score("pay", "pxaxy")
+
+
+def test_fuzzy_score__word_start__scored_higher():
+    assert fuzzy_score("gw", "api-gateway-x") > fuzzy_score("gw", "agxw")
+
+
+def test_filter__typo_with_gap__still_matches():
+    index = FuzzyIndex(["payment-gateway", "frontend"])
+
+    assert index.filter("pymnt") == ["payment-gateway"]
+
+
+def test_filter__ranked_by_score():
+    index = FuzzyIndex(["xapixx", "a-p-x", "api-server"])
+
+    assert index.filter("api") == ["api-server", "xapixx"]
+
+
+def test_filter__case_insensitive():
+    index = FuzzyIndex(["Payment"])
+
+    assert index.filter("PAY") == ["Payment"]
+
+
+def test_filter__extended_pattern__only_candidates_rescored():
+    index = FuzzyIndex(["abc", "abd", "xyz"])
+    index.filter("ab")
+
+    assert index._candidates == [0, 1]
+    assert index.filter("abd") == ["abd"]
+    assert index._candidates == [1]
+
+
+def test_filter__shortened_pattern__all_names_rescored():
+    index = FuzzyIndex(["abc", "abd", "xyz"])
+    index.filter("abd")
+
+    assert index.filter("a") == ["abc", "abd"]
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from glasses.controllers.ingest_queue import IngestQueue
+from glasses.settings import OverloadPolicy
+
+
+def _exhaust_queue(queue: IngestQueue) -> list[str]:
+    items = []
+    try:
+        while True:
+            items.extend(queue.get_nowait())
+    except asyncio.QueueEmpty:
+        pass
+    return items
+
+
+@pytest.mark.asyncio
+async def test_block__full_queue__put_waits_for_room():
+    queue = IngestQueue(max_lines=2, policy=OverloadPolicy.BLOCK)
+    await queue.put(["1", "2"])
+
+    put_task = asyncio.create_task(queue.put(["3"]))
+    await asyncio.sleep(0.01)
+    assert not put_task.done()
+
+    assert await queue.get() == ["1", "2"]
+    await asyncio.wait_for(put_task, 1)
+    assert _exhaust_queue(queue) == ["3"]
+    assert queue.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest__full_queue__oldest_lines_dropped():
+    queue = IngestQueue(max_lines=3, policy=OverloadPolicy.DROP_OLDEST)
+    await queue.put(["1", "2"])
+    await queue.put(["3", "4"])
+    await queue.put(["5", "6", "7", "8"])
+
+    assert _exhaust_queue(queue) == ["6", "7", "8"]
+    assert queue.dropped == 5
+    assert queue.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_sample__full_queue__new_lines_sampled():
+    queue = IngestQueue(max_lines=4, policy=OverloadPolicy.SAMPLE, sample_step=3)
+    await queue.put(["1", "2", "3"])
+    await queue.put(["a", "b", "c", "d", "e", "f"])
+
+    assert _exhaust_queue(queue) == ["2", "3", "a", "d"]
+    assert queue.sampled == 4
+    assert queue.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_clear__full_queue__emptied_without_dropping():
+    queue = IngestQueue(max_lines=2, policy=OverloadPolicy.BLOCK)
+    await queue.put(["1", "2"])
+
+    queue.clear()
+
+    assert queue.qsize() == 0
+    assert not queue.full()
+    assert queue.dropped == 0
+    assert _exhaust_queue(queue) == []
@@ -2,31 +2,35 @@ import asyncio
 from typing import Any, Sequence
 
 import pytest
+from aiohttp import ClientPayloadError, ServerDisconnectedError
 
-from glasses.controllers.log_provider import K8LogReader
+from glasses.controllers.log_provider import (
+    K8LogReader,
+    LineSplitter,
+    ResumePosition,
+    backoff_delay,
+    split_timestamp,
+)
 
 
 class _Reader:
     def __init__(
-        self, watched_items: list[bytes | asyncio.TimeoutError | asyncio.CancelledError]
+        self, watched_items: Sequence[bytes | asyncio.TimeoutError | Exception]
     ) -> None:
         self._watch_items = watched_items
         self._current_idx = 0
 
-    def at_eof(self) -> bool:
-        return self._current_idx == len(self._watch_items)
-
-    async def readline(self) -> bytes:
-
+    async def readany(self) -> bytes:
+        """Return every item as a separate chunk. Lines are newline terminated."""
+        if self._current_idx == len(self._watch_items):
+            return b""
         item = self._watch_items[self._current_idx]
         self._current_idx += 1
 
-        if isinstance(item, asyncio.TimeoutError):
-            raise item
-        if isinstance(item, asyncio.CancelledError):
+        if isinstance(item, BaseException):
             raise item
         else:
-            return item
+            return item + b"\n"
 
 
 class _Resp:
@@ -35,173 +39,141 @@ class _Resp:
 
 
 class FakeV1Api:
-    def __init__(
-        self,
-        first_run_items: list[bytes | Exception],
-        watched_items: list[bytes | Exception],
-    ) -> None:
-        self._first_run_items = _Resp(first_run_items)
-        self._resp = _Resp(watched_items)
+    def __init__(self, *connections: list[bytes | Exception]) -> None:
+        """Every connection to the log returns the next list of items."""
+        self._connections = list(connections)
+        self.calls: list[dict[str, Any]] = []
 
     async def read_namespaced_pod_log(
         self,
         pod: str,
         namespace: str,
-        tail_lines: int = 0,
-        follow: bool = False,
         **kwargs: Any,
-    ) -> str | _Resp:
-        if follow:
-            return self._resp
-        else:
-            return self._first_run_items
+    ) -> _Resp:
+        self.calls.append(kwargs)
+        if not self._connections:
+            raise asyncio.CancelledError()  # used to signal stop logging.
+        return _Resp(self._connections.pop(0))
 
 
 def _exhaust_queue(queue: asyncio.Queue) -> list[str]:
     items = []
     try:
         while True:
-            items.append(queue.get_nowait())
+            items.extend(queue.get_nowait())
     except asyncio.QueueEmpty:
         print("empty")
     return items
 
 
-@pytest.mark.asyncio
-async def test_read_timeout__read_log__should_retry() -> None:
-    log_reader = K8LogReader(
-        FakeV1Api(
-            [
-                b"log line 1",
-                b"log line 2",
-            ],
-            [
-                b"log line 2",
-                b"first line",
-                asyncio.TimeoutError(),  # the read log request times out.
-                b"first line",
-                b"second line",
-                asyncio.CancelledError(),  # used to signal stop logging.
-            ],
-        )
-    )
+async def _read_all(log_reader: K8LogReader) -> list[str]:
+    log_reader.backoff_base = 0
     try:
         await log_reader.print_pod_log()
     except asyncio.CancelledError:
         print("finished")
-
-    queue_items = _exhaust_queue(log_reader._stream)
-    assert queue_items == ["log line 1", "log line 2", "first line", "second line"]
+    return [split_timestamp(line)[1] for line in _exhaust_queue(log_reader._stream)]
 
 
 @pytest.mark.asyncio
-async def test_normal_read__read_log__no_entries_are_duplicate() -> None:
+async def test_read_timeout__read_log__should_retry_without_duplicates() -> None:
     log_reader = K8LogReader(
         FakeV1Api(
             [
-                b"log line 0",
-                b"log line 1",
+                b"2023-01-01T10:00:00.1Z log line 1",
+                b"2023-01-01T10:00:00.2Z log line 2",
+                asyncio.TimeoutError(),  # the read log request times out.
             ],
             [
-                b"log line 1",  # this line is identical to the one gathered in the first step. It is assumed this one will be removed.
-                b"second log line",
-                asyncio.CancelledError(),  # used to signal stop logging.
+                b"2023-01-01T10:00:00.1Z log line 1",
+                b"2023-01-01T10:00:00.2Z log line 2",
+                b"2023-01-01T10:00:01Z first line",
+                b"2023-01-01T10:00:02Z second line",
             ],
         )
     )
 
-    try:
-        await log_reader.print_pod_log()
-    except asyncio.CancelledError:
-        print("finsihed")
+    queue_items = await _read_all(log_reader)
 
-    queue_items = _exhaust_queue(log_reader._stream)
-
-    assert queue_items == ["log line 0", "log line 1", "second log line"]
+    assert queue_items == ["log line 1", "log line 2", "first line", "second line"]
 
 
+@pytest.mark.parametrize(
+    "error", [ClientPayloadError("broken payload"), ServerDisconnectedError()]
+)
 @pytest.mark.asyncio
-async def test_empty_first_read__read_log__should_stream_all_messages() -> None:
-    # perform a test where the first log run (with lines == 50) returns nothing.
-    # then the streaming log should return a list of two. Both must be in result. No error should be reported.
+async def test_dropped_stream__read_log__resumes_without_duplicates(error) -> None:
     log_reader = K8LogReader(
         FakeV1Api(
-            [],
             [
-                b"log line 1",  # this line is identical to the one gathered in the first step. It is assumed this one will be removed.
-                b"second log line",
-                asyncio.CancelledError(),  # used to signal stop logging.
+                b"2023-01-01T10:00:00.1Z log line 1",
+                b"2023-01-01T10:00:00.2Z log line 2",
+                error,  # the connection drops while streaming.
+            ],
+            [
+                b"2023-01-01T10:00:00.2Z log line 2",
+                b"2023-01-01T10:00:01Z first line",
             ],
         )
     )
 
-    try:
-        await log_reader.print_pod_log()
-    except asyncio.CancelledError:
-        print("finsihed")
+    queue_items = await _read_all(log_reader)
 
-    queue_items = _exhaust_queue(log_reader._stream)
-
-    assert queue_items == ["log line 1", "second log line"]
+    assert queue_items == ["log line 1", "log line 2", "first line"]
 
 
 @pytest.mark.asyncio
-async def test_non_overlapping_log_messages__read_log__should_have_warning_message() -> None:
+async def test_identical_lines_with_same_timestamp__reconnect__only_new_lines() -> None:
     log_reader = K8LogReader(
         FakeV1Api(
-            [b"log line 0"],
             [
-                b"log line 1",  # this line is identical to the one gathered in the first step. It is assumed this one will be removed.
-                b"second log line",
-                asyncio.CancelledError(),  # used to signal stop logging.
+                b"2023-01-01T10:00:00.5Z retrying",
+                b"2023-01-01T10:00:00.5Z retrying",
+            ],
+            [
+                b"2023-01-01T10:00:00.5Z retrying",
+                b"2023-01-01T10:00:00.5Z retrying",
+                b"2023-01-01T10:00:00.5Z retrying",
+                b"2023-01-01T10:00:00.500000001Z retrying",
             ],
         )
     )
 
-    try:
-        await log_reader.print_pod_log()
-    except asyncio.CancelledError:
-        print("finsihed")
+    queue_items = await _read_all(log_reader)
 
-    queue_items = _exhaust_queue(log_reader._stream)
+    assert queue_items == ["retrying"] * 4
 
-    assert queue_items == [
-        "log line 0",
-        "WARNING. MIGHT HAVE LOST A LOGLINE",
-        "log line 1",
-        "second log line",
-    ]
+
+@pytest.mark.asyncio
+async def test_reconnect__read_log__resumes_from_last_timestamp() -> None:
+    api = FakeV1Api([b"2023-01-01T10:00:00Z log line 0"], [])
+    log_reader = K8LogReader(api)
+    log_reader.tail = 50
+
+    await _read_all(log_reader)
+
+    first_call, second_call, *_ = api.calls
+    assert first_call["tail_lines"] == 50
+    assert first_call["timestamps"] is True
+    assert "tail_lines" not in second_call
+    assert second_call["since_seconds"] > K8LogReader.RESUME_MARGIN
 
 
 @pytest.mark.asyncio
-async def test_watch_log_lines_fully_overlap_first_run_items__read_log__should_not_have_duplicate_messages() -> None:
+async def test_empty_first_read__read_log__should_stream_all_messages() -> None:
     log_reader = K8LogReader(
         FakeV1Api(
+            [],
             [
-                b"log line 0",
-                b"log line 1",
-            ],
-            [
-                b"log line 0",  # this line is identical to the one gathered in the first step. It is assumed this one will be removed.
-                b"log line 1",
-                b"log line 2",
-                asyncio.TimeoutError(),
-                b"log line 1",
-                b"log line 2",
-                b"log line 3",
-                asyncio.CancelledError(),  # used to signal stop logging.
+                b"2023-01-01T10:00:00Z log line 1",
+                b"2023-01-01T10:00:01Z second log line",
             ],
         )
     )
 
-    try:
-        await log_reader.print_pod_log()
-    except asyncio.CancelledError:
-        print("finsihed")
-
-    queue_items = _exhaust_queue(log_reader._stream)
+    queue_items = await _read_all(log_reader)
 
-    assert queue_items == ["log line 0", "log line 1", "log line 2", "log line 3"]
+    assert queue_items == ["log line 1", "second log line"]
 
 
 @pytest.mark.asyncio
@@ -209,10 +181,75 @@ async def test_failing_log_data__read_log__is_handled_properly():
     log_reader = K8LogReader(
         FakeV1Api(
             [ValueError()],  # this will cause the reader to fail hard.
-            [],
         )
     )
 
     log_reader.start()
     await asyncio.sleep(0.2)
     assert log_reader.is_reading is False
+
+
+def test_split_timestamp():
+    assert split_timestamp("2023-02-19T07:32:56.254753Z a line") == (
+        "2023-02-19T07:32:56.254753Z",
+        "a line",
+    )
+    assert split_timestamp("no timestamp here") == (None, "no timestamp here")
+
+
+def test_line_splitter__partial_lines__carried_over():
+    splitter = LineSplitter()
+    euro = "€".encode()
+
+    assert splitter.feed(b"first\nsec") == ["first"]
+    assert splitter.feed(b"ond\n" + euro[:1]) == ["second"]
+    assert splitter.feed(euro[1:] + b"\n\xff\n") == ["€", "\ufffd"]
+
+
+def test_resume_position__older_lines__rejected():
+    position = ResumePosition()
+
+    assert position.accept("2023-01-01T10:00:01Z")
+    position.reconnect()
+
+    assert not position.accept("2023-01-01T10:00:00.999Z")
+    assert not position.accept("2023-01-01T10:00:01.000Z")
+    assert position.accept("2023-01-01T10:00:01Z")
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 5, 20])
+def test_backoff_delay__within_bounds(attempt):
+    delay = backoff_delay(attempt, base=0.5, maximum=10)
+
+    assert 0 <= delay <= min(10, 0.5 * 2**attempt)
+
+
+@pytest.mark.asyncio
+async def test_timestamped_line__read_batches__prefix_removed_and_used_as_epoch():
+    log_reader = K8LogReader(FakeV1Api())
+    await log_reader._put(["2023-01-01T10:00:00.5Z a line"])
+    log_reader._stream.close()
+
+    batches = [batch async for batch in log_reader.read_batches()]
+
+    [[log_event]] = batches
+    assert log_event.raw == "a line"
+    assert log_event.epoch == 1672567200.5
+
+
+@pytest.mark.asyncio
+async def test_resume_position__read_log__resumes_without_duplicates() -> None:
+    api = FakeV1Api(
+        [
+            b"2023-01-01T10:00:00.1Z log line 1",
+            b"2023-01-01T10:00:01Z first line",
+        ]
+    )
+    log_reader = K8LogReader(api)
+    log_reader.position.accept("2023-01-01T10:00:00.1Z")
+
+    queue_items = await _read_all(log_reader)
+
+    assert queue_items == ["first line"]
+    assert "tail_lines" not in api.calls[0]
+    assert "since_seconds" in api.calls[0]
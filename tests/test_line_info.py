@@ -0,0 +1,26 @@
+import math
+
+from glasses.log_parsers.line_info import Level, line_epoch, line_level, timestamp_epoch
+
+
+def test_json_line__level_and_epoch__from_fields():
+    line = '{"@timestamp": "2023-01-01T00:00:01.500Z", "log.level": "warning"}'
+
+    assert line_level(line) == Level.WARNING
+    assert line_epoch(line) == 1672531201.5
+
+
+def test_plain_line__level_and_epoch__from_text():
+    line = "2023-01-01 00:00:01,250 [ ERROR ] connection lost"
+
+    assert line_level(line) == Level.ERROR
+    assert line_epoch(line) == 1672531201.25
+
+
+def test_line_without_time__line_epoch__nan():
+    assert math.isnan(line_epoch("connection lost"))
+    assert line_level("connection lost") == Level.UNKNOWN
+
+
+def test_timestamp_with_offset__timestamp_epoch__utc():
+    assert timestamp_epoch("2023-01-01T01:00:00+01:00") == 1672531200.0
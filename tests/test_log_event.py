@@ -0,0 +1,51 @@
+from rich.style import Style
+from rich.text import Span, Text
+
+from glasses.controllers import log_provider
+from glasses.controllers.log_provider import LogEvent
+
+
+def test_json_line__log_event__raw_and_parsed_preserved():
+    raw = '{"message": "hello"}'
+    parsed = Text.assemble(
+        ("2023-01-01", "#999999"), " ", ("hello", Style(bold=True)), style="dim"
+    )
+
+    log_event = LogEvent(raw, parsed)
+
+    assert log_event.raw == raw
+    assert log_event.plain == parsed.plain
+    assert log_event.parsed.spans == parsed.spans
+    assert log_event.parsed.style == "dim"
+
+
+def test_plain_ending_with_raw__log_event__raw_not_stored_twice():
+    raw = "just a line"
+    parsed = Text.assemble(("[!E] ", "red"), raw)
+
+    log_event = LogEvent(raw, parsed)
+
+    assert log_event.raw == raw
+    assert log_event.parsed.spans == [Span(0, 5, "red")]
+    assert log_event.memory < LogEvent(raw, Text("other text")).memory
+
+
+def test_long_line__log_event__large_offsets_preserved():
+    raw = "x" * 70_000
+    parsed = Text(raw, spans=[Span(69_000, 69_999, "red")])
+
+    log_event = LogEvent(raw, parsed)
+
+    assert log_event.parsed.spans == [Span(69_000, 69_999, "red")]
+    assert log_event.raw == raw
+
+
+def test_styles_registered_up_to_max__new_style__not_styled(monkeypatch):
+    known = Text("known", "red")
+    LogEvent("known", known)
+    monkeypatch.setattr(log_provider, "MAX_STYLES", len(log_provider._styles))
+
+    log_event = LogEvent("new", Text("new", "bold #123456"))
+
+    assert log_event.parsed.style == ""
+    assert LogEvent("known", known).parsed.style == "red"
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from glasses.log_generator import LineKind, LogGenerator
+
+
+def test_same_seed__lines__identical_output():
+    assert LogGenerator(seed=1).lines(20) == LogGenerator(seed=1).lines(20)
+
+
+@pytest.mark.parametrize("kind", [LineKind.JSON, LineKind.MULTILINE, LineKind.LONG])
+def test_json_kinds__line__valid_json(kind):
+    line = LogGenerator().line(kind)
+
+    assert "\n" not in line
+    assert "@timestamp" in json.loads(line)
+
+
+def test_multiline__line__has_exception():
+    line = json.loads(LogGenerator().line(LineKind.MULTILINE))
+
+    assert "\n" in line["exception"]
+
+
+def test_plain__line__not_json():
+    line = LogGenerator().line(LineKind.PLAIN)
+
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(line)
+
+
+def test_message__zero_words__empty_message():
+    assert LogGenerator(message_words=(3, 12))._message(0, 0) == ""
@@ -4,10 +4,24 @@ from rich.console import Console
 from rich.segment import Segment
 from rich.style import Style
 from rich.text import Text
+from textual.app import App, ComposeResult
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
 from textual.strip import Strip
 
-from glasses.controllers.log_provider import LogEvent
-from glasses.widgets.log_viewer import LineCache, LogOutput
+from glasses.compaction import Compactor
+from glasses.controllers.log_provider import DummyLogReader, LogEvent
+from glasses.log_parsers.line_info import Level
+from glasses.pod_buffers import PodBufferCache
+from glasses.settings import RepeatCompaction
+from glasses.widgets.log_viewer import (
+    LineCache,
+    LogControl,
+    LogOutput,
+    LogViewer,
+    Minimap,
+    set_virtual_size_without_layout,
+)
 
 
 @pytest.fixture()
@@ -94,7 +108,7 @@ async def test_multiline_log_events__get_lines__correct_result(console):
     line_0 = line_cache.line(0, "", irrelevant_style, 5)
     line_1 = line_cache.line(1, "", irrelevant_style, 5)
 
-    assert len(line_cache._log_lines_idx__log_data_idx) == 2
+    assert line_cache.line_count == 2
     assert line_0 == Strip([Segment("Two  "), Segment("\n")], 5)
     assert line_1 == Strip([Segment("Lines"), Segment("\n")], 5)
 
@@ -226,3 +240,182 @@ def test_scroll_data_above_view_window():
     value = LogOutput.new_scroll(**input)
 
     assert value == expected_new_view_y_top
+
+
+@pytest.mark.asyncio
+async def test_multiline_log_events__expand_first__line_index_of_next_shifted(
+    console,
+):
+    log_events = [
+        LogEvent("Raw first", Text("First\nline")),
+        LogEvent("Raw second", Text("Second")),
+    ]
+    line_cache = LineCache(console)
+    await line_cache.add_log_events(log_events)
+
+    assert line_cache.line_index(1) == 2
+    assert line_cache.log_data_index_from_line_index(1) == 0
+    assert line_cache.log_data_index_from_line_index(2) == 1
+
+    line_cache.toggle_expand(0)
+
+    assert line_cache.line_index(1) == 5
+    assert line_cache.line_count == 6
+    assert line_cache.log_data_index_from_line_index(4) == 0
+    assert line_cache.log_data_index_from_line_index(5) == 1
+    assert line_cache.line(5, "", Style(), 6) == Strip(
+        [Segment("Second"), Segment("\n")], 6
+    )
+
+
+@pytest.mark.asyncio
+async def test_search__add_log_events__new_matches_appended(console):
+    line_cache = LineCache(console)
+    await line_cache.add_log_events(
+        [LogEvent(txt, Text(txt)) for txt in ("an error", "fine", "error error")]
+    )
+
+    matches = line_cache.search("error")
+    await line_cache.add_log_events(
+        [LogEvent(txt, Text(txt)) for txt in ("fine", "another error")]
+    )
+
+    assert list(matches) == [0, 2, 4]
+    assert line_cache.match_count == 4
+
+
+@pytest.mark.asyncio
+async def test_levels__add_log_events__indexed_per_level(console):
+    levels = [Level.INFO, Level.ERROR, Level.WARNING, Level.ERROR]
+    line_cache = LineCache(console)
+
+    await line_cache.add_log_events(
+        [LogEvent("line", Text("line"), level=level) for level in levels]
+    )
+
+    assert list(line_cache.level_indexes[Level.ERROR]) == [1, 3]
+    assert list(line_cache.level_indexes[Level.WARNING]) == [2]
+
+
+@pytest.mark.asyncio
+async def test_search__expand_matches__only_matches_expanded(console):
+    line_cache = LineCache(console)
+    await line_cache.add_log_events(
+        [LogEvent(txt, Text(txt)) for txt in ("an error", "fine", "error error")]
+    )
+
+    line_cache.expand(list(line_cache.search("error")))
+
+    assert [log_data.expanded for log_data in line_cache.log_data] == [
+        True,
+        False,
+        True,
+    ]
+    assert line_cache.line_index(1) == 4
+    assert line_cache.line_index(2) == 5
+    assert line_cache.line_count == 9
+
+
+@pytest.mark.asyncio
+async def test_compactor__add_repeated_log_events__collapsed_into_one_line(console):
+    line_cache = LineCache(console, Compactor(RepeatCompaction.EXACT))
+    raws = ["retry", "retry", "ok"]
+    await line_cache.add_log_events([LogEvent(raw, Text(raw)) for raw in raws])
+    await line_cache.add_log_events([LogEvent("ok", Text("ok"))])
+
+    assert line_cache.log_data_count == 2
+    assert line_cache.line_count == 2
+    assert list(line_cache.raw_lines()) == ["retry", "retry", "ok", "ok"]
+    line = line_cache.line(0, "", Style(), 10)
+    assert "".join(segment.text for segment in line) == "retry  ×2 \n"
+
+
+@pytest.mark.asyncio
+async def test_compactor__repeat_of_added_log_data__reported_as_repeated(console):
+    line_cache = LineCache(console, Compactor(RepeatCompaction.EXACT))
+    await line_cache.add_log_events([LogEvent("retry", Text("retry"))])
+
+    added = await line_cache.add_log_events(
+        [LogEvent(raw, Text(raw)) for raw in ("retry", "retry", "ok", "ok")]
+    )
+
+    assert added.repeated == [0, 1]
+    assert added.size == (9, 2)
+
+
+@pytest.mark.asyncio
+async def test_templates__add_copies_of_template__only_template_shown(console):
+    line_cache = LineCache(console)
+    raws = ["retry 1", "connected", "retry 2", "connected", "retry 3"]
+    await line_cache.add_log_events([LogEvent(raw, Text(raw)) for raw in raws])
+    indexes = line_cache.template_indexes(line_cache.template_ids[0])
+
+    filtered = LineCache(console, mine_templates=False)
+    filtered.add_copies(line_cache, indexes)
+
+    assert indexes == [0, 2, 4]
+    assert [log_data.log_event.raw for log_data in filtered.log_data] == [
+        "retry 1",
+        "retry 2",
+        "retry 3",
+    ]
+    assert filtered.templates is None
+
+
+def test_added_lines__view_not_full__added_lines_in_view():
+    assert LogOutput.added_lines(5, 8, 0, 10) == (5, 8, 0)
+
+
+def test_added_lines__view_filling_up__remaining_lines_below_view():
+    assert LogOutput.added_lines(8, 15, 0, 10) == (8, 10, 5)
+
+
+def test_added_lines__scrolled_up__all_lines_below_view():
+    assert LogOutput.added_lines(100, 110, 20, 10) == (80, 80, 10)
+
+
+@pytest.mark.asyncio
+async def test_templates__copy_repeated_after_copying__repeats_shared(console):
+    line_cache = LineCache(console, Compactor(RepeatCompaction.EXACT))
+    await line_cache.add_log_events([LogEvent("retry", Text("retry"))])
+    filtered = LineCache(console, mine_templates=False)
+    filtered.add_copies(line_cache, [0])
+
+    added = await line_cache.add_log_events([LogEvent("retry", Text("retry"))])
+    filtered.share_repeat(0, line_cache.log_data[added.repeated[0]])
+
+    line = filtered.line(0, "", Style(), 10)
+    assert "".join(segment.text for segment in line) == "retry  ×2 \n"
+    assert filtered._max_width == 9
+
+
+@pytest.mark.asyncio
+async def test_set_virtual_size_without_layout__scroll_view__scrollable():
+    class ScrollApp(App):
+        def compose(self) -> ComposeResult:
+            yield ScrollView()
+
+    app = ScrollApp()
+    async with app.run_test(size=(40, 10)) as pilot:
+        scroll_view = app.query_one(ScrollView)
+        set_virtual_size_without_layout(scroll_view, Size(40, 100))
+        await pilot.pause()
+
+        assert scroll_view.virtual_size == Size(40, 100)
+        assert scroll_view.max_scroll_y == 90
+
+
+@pytest.mark.asyncio
+async def test_log_viewer__layout__minimap_beside_log_output():
+    class ViewerApp(App):
+        def compose(self) -> ComposeResult:
+            yield LogViewer(DummyLogReader(), PodBufferCache())
+
+    app = ViewerApp()
+    async with app.run_test(size=(100, 30)):
+        minimap = app.query_one(Minimap).region
+        log_output = app.query_one(LogOutput).region
+
+        assert not minimap.overlaps(app.query_one(LogControl).region)
+        assert minimap.y == log_output.y
+        assert minimap.x >= log_output.right
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from glasses.metrics import PipelineMetrics
+
+
+def test_snapshot__rates_since_previous_snapshot():
+    with patch("glasses.metrics.time.monotonic", side_effect=[0, 2, 3]):
+        metrics = PipelineMetrics()
+        metrics.received(lines=100, size=1000)
+        metrics.parsed(lines=100, seconds=0.01)
+        metrics.batch_added(lines=100, buffer_memory=5000)
+        metrics.batch_added(lines=50, buffer_memory=6000)
+
+        first = metrics.snapshot()
+        second = metrics.snapshot()
+
+    assert first.lines_per_second == 50
+    assert first.bytes_per_second == 500
+    assert first.parse_time_per_line == 0.0001
+    assert first.average_batch_size == 75
+    assert first.buffer_memory == 6000
+
+    assert second.lines_per_second == 0
+    assert second.lines_received == 100
+
+
+def test_no_reset__snapshot__rates_of_next_snapshot_unchanged():
+    with patch("glasses.metrics.time.monotonic", side_effect=[0, 1, 2]):
+        metrics = PipelineMetrics()
+        metrics.received(lines=100, size=1000)
+
+        peek = metrics.snapshot(reset=False)
+        readout = metrics.snapshot()
+
+    assert peek.lines_per_second == 100
+    assert readout.lines_per_second == 50
+
+
+def test_summary__compact_readout():
+    with patch("glasses.metrics.time.monotonic", side_effect=[0, 1]):
+        metrics = PipelineMetrics()
+        metrics.received(lines=12_300, size=2_000_000)
+
+        summary = metrics.snapshot().summary()
+
+    assert summary.startswith("12.3k lines/s  2.0MB/s")
@@ -1,7 +1,18 @@
+import asyncio
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
-from glasses.namespace_provider import Pod
+import pytest
+
+from glasses.k8client import BaseClient, PodEvent, PodListing
+from glasses.namespace_provider import (
+    Cluster,
+    ItemsDiff,
+    NameSpace,
+    Pod,
+    WatchExpired,
+    diff_items,
+)
 
 CURRENT_DATE = datetime.now()
 
@@ -12,3 +23,249 @@ def test_pod_label():
 
     label = pod.label
     assert label.plain == result
+
+
+class FakeClient(BaseClient):
+    def __init__(self, listings: list[PodListing], events: list[PodEvent | Exception]):
+        self.supports_watch = True
+        self._listings = listings
+        self._events = events
+        self.list_calls = 0
+        self.watch_started = asyncio.Event()
+
+    async def get_namespaces(self):
+        return {}
+
+    async def get_resources(self, namespace):
+        return (await self.list_resources(namespace)).pods
+
+    async def list_resources(self, namespace):
+        listing = self._listings[min(self.list_calls, len(self._listings) - 1)]
+        self.list_calls += 1
+        return listing
+
+    async def watch_resources(self, namespace, resource_version):
+        self.watch_started.set()
+        while self._events:
+            event = self._events.pop(0)
+            if isinstance(event, Exception):
+                raise event
+            yield event
+        await asyncio.Event().wait()  # keep watching forever.
+
+
+def _pod(name: str) -> Pod:
+    return Pod(name, "namespace", Mock(), CURRENT_DATE)
+
+
+def test_diff_items():
+    old = {"a": _pod("a"), "b": _pod("b")}
+    new = {"b": Pod("b", "namespace", Mock(), datetime(2000, 1, 1)), "c": _pod("c")}
+
+    assert diff_items(old, new) == ItemsDiff(
+        added=("c",), removed=("a",), updated=("b",)
+    )
+
+
+@pytest.mark.asyncio
+async def test_fresh_cache__refresh__does_not_list_again():
+    client = FakeClient([PodListing({"a": _pod("a")}, "1")], [])
+    namespace = NameSpace("namespace", client)
+
+    await namespace.refresh()
+    result = await namespace.refresh()
+
+    assert client.list_calls == 1
+    assert list(result) == ["a"]
+    namespace.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_cache__refresh__lists_again():
+    client = FakeClient([PodListing({"a": _pod("a")}, None)], [])
+    namespace = NameSpace("namespace", client, cache_ttl=0)
+
+    await namespace.refresh()
+    await namespace.refresh()
+
+    assert client.list_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_watch_events__refresh__applied_to_items():
+    client = FakeClient(
+        [PodListing({"a": _pod("a")}, "1")],
+        [
+            PodEvent("ADDED", _pod("b"), "2"),
+            PodEvent("DELETED", _pod("a"), "3"),
+        ],
+    )
+    namespace = NameSpace("namespace", client)
+    changes = Mock()
+
+    class Subscriber:
+        def on_change(self, diff):
+            changes(diff)
+
+    subscriber = Subscriber()
+    namespace.subscribe("changes", subscriber.on_change)
+
+    await namespace.refresh()
+    await client.watch_started.wait()
+    await asyncio.sleep(0)
+
+    assert list(namespace.items) == ["b"]
+    assert namespace._resource_version == "3"
+    assert changes.call_args_list == [
+        call(ItemsDiff(added=("a",))),
+        call(ItemsDiff(added=("b",))),
+        call(ItemsDiff(removed=("a",))),
+    ]
+    namespace.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_watch__relists():
+    client = FakeClient(
+        [PodListing({"a": _pod("a")}, "1"), PodListing({"c": _pod("c")}, "5")],
+        [WatchExpired("namespace")],
+    )
+    namespace = NameSpace("namespace", client)
+
+    await namespace.refresh()
+    await client.watch_started.wait()
+    await asyncio.sleep(0)
+
+    assert client.list_calls == 2
+    assert list(namespace.items) == ["c"]
+    namespace.close()
+
+
+def test_filter_items__fuzzy_filter__best_match_first():
+    namespace = NameSpace("namespace", Mock())
+    for name in ("worker-payment", "payment-api", "frontend"):
+        namespace._items[name] = Pod(name, "namespace", Mock(), CURRENT_DATE)
+
+    namespace.filter_text = "pay"
+
+    assert [pod.name for pod in namespace.filter_items()] == [
+        "payment-api",
+        "worker-payment",
+    ]
+
+
+class PrefetchClient(BaseClient):
+    """Lists a pod per namespace. Namespaces can fail or hang."""
+
+    def __init__(self, names, failing=(), hanging=()):
+        self._names = names
+        self._failing = failing
+        self._hanging = hanging
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def get_namespaces(self):
+        return {name: NameSpace(name, self) for name in self._names}
+
+    async def get_resources(self, namespace):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            if namespace in self._failing:
+                raise ConnectionError(namespace)
+            if namespace in self._hanging:
+                await asyncio.Event().wait()
+            return {f"pod_{namespace}": _pod(f"pod_{namespace}")}
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_cluster_refresh__prefetch__pods_listed_with_bounded_concurrency():
+    client = PrefetchClient([f"ns_{idx}" for idx in range(6)])
+    cluster = Cluster("cluster", client, prefetch_concurrency=2)
+
+    namespaces = await cluster.refresh()
+    await cluster._prefetch_task
+
+    assert client.max_running == 2
+    assert all(namespace.is_fresh for namespace in namespaces.values())
+    assert list(namespaces["ns_3"].items) == ["pod_ns_3"]
+
+
+@pytest.mark.asyncio
+async def test_cluster_prefetch__failing_and_slow_namespaces__others_listed():
+    client = PrefetchClient(["ok", "failing", "slow"], ["failing"], ["slow"])
+    cluster = Cluster("cluster", client, prefetch_timeout=0.05)
+    namespaces = await client.get_namespaces()
+    cluster._items = namespaces
+
+    await cluster.prefetch()
+
+    assert namespaces["ok"].is_fresh
+    assert not namespaces["failing"].is_fresh
+    assert not namespaces["slow"].is_fresh
+    assert not namespaces["slow"].is_refreshing
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes__single_list_call():
+    client = PrefetchClient(["ns"])
+    # without caching, every refresh which does not share a list call lists.
+    namespace = NameSpace("ns", client, cache_ttl=0)
+
+    results = await asyncio.gather(*(namespace.refresh() for _ in range(5)))
+
+    assert client.calls == 1
+    assert all(list(result) == ["pod_ns"] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_while_refreshing__list_call_shared():
+    client = PrefetchClient(["ns"])
+    namespace = NameSpace("ns", client, cache_ttl=0)
+
+    await asyncio.gather(namespace.prefetch(), namespace.refresh())
+
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_no_watch__refresh__lists_again():
+    client = PrefetchClient(["ns"])
+    namespace = NameSpace("ns", client)
+
+    await namespace.refresh()
+    await namespace.refresh()
+
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh__max_age__recent_items_returned_without_fetching():
+    client = Mock(spec=BaseClient)
+    client.get_namespaces.return_value = {}
+    cluster = Cluster("cluster", client, prefetch_concurrency=0)
+
+    await cluster.refresh()
+    await cluster.refresh(max_age=60)
+    await cluster.refresh(max_age=0)
+
+    assert client.get_namespaces.call_count == 2
+    assert cluster.age < 60
+
+
+@pytest.mark.asyncio
+async def test_refresh__caller_cancelled__other_callers_get_result():
+    client = PrefetchClient(["ns"])
+    namespace = NameSpace("ns", client)
+    cancelled = asyncio.create_task(namespace.refresh())
+    waiting = asyncio.create_task(namespace.refresh())
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+
+    assert list(await waiting) == ["pod_ns"]
@@ -0,0 +1,85 @@
+import pytest
+
+from glasses.controllers.capture import RawCapture, remove_old_runs
+from glasses.controllers.log_provider import LogReader
+from glasses.controllers.overload import (
+    EVALUATE_INTERVAL,
+    MAX_RENDER_LATENCY,
+    AdaptiveSampler,
+)
+from glasses.settings import OverloadPolicy
+
+
+def test_update__queue_filling_up__step_doubles_until_recovered():
+    sampler = AdaptiveSampler(max_queued_lines=100)
+
+    steps = []
+    for idx, queue_depth in enumerate([60, 60, 30, 5, 5]):
+        sampler.update(queue_depth, 0, idx * EVALUATE_INTERVAL)
+        steps.append(sampler.step)
+
+    assert steps == [2, 4, 4, 2, 1]
+
+
+def test_update__slow_rendering__sampling_starts():
+    sampler = AdaptiveSampler(max_queued_lines=100)
+
+    assert sampler.update(0, MAX_RENDER_LATENCY * 2, 0)
+    assert not sampler.update(0, MAX_RENDER_LATENCY * 2, EVALUATE_INTERVAL / 2)
+    assert sampler.step == 2
+
+
+def test_sample__step__warnings_and_errors_kept():
+    sampler = AdaptiveSampler(max_queued_lines=100)
+    sampler.step = 3
+
+    kept = sampler.sample(["a", "b", "c", "d", "an error"])
+    kept += sampler.sample(["f", "g"])
+
+    assert kept == ["a", "d", "an error", "g"]
+    assert sampler.sampled == 3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_reader__overloaded__all_lines_captured(tmp_path):
+    reader = LogReader(max_queued_lines=10, overload_policy=OverloadPolicy.ADAPTIVE)
+    reader.namespace, reader.pod = "ns", "pod"
+    reader.capture = RawCapture(tmp_path)
+    reader.capture.open("ns_pod")
+    reader.metrics.render_latency = MAX_RENDER_LATENCY * 2
+    lines = [f"line {idx}" for idx in range(20)]
+
+    for batch in (lines[:10], lines[10:]):
+        await reader._put(batch)
+
+    assert reader.sample_step == 2
+    assert reader.sampled == 10
+    capture_path = reader.capture_path()
+    assert capture_path is not None
+    assert capture_path.read_text().splitlines() == lines
+
+
+@pytest.mark.asyncio
+async def test_timestamped_reader__capture__timestamps_removed(tmp_path):
+    reader = LogReader(overload_policy=OverloadPolicy.ADAPTIVE)
+    reader.timestamps = True
+    reader.capture = RawCapture(tmp_path)
+    reader.capture.open("ns_pod")
+
+    await reader._put(["2023-01-01T00:00:01.5Z first", "second"])
+    await reader.stop()
+
+    assert (tmp_path / "ns_pod.log").read_text() == "first\nsecond\n"
+
+
+def test_remove_old_runs__more_runs__oldest_removed(tmp_path):
+    for run in ("20230101-120000", "20230102-120000", "20230103-120000"):
+        (tmp_path / run).mkdir()
+        (tmp_path / run / "ns_pod.log").write_text("line\n")
+
+    remove_old_runs(tmp_path, keep=2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "20230102-120000",
+        "20230103-120000",
+    ]
@@ -0,0 +1,109 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from rich.text import Text
+
+from glasses.controllers.log_provider import LogReader
+from glasses.log_parsers.parse_pool import (
+    PARSERS,
+    ParsePool,
+    compact,
+    parse_line,
+    parse_log_line,
+    to_text,
+)
+
+
+async def _batches(batches: list[list[str]]) -> AsyncIterator[list[str]]:
+    for batch in batches:
+        yield batch
+
+
+def test_compact__to_text__roundtrip():
+    text = Text.assemble(("key", "bold red"), ": ", ("value", "green"), style="dim")
+
+    result = to_text(compact(text))
+
+    assert result.plain == text.plain
+    assert result.spans == [span._replace(style=str(span.style)) for span in text.spans]
+    assert str(result.style) == "dim"
+
+
+def test_parse_line__not_json__plain_text_fallback():
+    result = parse_line("just a line")
+
+    assert result.plain.startswith("[!E] ")
+    assert "just a line" in result.plain
+
+
+def test_timestamps__parse_log_line__prefix_removed_and_used_as_epoch():
+    line = '2023-01-01T00:00:01.5Z {"@timestamp": "2023-01-01T00:00:00.000Z"}'
+
+    parsed = parse_log_line(line, timestamps=True)
+
+    assert line[parsed.offset :] == '{"@timestamp": "2023-01-01T00:00:00.000Z"}'
+    assert parsed.epoch == 1672531201.5
+
+
+def test_no_timestamps__parse_log_line__epoch_from_line():
+    line = '{"@timestamp": "2023-01-01T00:00:00.000Z"}'
+
+    parsed = parse_log_line(line)
+
+    assert parsed.offset == 0
+    assert parsed.epoch == 1672531200.0
+
+
+@pytest.mark.asyncio
+async def test_parse_pool__threads__order_preserved():
+    batches = [[f"line {batch} {line}" for line in range(5)] for batch in range(20)]
+    pool = ParsePool(3, use_threads=True)
+
+    try:
+        result = [item async for item in pool.parse(_batches(batches))]
+    finally:
+        pool.shutdown()
+
+    assert [batch for batch, _, _ in result] == batches
+    for batch, parsed, seconds in result:
+        assert [parsed_line.text.plain for parsed_line in parsed] == [
+            parse_line(line).plain for line in batch
+        ]
+        assert seconds >= 0
+
+
+@pytest.mark.asyncio
+async def test_parse_pool__processes__parses_lines():
+    pool = ParsePool(1, use_threads=False)
+
+    try:
+        result = [item async for item in pool.parse(_batches([["a line"]]))]
+    finally:
+        pool.shutdown()
+
+    [(_, parsed, _)] = result
+    assert [parsed_line.text.plain for parsed_line in parsed] == [
+        parse_line("a line").plain
+    ]
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+@pytest.mark.asyncio
+async def test_reader_parser__read_batches__parsed_by_reader_parser(
+    monkeypatch, workers
+):
+    monkeypatch.setitem(PARSERS, "upper", lambda data: Text(data.upper()))
+    reader = LogReader()
+    reader.logparser = "upper"
+    if workers:
+        reader.parse_pool = ParsePool(workers, use_threads=True)
+    await reader._put(["a line"])
+    reader.close_queue()
+
+    try:
+        result = [batch async for batch in reader.read_batches()]
+    finally:
+        if reader.parse_pool is not None:
+            reader.parse_pool.shutdown()
+
+    assert [log_event.plain for log_event in result[0]] == ["A LINE"]
@@ -0,0 +1,68 @@
+import pytest
+from rich.console import Console
+from rich.style import Style
+from rich.text import Text
+from textual.geometry import Offset
+
+from glasses.controllers.log_provider import LogEvent, ResumePosition
+from glasses.pod_buffers import PodBuffer, PodBufferCache
+from glasses.widgets.log_viewer import LineCache
+
+
+async def _buffer(lines: int) -> PodBuffer:
+    line_cache = LineCache(Console())
+    await line_cache.add_log_events(
+        [LogEvent(f"line {idx}", Text(f"line {idx}")) for idx in range(lines)]
+    )
+    return PodBuffer(line_cache, 0, Offset(0, 0), ResumePosition())
+
+
+@pytest.mark.asyncio
+async def test_put__pop__same_buffer_returned_once():
+    cache = PodBufferCache()
+    buffer = await _buffer(10)
+
+    cache.put(("ns", "pod"), buffer)
+
+    assert cache.pop(("ns", "pod")) is buffer
+    assert cache.pop(("ns", "pod")) is None
+
+
+@pytest.mark.asyncio
+async def test_put__over_budget__least_recently_viewed_removed():
+    first, second, third = await _buffer(10), await _buffer(10), await _buffer(10)
+    cache = PodBufferCache(max_bytes=first.line_cache.memory * 2)
+
+    cache.put(("ns", "first"), first)
+    cache.put(("ns", "second"), second)
+    cache.put(("ns", "first"), first)
+    cache.put(("ns", "third"), third)
+
+    assert ("ns", "second") not in cache
+    assert ("ns", "first") in cache
+    assert ("ns", "third") in cache
+    assert cache.memory <= cache.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_put__buffer_exceeds_budget__newest_kept():
+    cache = PodBufferCache(max_bytes=1)
+
+    cache.put(("ns", "first"), await _buffer(10))
+    cache.put(("ns", "second"), await _buffer(10))
+
+    assert len(cache) == 1
+    assert ("ns", "second") in cache
+
+
+@pytest.mark.asyncio
+async def test_put__rendered_buffer__caches_cleared():
+    cache = PodBufferCache()
+    buffer = await _buffer(10)
+    buffer.line_cache.line(0, "", Style(), 10)
+    buffer.line_cache.toggle_expand(1)
+
+    cache.put(("ns", "pod"), buffer)
+
+    assert not buffer.line_cache._rendered
+    assert buffer.line_cache._expansions.memory == 0
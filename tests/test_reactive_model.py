@@ -1,12 +1,16 @@
+import asyncio
 import gc
 from unittest.mock import Mock
 
-from glasses.reactive_model import Reactr, ReactrModel
+import pytest
+
+from glasses.reactive_model import COALESCE_DELAY, Reactr, ReactrModel
 
 
 class Model(ReactrModel):
     value1 = Reactr(10)
     value2 = Reactr(12)
+    event = Reactr(0, compare=False)
 
 
 class Controller:
@@ -70,3 +74,112 @@ def test_multiple_controllers():
 
     controller_1.value_1_mock.assert_called_once_with(20)
     controller_2.value_1_mock.assert_called_once_with(20)
+
+
+def test_falsy_value__get__value_returned():
+    values = Model()
+
+    values.value1 = 0
+
+    assert values.value1 == 0
+
+
+def test_equal_value__set__not_published():
+    values = Model()
+    controller = Controller(values=values)
+
+    values.value1 = 10
+    values.value1 = 20
+    values.value1 = 20
+
+    controller.value_1_mock.assert_called_once_with(20)
+
+
+def test_compare_disabled__equal_value__published():
+    values = Model()
+    callback = Mock()
+
+    class Subscriber:
+        def on_event(self, value):
+            callback(value)
+
+    subscriber = Subscriber()
+    values.subscribe("event", subscriber.on_event)
+
+    values.event = 1
+    values.event = 1
+
+    assert callback.call_count == 2
+
+
+def test_transaction__set_twice__published_once_when_done():
+    values = Model()
+    controller = Controller(values=values)
+
+    with values.transaction():
+        values.value1 = 20
+        values.value1 = 21
+        values.value2 = 30
+        controller.value_1_mock.assert_not_called()
+
+    controller.value_1_mock.assert_called_once_with(21)
+    controller.value_2_mock.assert_called_once_with(30)
+
+
+def test_unsubscribe__set__not_published():
+    values = Model()
+    controller = Controller(values=values)
+
+    values.unsubscribe("value1", controller._update_value1)
+    values.value1 = 20
+
+    controller.value_1_mock.assert_not_called()
+    assert len(values._subscriptions["value2"]) == 1
+
+
+def test_unsubscribe__subscribe_again__published():
+    values = Model()
+    controller = Controller(values=values)
+
+    values.unsubscribe("value1", controller._update_value1)
+    values.subscribe("value1", controller._update_value1)
+    values.value1 = 20
+
+    controller.value_1_mock.assert_called_once_with(20)
+
+
+def test_one_method__two_properties__both_published():
+    values = Model()
+    callback = Mock()
+
+    class Subscriber:
+        def on_value(self, value):
+            callback(value)
+
+    subscriber = Subscriber()
+    values.subscribe("value1", subscriber.on_value)
+    values.subscribe("value2", subscriber.on_value)
+    values.value1 = 20
+    values.value2 = 30
+
+    assert [call.args for call in callback.call_args_list] == [(20,), (30,)]
+
+
+@pytest.mark.asyncio
+async def test_coalesce__burst_of_values__last_value_published_once():
+    values = Model()
+    callback = Mock()
+
+    class Subscriber:
+        def on_value(self, value):
+            callback(value)
+
+    subscriber = Subscriber()
+    values.subscribe("value1", subscriber.on_value, coalesce=True)
+
+    for value in range(20, 30):
+        values.value1 = value
+    callback.assert_not_called()
+    await asyncio.sleep(COALESCE_DELAY * 3)
+
+    callback.assert_called_once_with(29)
@@ -0,0 +1,33 @@
+from glasses.sorted_index import SortedIndex
+
+
+def _index(*items: int) -> SortedIndex:
+    index = SortedIndex()
+    for item in items:
+        index.append(item)
+    return index
+
+
+def test_index__next__first_item_after():
+    index = _index(2, 5, 9)
+
+    assert index.next(-1) == 2
+    assert index.next(2) == 5
+    assert index.next(6) == 9
+    assert index.next(9) is None
+
+
+def test_index__previous__last_item_before():
+    index = _index(2, 5, 9)
+
+    assert index.previous(2) is None
+    assert index.previous(5) == 2
+    assert index.previous(100) == 9
+
+
+def test_index__position__one_based_or_none():
+    index = _index(2, 5, 9)
+
+    assert index.position(5) == 2
+    assert index.position(4) is None
+    assert index.position(-1) is None
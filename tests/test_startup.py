@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+# slow to import and only needed after the app is shown.
+LAZY_MODULES = {"kubernetes", "kubernetes_asyncio", "aiohttp", "lark"}
+
+
+def test_import_app__heavy_modules__imported_lazily():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, glasses.app; print(','.join(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {module.split(".")[0] for module in result.stdout.strip().split(",")}
+
+    assert not imported & LAZY_MODULES
@@ -0,0 +1,62 @@
+import asyncio
+import io
+
+import pytest
+
+from glasses.controllers.log_provider import FileLogReader, LogReader
+from glasses.stream import stream
+
+LOG = (
+    b'{"@timestamp":"2022-12-27T11:04:22.329Z","log.level":"error","message":"boom"}\n'
+    b"plain warn line\n"
+    b"last line without newline"
+)
+
+
+class FailingReader(LogReader):
+    async def _read(self) -> None:
+        raise ValueError("no such pod")
+
+
+def _reader(data: bytes) -> FileLogReader:
+    return FileLogReader(io.BufferedReader(io.BytesIO(data)))  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_raw__stream__all_lines_written():
+    out = io.StringIO()
+
+    await stream(_reader(LOG), out, search="", raw=True)
+
+    assert out.getvalue() == LOG.decode() + "\n"
+
+
+@pytest.mark.asyncio
+async def test_raw_search__stream__only_matching_lines():
+    out = io.StringIO()
+
+    await stream(_reader(LOG), out, search="warn", raw=True)
+
+    assert out.getvalue() == "plain warn line\n"
+
+
+@pytest.mark.asyncio
+async def test_parsed_search__stream__colourized_matching_lines():
+    out = io.StringIO()
+
+    await stream(_reader(LOG), out, search="boom", raw=False)
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 1
+    assert "\x1b[30;43mboom\x1b[0m" in lines[0]
+    assert "\x1b[31m[error     ]\x1b[0m" in lines[0]
+
+
+@pytest.mark.parametrize("raw", [True, False])
+@pytest.mark.asyncio
+async def test_failing_reader__stream__error_raised(raw):
+    out = io.StringIO()
+
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(stream(FailingReader(), out, "", raw), timeout=1)
+    assert out.getvalue() == ""
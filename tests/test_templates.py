@@ -0,0 +1,41 @@
+from glasses.templates import MAX_EXAMPLES, OTHER, TemplateMiner
+
+
+def test_add__lines_differing_in_a_word__share_a_wildcard_template():
+    miner = TemplateMiner()
+
+    first = miner.add("connected to db-1 as alice", 0)
+    second = miner.add("connected to db-2 as bob", 1)
+    third = miner.add("request failed with status 500", 2)
+
+    assert first == second != third
+    assert [(row.text, row.lines) for row in miner.rows()] == [
+        ("connected to <*> as <*>", 2),
+        ("request failed with status <*>", 1),
+    ]
+
+
+def test_add__different_amount_of_words__different_templates():
+    miner = TemplateMiner()
+
+    assert miner.add("user logged in", 0) != miner.add("user logged in again", 1)
+
+
+def test_add__max_templates__other_lines_in_other_template():
+    miner = TemplateMiner(max_templates=2)
+
+    miner.add("first kind", 0)
+    template_id = miner.add("completely different line", 1)
+
+    assert template_id == OTHER
+    assert miner.templates[OTHER].count == 1
+
+
+def test_add__many_lines__examples_bounded():
+    miner = TemplateMiner()
+
+    for line_idx in range(10):
+        template_id = miner.add(f"retry {line_idx}", line_idx)
+
+    assert miner.templates[template_id].examples == list(range(MAX_EXAMPLES))
+    assert miner.templates[template_id].count == 10
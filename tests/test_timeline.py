@@ -0,0 +1,67 @@
+import math
+
+from glasses.log_parsers.line_info import Level
+from glasses.timeline import NO_ENTRY, Timeline
+
+
+def test_lines_within_range__add__counted_per_bucket():
+    timeline = Timeline(buckets=4)
+
+    timeline.add(0, 100.0, Level.INFO)
+    timeline.add(1, 100.005, Level.ERROR)
+    timeline.add(2, 100.015, Level.WARNING)
+
+    assert list(timeline.counts) == [2, 1, 0, 0]
+    assert list(timeline.errors) == [1, 0, 0, 0]
+    assert list(timeline.warnings) == [0, 1, 0, 0]
+    assert list(timeline.first_entry) == [0, 2, NO_ENTRY, NO_ENTRY]
+
+
+def test_line_after_range__add__buckets_merged():
+    timeline = Timeline(buckets=4)
+    for entry, epoch in enumerate((100.0, 100.011, 100.021, 100.031)):
+        timeline.add(entry, epoch, Level.INFO)
+
+    timeline.add(4, 100.051, Level.ERROR)
+
+    assert timeline.width == 0.02
+    assert list(timeline.counts) == [2, 2, 1, 0]
+    assert list(timeline.errors) == [0, 0, 1, 0]
+    assert list(timeline.first_entry) == [0, 2, 4, NO_ENTRY]
+
+
+def test_line_before_range__add__grows_to_the_left():
+    timeline = Timeline(buckets=4)
+    timeline.add(0, 100.0, Level.INFO)
+    timeline.add(1, 100.035, Level.INFO)
+
+    timeline.add(2, 99.99, Level.ERROR)
+
+    assert timeline.start <= 99.99
+    assert timeline.end > 100.035
+    assert sum(timeline.counts) == 3
+    assert sum(timeline.errors) == 1
+
+
+def test_line_without_time__add__uses_time_of_previous_line():
+    timeline = Timeline(buckets=4)
+    timeline.add(0, math.nan, Level.INFO)
+    timeline.add(1, 100.0, Level.INFO)
+    timeline.add(2, math.nan, Level.ERROR)
+
+    assert sum(timeline.counts) == 2
+    assert list(timeline.errors) == [1, 0, 0, 0]
+
+
+def test_many_buckets__rows__aggregated():
+    timeline = Timeline(buckets=8)
+    timeline.add(0, 100.0, Level.INFO)
+    for entry in range(1, 8):
+        level = Level.ERROR if entry == 5 else Level.INFO
+        timeline.add(entry, 100 + entry * 0.01 + 0.001, level)
+
+    rows = timeline.rows(height=2)
+
+    assert [row.lines for row in rows] == [4, 4]
+    assert [row.errors for row in rows] == [0, 1]
+    assert [row.first_entry for row in rows] == [0, 4]
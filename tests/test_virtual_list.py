@@ -0,0 +1,60 @@
+from glasses.widgets.virtual_list import Row, VirtualList
+
+
+def _rows(*keys: str) -> list[Row]:
+    return [Row(key, f"label {key}") for key in keys]
+
+
+def _keys(virtual_list: VirtualList) -> list[str]:
+    return [row.key for row in virtual_list.rows]
+
+
+def test_set_rows__cursor_row_moved__cursor_follows_row():
+    virtual_list = VirtualList()
+    virtual_list.set_rows(_rows("a", "b", "c"))
+    virtual_list.cursor = 1
+
+    virtual_list.set_rows(_rows("x", "y", "a", "b", "c"))
+
+    assert virtual_list.highlighted == Row("b", "label b")
+
+
+def test_set_rows__no_keep_position__cursor_at_top():
+    virtual_list = VirtualList()
+    virtual_list.set_rows(_rows("a", "b", "c"))
+    virtual_list.cursor = 2
+
+    virtual_list.set_rows(_rows("a", "b", "c"), keep_position=False)
+
+    assert virtual_list.cursor == 0
+
+
+def test_remove_rows__cursor_row_removed__cursor_clamped():
+    virtual_list = VirtualList()
+    virtual_list.set_rows(_rows("a", "b", "c"))
+    virtual_list.cursor = 2
+
+    virtual_list.remove_rows(["c"])
+
+    assert _keys(virtual_list) == ["a", "b"]
+    assert virtual_list.cursor == 1
+
+
+def test_insert_rows__before_key__inserted_in_place():
+    virtual_list = VirtualList()
+    virtual_list.set_rows(_rows("a", "cmd"))
+
+    virtual_list.insert_rows(_rows("b", "c"), before="cmd")
+
+    assert _keys(virtual_list) == ["a", "b", "c", "cmd"]
+    assert virtual_list.virtual_size.height == 4
+
+
+def test_update_row__label_changed__row_replaced():
+    virtual_list = VirtualList()
+    virtual_list.set_rows(_rows("a", "b"))
+
+    virtual_list.update_row(Row("b", "a much longer label"))
+
+    assert virtual_list.rows[1].label == "a much longer label"
+    assert virtual_list.virtual_size.width == len("a much longer label")